@@ -0,0 +1,32 @@
+import os
+from pathlib import Path
+
+from si_project.checkers.analysis import analyse_games, blunders
+
+# Games to analyse, e.g. written by scripts/checkers_tournament.py
+RECORDS_PATH = Path('output_tournament_games.bin')
+DEPTH = 6
+RATING = 'base_rating'
+WORKERS = os.cpu_count()
+# Analyses are appended, so an interrupted analysis continues where it stopped (see its .checkpoint file); remove both
+# files to start again
+RESULTS_PATH = Path('output_analysis.jsonl')
+# Moves losing at least this many points compared to the best move are reported
+BLUNDER_THRESHOLD = 3
+
+
+def main():
+    print(f'Analysis of {RECORDS_PATH} to depth {DEPTH} with {RATING}, {WORKERS} workers')
+
+    def report(record):
+        print(f'{record["fen"]}: {record["best_move"]} ({record["score"]})')
+
+    analysed = analyse_games(RECORDS_PATH, RESULTS_PATH, DEPTH, RATING, WORKERS, on_result=report)
+    print(f'{analysed} new positions analysed')
+    for blunder in blunders(RECORDS_PATH, RESULTS_PATH, BLUNDER_THRESHOLD):
+        print(f'Game {blunder.game}, ply {blunder.ply}, {blunder.side.name}: {blunder.played} instead of '
+              f'{blunder.best_move} loses {blunder.loss} points')
+
+
+if __name__ == '__main__':
+    main()
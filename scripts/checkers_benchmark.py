@@ -0,0 +1,46 @@
+from time import perf_counter
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.minimax import minimax
+from si_project.checkers.models import Board, Side
+from si_project.checkers.ratings import base_rating
+
+DEPTH = 4
+# Every search is timed this many times and the fastest run is reported, as a single one lasts milliseconds
+REPEATS = 5
+
+
+def count_nodes(rating_heuristic):
+    """
+    :return: the heuristic counting its calls in the nodes attribute of the returned function; minimax rates every
+             node it visits exactly once, so after a search it holds the number of nodes of that search
+    """
+    def counting_heuristic(board) -> int:
+        counting_heuristic.nodes += 1
+        return rating_heuristic(board)
+
+    counting_heuristic.nodes = 0
+    return counting_heuristic
+
+
+def main():
+    for rating_name, rating_heuristic in (('Board.rating', lambda board: board.rating), ('base_rating', base_rating)):
+        results = {}
+        for board_cls in (Board, BitBoard):
+            best_seconds, nodes = None, 0
+            for _ in range(REPEATS):
+                board = board_cls.populate_initial_board()
+                # Nodes are counted in the timed search itself, so the throughput matches the search being measured
+                counting_heuristic = count_nodes(rating_heuristic)
+                start = perf_counter()
+                minimax(Side.White, board, DEPTH, counting_heuristic)
+                seconds = perf_counter() - start
+                if best_seconds is None or seconds < best_seconds:
+                    best_seconds, nodes = seconds, counting_heuristic.nodes
+            results[board_cls] = nodes / best_seconds
+            print(f'{rating_name}, {board_cls.__name__}: {nodes} nodes at depth {DEPTH}, '
+                  f'{best_seconds:.3f} s, {results[board_cls]:.0f} nodes/s')
+        print(f'{rating_name}: BitBoard searches {results[BitBoard] / results[Board]:.1f}x as many nodes/s as Board')
+
+if __name__ == '__main__':
+    main()
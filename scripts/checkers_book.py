@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from si_project.checkers.book import build_book, save_book, OpeningBook, BOOK_PATH
+
+# Plies of the game covered by the book
+BOOK_DEPTH = 6
+# Depth of searches scoring moves of the book, in plies including the move
+SEARCH_DEPTH = 7
+# Moves scored at most this much worse than the best one are followed when building the book
+MARGIN = 1
+
+
+def main():
+    start = datetime.now()
+    records = build_book(BOOK_DEPTH, SEARCH_DEPTH, MARGIN)
+    save_book(records, BOOK_DEPTH)
+    with OpeningBook() as book:
+        print(f'Opening book of {len(book)} moves up to ply {book.depth} written to {BOOK_PATH} '
+              f'in {(datetime.now() - start).total_seconds():.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import random
+from datetime import datetime
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.models import Board, Side, CrownMove, PieceType
+
+POSITIONS = 200
+REPEATS = 5
+SEED = 0
+
+
+def capture_positions(count: int, seed: int) -> list[tuple[Board, Side]]:
+    """
+    :return: positions from random games in which the side to move has to capture, preferring multi-jump ones
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board.populate_initial_board()
+        side = Side.White
+        for _ in range(120):
+            moves = sorted(board.get_possible_moves_of_side(side), key=str)
+            if not moves:
+                break
+            if isinstance(moves[0], CrownMove) and (len(moves[0].through) > 1 or rng.random() < 0.3):
+                positions.append((Board(dict(board.squares)), side))
+            board.make_move(rng.choice(moves))
+            side = side.next
+    return positions[:count]
+
+
+def copying_crown_moves(board: Board, side: Side) -> set[CrownMove]:
+    """
+    Capture generation as it was done before the backtracking generator: every jump copies the board with move method.
+    """
+    def explore(current: Board, origin, square, through, moves):
+        piece = current.squares[square]
+        jumps = [CrownMove(square, [landing_sq]) for landing_sq, _ in
+                 current._single_captures(square, piece, piece.type_ == PieceType.King, None, set())]
+        if not jumps and through:
+            moves.add(CrownMove(origin, through))
+        for jump in jumps:
+            explore(current.move(jump), origin, jump.to_sq, through + [jump.to_sq], moves)
+
+    moves = set()
+    for square, piece in board.squares.items():
+        if piece and piece.side == side:
+            explore(board, square, square, [], moves)
+    if moves:
+        most_steps = max(len(move.through) for move in moves)
+        moves = {move for move in moves if len(move.through) == most_steps}
+    return moves
+
+
+def measure(name: str, generate, positions) -> float:
+    start = datetime.now()
+    for _ in range(REPEATS):
+        for board, side in positions:
+            generate(board, side)
+    seconds = (datetime.now() - start).total_seconds()
+    rate = REPEATS * len(positions) / seconds
+    print(f'{name}: {seconds:.3f} s, {rate:.0f} positions/s')
+    return rate
+
+
+def main():
+    positions = capture_positions(POSITIONS, SEED)
+    kings = sum(1 for board, _ in positions for _, piece in board.pieces() if piece.type_ == PieceType.King)
+    print(f'{len(positions)} capture positions, {kings} kings in total')
+    bitboards = [(BitBoard.from_board(board), side) for board, side in positions]
+    for (board, side), (bitboard, _) in zip(positions, bitboards):
+        assert copying_crown_moves(board, side) == board.get_possible_moves_of_side(side) \
+               == bitboard.get_possible_moves_of_side(side)
+
+    copying = measure('Board, copying board per jump', copying_crown_moves, positions)
+    backtracking = measure('Board, backtracking generator', lambda board, side: board.get_capture_moves_of_side(side),
+                           positions)
+    bitboard = measure('BitBoard', lambda board, side: board.get_possible_moves_of_side(side), bitboards)
+    print(f'Backtracking generator is {backtracking / copying:.1f}x faster than copying, '
+          f'BitBoard is {bitboard / backtracking:.1f}x faster than backtracking generator')
+
+
+if __name__ == '__main__':
+    main()
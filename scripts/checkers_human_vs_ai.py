@@ -1,26 +1,43 @@
-import asyncio
 import sys
 
-from si_project.checkers.models import Board, Side
-from si_project.checkers.minimax import minimax
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.engine import EngineClient
+from si_project.checkers.models import Side, GameStatus
+from si_project.checkers.notation import notation, parse_move
+
+# komputer działa jako osobny proces (si_project/checkers/engine.py), który w czasie ruchu człowieka analizuje
+# pozycję po przewidywanej odpowiedzi; używa bazy końcówek i książki otwarć, jeśli zostały wygenerowane
+
+# czas na ruch komputera [s]
+TIME_LIMIT = 2
 
 # kartkówka:
 # przykładowe drzewo gry - co w jakiej sytuacji zrobi algorytm
 # minimax, alfa-beta
 
 
-async def main():
-    b = Board.populate_initial_board()
+def main():
+    with EngineClient() as engine:
+        play(engine)
+
+
+def play(engine: EngineClient):
+    b = BitBoard.populate_initial_board()
     current_side = Side.White
+    history = []
     print('Początek gry')
 
     while True:
-        if b.rating == 100:
+        status = b.status()
+        if status == GameStatus.WhiteWon:
             print('Białe zwyciężyły!')
             break
-        elif b.rating == -100:
+        elif status == GameStatus.BlackWon:
             print('Czarne zwyciężyły!')
             break
+        elif status == GameStatus.Draw:
+            print('Remis!')
+            break
 
         b.dump(sys.stdout)
 
@@ -36,11 +53,12 @@ async def main():
         else:
             print('Ruch czarnych')
         if current_side == Side.Black:
-            moves = list(b.get_possible_moves_of_side(Side.Black))
-            values = await asyncio.gather(*[minimax(Side.White, b.move(move)) for move in moves])
-            best_move = moves[values.index(min(values))]
-            b = b.move(best_move)
-            print(f'Ruch czarnych: {best_move}')
+            engine.position(history)
+            reply = engine.search(movetime=TIME_LIMIT)
+            move = parse_move(b, Side.Black, reply.best_move)
+            history.append(reply.best_move)
+            b = b.move(move)
+            print(f'Ruch czarnych: {move} (głębokość {reply.depth}, ocena {reply.score})')
         else:
             possible_moves = sorted(list(b.get_possible_moves_of_side(current_side)), key=lambda m: m.__str__())
             print('Dostępne ruchy: \n\t--> ', end='')
@@ -51,10 +69,11 @@ async def main():
                     break
                 except:
                     pass
+            history.append(notation(move))
             b = b.move(move)
 
         current_side = current_side.next
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    main()
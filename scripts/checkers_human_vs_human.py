@@ -1,6 +1,6 @@
 import sys
 
-from si_project.checkers.models import Board, Side
+from si_project.checkers.models import Board, Side, GameStatus
 
 b = Board.populate_initial_board()
 
@@ -9,11 +9,16 @@ current_side = Side.Black
 print('Game started')
 
 while True:
-    if b.rating == 100:
+    status = b.status()
+    if status == GameStatus.WhiteWon:
         print('Whites Won')
         break
-    elif b.rating == -100:
+    elif status == GameStatus.BlackWon:
         print('Blacks Won')
+        break
+    elif status == GameStatus.Draw:
+        print('Draw')
+        break
     print(f'{b.rating=}')
 
     b.dump(sys.stdout)
@@ -29,6 +34,6 @@ while True:
             break
         except:
             pass
-    b.move(move)
+    b = b.move(move)
 
     current_side = current_side.next
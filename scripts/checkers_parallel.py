@@ -0,0 +1,22 @@
+import os
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.models import Side
+from si_project.checkers.parallel import ParallelMode, speedup_report
+from si_project.checkers.ratings import base_rating
+
+DEPTH = 7
+
+
+def main():
+    board = BitBoard.populate_initial_board()
+    print(f'CPU count: {os.cpu_count()}, depth: {DEPTH}')
+    print('Mode,Shared table,' + ','.join(f'{workers} workers' for workers in (1, 2, 4, 8)))
+    for mode in ParallelMode:
+        for shared_table in (False, True):
+            speedups = speedup_report(board, Side.White, DEPTH, base_rating, (1, 2, 4, 8), mode, shared_table)
+            print(f'{mode.name},{shared_table},' + ','.join(f'{speedup:.2f}' for speedup in speedups.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import sys
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.models import Board
+from si_project.checkers.perft import PerftBaseline, run_perft, mismatches, total_nodes_per_second
+
+# Run with --record to store current node counts and speed as the new baseline
+RECORD = '--record' in sys.argv
+
+
+def main():
+    baseline = PerftBaseline.load()
+    failed = False
+    for board_cls in (Board, BitBoard):
+        results = run_perft(baseline.positions, board_cls)
+        for result in results:
+            print(f'{result.board}, {result.position}, depth {result.depth}: {result.nodes} nodes, '
+                  f'{result.seconds:.3f} s, {result.nodes_per_second:.0f} nodes/s')
+        errors = mismatches(results, baseline)
+        for error in errors:
+            print(f'MISMATCH: {error}')
+        failed = failed or bool(errors)
+
+        nodes_per_second = total_nodes_per_second(results)
+        reference = baseline.nodes_per_second.get(board_cls.__name__)
+        if reference:
+            print(f'{board_cls.__name__}: {nodes_per_second:.0f} nodes/s, baseline {reference:.0f} nodes/s '
+                  f'({nodes_per_second / reference:.2f}x)')
+        else:
+            print(f'{board_cls.__name__}: {nodes_per_second:.0f} nodes/s')
+        if RECORD:
+            baseline.nodes_per_second[board_cls.__name__] = round(nodes_per_second)
+            if board_cls == Board:
+                counts = {(result.position, result.depth): result.nodes for result in results}
+                for position in baseline.positions:
+                    position.nodes = [counts[(position.name, depth)] for depth in range(1, len(position.nodes) + 1)]
+
+    if RECORD:
+        baseline.save()
+        print('Baseline recorded')
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.perft import PerftBaseline
+from si_project.checkers.ratings import base_rating
+from si_project.checkers.search import search
+from si_project.checkers.stats import SearchStats
+
+DEPTH = 9
+ASPIRATION_WINDOW = 10
+VARIANTS = {
+    'alphabeta': {},
+    'PVS': {'null_windows': True},
+    'PVS + aspiration': {'null_windows': True, 'aspiration_window': ASPIRATION_WINDOW},
+}
+
+
+def main():
+    # Positions of the perft baseline: the initial one, capture-heavy and king-heavy ones
+    positions = PerftBaseline.load().positions
+    totals = {name: 0 for name in VARIANTS}
+    for position in positions:
+        scores = set()
+        for name, kwargs in VARIANTS.items():
+            board = position.board(BitBoard)
+            stats = SearchStats()
+            start = datetime.now()
+            result = search(board, position.side, base_rating, max_depth=DEPTH, stats=stats, **kwargs)
+            seconds = (datetime.now() - start).total_seconds()
+            scores.add(result.score)
+            totals[name] += stats.nodes
+            print(f'{position.name}, {name}: score {result.score}, {stats.nodes} nodes, '
+                  f'{stats.researches} re-searches, {seconds:.3f} s')
+        if len(scores) > 1:
+            print(f'{position.name}: SCORES DIFFER {sorted(scores)}')
+    for name, nodes in totals.items():
+        print(f'{name}: {nodes} nodes in total ({nodes / totals["alphabeta"]:.2f} of alphabeta)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+from datetime import datetime
+from random import Random
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.models import Side, GameStatus
+from si_project.checkers.perft import PerftBaseline
+from si_project.checkers.ratings import base_rating
+from si_project.checkers.search import search
+from si_project.checkers.stats import SearchStats
+
+DEPTH = 9
+FUTILITY_MARGIN = 2
+VARIANTS = {
+    'alphabeta': {},
+    'LMR': {'reductions': True},
+    'futility': {'futility_margin': FUTILITY_MARGIN},
+    'LMR + futility': {'reductions': True, 'futility_margin': FUTILITY_MARGIN},
+}
+# Strength: games of every selective variant against plain alphabeta, searching to GAME_DEPTH, with colours
+# alternating and OPENING_PLIES random moves (chosen with the number of the game as seed) at the start
+GAME_DEPTH = 6
+GAMES = 4
+OPENING_PLIES = 2
+MAX_PLIES = 150
+
+
+def play(white: dict, black: dict, seed: int) -> GameStatus:
+    """
+    :param white: arguments of search of white variant
+    :param black: arguments of search of black variant
+    :return: result of the game, a draw if it is longer than MAX_PLIES
+    """
+    random = Random(seed)
+    board = BitBoard.populate_initial_board()
+    side = Side.White
+    plies = 0
+    while board.status() == GameStatus.Ongoing and plies < MAX_PLIES:
+        if plies < OPENING_PLIES:
+            move = random.choice(sorted(board.get_possible_moves_of_side(side), key=str))
+        else:
+            kwargs = white if side == Side.White else black
+            move = search(board, side, base_rating, max_depth=GAME_DEPTH, **kwargs).best_move
+        board.make_move(move)
+        side = side.next
+        plies += 1
+    status = board.status()
+    return status if status != GameStatus.Ongoing else GameStatus.Draw
+
+
+def compare_nodes():
+    # Positions of the perft baseline: the initial one, capture-heavy and king-heavy ones
+    positions = PerftBaseline.load().positions
+    totals = {name: [0, 0.0] for name in VARIANTS}
+    for position in positions:
+        baseline = None
+        for name, kwargs in VARIANTS.items():
+            stats = SearchStats()
+            start = datetime.now()
+            result = search(position.board(BitBoard), position.side, base_rating, max_depth=DEPTH, stats=stats,
+                            **kwargs)
+            seconds = (datetime.now() - start).total_seconds()
+            baseline = baseline or result
+            totals[name][0] += stats.nodes
+            totals[name][1] += seconds
+            agreement = 'same move' if result.best_move == baseline.best_move else f'other move ({result.best_move})'
+            print(f'{position.name}, {name}: score {result.score} ({result.score - baseline.score:+}), {agreement}, '
+                  f'{stats.nodes} nodes, {stats.reductions} reductions, {stats.futility_prunes} futility prunes, '
+                  f'{stats.researches} re-searches, {seconds:.3f} s')
+    for name, (nodes, seconds) in totals.items():
+        print(f'{name}: {nodes} nodes ({nodes / totals["alphabeta"][0]:.2f} of alphabeta), {seconds:.2f} s')
+
+
+def compare_strength():
+    for name, kwargs in list(VARIANTS.items())[1:]:
+        points = 0.0
+        for game in range(GAMES):
+            # Even games are played by the variant with white pieces
+            variant_side = Side.White if game % 2 == 0 else Side.Black
+            white, black = (kwargs, {}) if variant_side == Side.White else ({}, kwargs)
+            status = play(white, black, game)
+            if status == GameStatus.Draw:
+                points += 0.5
+            elif (status == GameStatus.WhiteWon) == (variant_side == Side.White):
+                points += 1
+        print(f'{name} against alphabeta: {points} / {GAMES} points')
+
+
+def main():
+    compare_nodes()
+    compare_strength()
+
+
+if __name__ == '__main__':
+    main()
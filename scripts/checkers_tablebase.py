@@ -0,0 +1,34 @@
+import sys
+from collections import Counter
+from datetime import datetime
+
+from si_project.checkers.models import GameStatus, Side
+from si_project.checkers.tablebase import generate, save, Tablebase, TABLEBASE_PATH, decode
+
+# Maximal number of pieces, can be given as the first argument; 3 pieces take over a minute
+MAX_PIECES = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+
+def main():
+    start = datetime.now()
+    sigs, values = generate(MAX_PIECES)
+    save(sigs, values)
+    print(f'Tablebase of {len(sigs)} signatures up to {MAX_PIECES} pieces written to {TABLEBASE_PATH} '
+          f'({len(values)} bytes) in {(datetime.now() - start).total_seconds():.1f} s')
+
+    results = Counter()
+    longest = 0
+    for value in values:
+        result = decode(value, Side.White)
+        if result is not None:
+            status, distance = result
+            results[status if status == GameStatus.Draw else 'Decided'] += 1
+            longest = max(longest, distance)
+    print(f'Positions: {sum(results.values())}, decided: {results["Decided"]}, draws: {results[GameStatus.Draw]}, '
+          f'longest win: {longest} plies')
+    with Tablebase() as tablebase:
+        print(f'Tablebase opened, up to {tablebase.max_pieces} pieces')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,12 @@ import traceback
 from datetime import datetime
 from itertools import combinations
 
-from si_project.checkers.models import Board, Side
+from si_project.checkers.models import Board, Side, GameStatus
 from si_project.checkers.alphabeta import alphabeta
 from si_project.checkers.minimax import minimax
 from si_project.checkers.ratings import base_rating, forward_extra_rating, no_king_multip_rating, very_basic
+from si_project.checkers.stats import SearchStats
+from si_project.checkers.tournament import choose_move
 
 f = open('output_checkers2.txt', mode='w')
 
@@ -25,7 +27,8 @@ def main():
         'Czas od poczatku gry [ms]',
         'Rating',
         'Algorytm',
-        'Max glebokosc'
+        'Max glebokosc',
+        *SearchStats.CSV_COLUMNS
     ]))
     # print('Początek gry')
     game_i = 0
@@ -43,14 +46,11 @@ def main():
                     moves_count = 0
                     try:
                         while True:
-                            if b.rating == 1000:
-                                state = 'Biale wygraly'
-                            elif b.rating == -1000:
-                                state = 'Czarne wygraly'
-                            elif b.is_in_draw_state:
-                                state = 'remis'
-                            else:
-                                state = None
+                            state = {
+                                GameStatus.WhiteWon: 'Biale wygraly',
+                                GameStatus.BlackWon: 'Czarne wygraly',
+                                GameStatus.Draw: 'remis',
+                            }.get(b.status())
                             if state:
                                 print(','.join([
                                     str(game_i),
@@ -60,15 +60,15 @@ def main():
                                     str((datetime.now() - start).total_seconds() * 1000),
                                     str(b.rating),
                                     algorithm.__name__,
-                                    str(depth)
+                                    str(depth),
+                                    *[''] * len(SearchStats.CSV_COLUMNS)
                                 ]))
                                 break
                             if current_side == Side.Black:
-                                moves = list(b.get_possible_moves_of_side(Side.Black))
-                                if not moves:
+                                stats = SearchStats()
+                                best_move = choose_move(algorithm, b, Side.Black, 3, rating_black, stats)
+                                if not best_move:
                                     break
-                                values = [algorithm(Side.White, b.move(move), 3, rating_black) for move in moves]
-                                best_move = moves[values.index(min(values))]
                                 b = b.move(best_move)
                                 print(','.join([
                                     str(game_i),
@@ -78,14 +78,14 @@ def main():
                                     str((datetime.now() - start).total_seconds() * 1000),
                                     str(b.rating),
                                     algorithm.__name__,
-                                    '3'
+                                    '3',
+                                    *stats.as_row()
                                 ]))
                             else:
-                                moves = list(b.get_possible_moves_of_side(Side.White))
-                                if not moves:
+                                stats = SearchStats()
+                                best_move = choose_move(algorithm, b, Side.White, depth, rating_white, stats)
+                                if not best_move:
                                     break
-                                values = [algorithm(Side.Black, b.move(move), depth, rating_white) for move in moves]
-                                best_move = moves[values.index(max(values))]
                                 b = b.move(best_move)
                                 print(','.join([
                                     str(game_i),
@@ -95,7 +95,8 @@ def main():
                                     str((datetime.now() - start).total_seconds() * 1000),
                                     str(b.rating),
                                     algorithm.__name__,
-                                    str(depth)
+                                    str(depth),
+                                    *stats.as_row()
                                 ]))
                             moves_count += 1
                             current_side = current_side.next
@@ -0,0 +1,34 @@
+import os
+from itertools import product
+from pathlib import Path
+
+from si_project.checkers.tournament import Player, run_tournament, standings, format_standings, load_results
+
+# Players are all combinations of algorithms, depths and rating functions
+ALGORITHMS = ('alphabeta',)
+DEPTHS = (3, 5)
+RATINGS = ('base_rating', 'no_king_multip_rating', 'forward_extra_rating', 'very_basic')
+GAMES_PER_PAIRING = 4
+SEED = 0
+WORKERS = os.cpu_count()
+# Results are appended, so an interrupted tournament continues where it stopped; remove the file to start again
+RESULTS_PATH = Path('output_tournament.jsonl')
+# Games are also stored as game records (see si_project/checkers/records.py), e.g. to be scanned for training data
+RECORDS_PATH = Path('output_tournament_games.bin')
+
+
+def main():
+    players = [Player(algorithm, depth, rating) for algorithm, depth, rating in product(ALGORITHMS, DEPTHS, RATINGS)]
+    print(f'{len(players)} players, {GAMES_PER_PAIRING} games per pairing, {WORKERS} workers')
+
+    def report(result):
+        print(f'Game {result["game"]}: {result["white"]["rating"]}/{result["white"]["depth"]} vs '
+              f'{result["black"]["rating"]}/{result["black"]["depth"]}: {result["outcome"]} after {result["plies"]} '
+              f'plies, {result["seconds"]:.1f} s')
+
+    run_tournament(players, GAMES_PER_PAIRING, RESULTS_PATH, WORKERS, SEED, on_result=report, records_path=RECORDS_PATH)
+    print(format_standings(standings(load_results(RESULTS_PATH))))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,295 @@
+from time import monotonic, perf_counter
+
 from si_project.checkers.models import Side, Board
+from si_project.checkers.ordering import MoveOrdering, staged_moves, captured_count, is_promotion
+from si_project.checkers.stats import SearchStats
+from si_project.checkers.tablebase import Tablebase
+from si_project.checkers.transposition import TranspositionTable, Bound
+from si_project.checkers.zobrist import side_key
+
+
+# Late move reductions: quiet moves searched after the first LMR_MIN_MOVES ones, in nodes at least LMR_MIN_DEPTH
+# plies above the leaves, are searched LMR_REDUCTION plies shallower first
+LMR_MIN_MOVES = 3
+LMR_MIN_DEPTH = 3
+LMR_REDUCTION = 1
+
+# Futility pruning checks whether a quiet move leaves the opponent without moves only when the opponent has at most
+# this many pieces, as blocking all pieces of a larger army is rare and the check costs a make/unmake per move
+FUTILITY_BLOCK_PIECES = 4
+
+
+class SearchTimeout(Exception):
+    """
+    Raised by alphabeta (and quiescence below its leaves) when its deadline passes or it is stopped.
+    The board is restored before the exception leaves alphabeta.
+    """
+
+
+def _timed_moves(moves, stats: SearchStats):
+    """
+    :return: generator of the moves, adding time spent on generating them to stats
+    """
+    while True:
+        started = perf_counter()
+        move = next(moves, None)
+        stats.movegen_seconds += perf_counter() - started
+        if move is None:
+            return
+        yield move
+
+
+def _blocks(board: Board, side: Side, move) -> bool:
+    """
+    :return: whether the move leaves the other side without moves, which wins the game
+    """
+    undo = board.make_move(move)
+    try:
+        return not board.has_moves(side.next)
+    finally:
+        board.unmake_move(undo)
 
 
-def alphabeta(side: Side, board: Board, depth: int = 4, rating_heuristic=None, alpha: int = 1000,
-              beta: int = -1000) -> int:
+def quiescence(side: Side, board: Board, rating: int, rating_heuristic, alpha: int = -1000, beta: int = 1000,
+               cap: int = 8, stats: SearchStats | None = None, ply: int = 0, deadline: float | None = None,
+               stop=None) -> int:
+    """
+    Extends a leaf of the search with capture sequences, until a side to move has no capture (the position is quiet)
+    or cap plies are searched. As captures are mandatory, the side to move cannot stand pat when it has a capture.
+    :param rating: already computed rating of the board
+    :param cap: maximal number of capture plies searched below the board
+    :param stats: optional statistics collector; nodes below the board are counted as quiescence nodes
+    :param ply: distance of the board from the root of the search, selects the move buffer (see generate_moves)
+    :param deadline: optional time.monotonic() value after which SearchTimeout is raised, like by alphabeta
+    :param stop: optional event; SearchTimeout is raised once it is set, like by alphabeta
+    :return: score of the board for the side, like alphabeta's
+    """
+    if cap == 0:
+        return rating
+    if deadline is not None and monotonic() > deadline or stop is not None and stop.is_set():
+        raise SearchTimeout()
+    if stats is not None:
+        started = perf_counter()
+    moves = board.generate_moves(side, ply, captures_only=True)
+    if stats is not None:
+        stats.movegen_seconds += perf_counter() - started
+    if not moves:
+        return rating
+
+    best_score = None
+    for move in moves:
+        if stats is not None:
+            stats.quiescence_nodes += 1
+            started = perf_counter()
+        undo = board.make_move(move)
+        if stats is not None:
+            stats.apply_seconds += perf_counter() - started
+            started = perf_counter()
+        try:
+            child_rating = rating_heuristic(board)
+            if stats is not None:
+                stats.eval_seconds += perf_counter() - started
+            score = child_rating if abs(child_rating) == 1000 else \
+                quiescence(side.next, board, child_rating, rating_heuristic, alpha, beta, cap - 1, stats, ply + 1,
+                           deadline, stop)
+        finally:
+            if stats is not None:
+                started = perf_counter()
+            board.unmake_move(undo)
+            if stats is not None:
+                stats.apply_seconds += perf_counter() - started
+        if side == Side.White:
+            best_score = score if best_score is None else max(best_score, score)
+            alpha = max(alpha, score)
+        else:
+            best_score = score if best_score is None else min(best_score, score)
+            beta = min(beta, score)
+        if alpha >= beta:
+            break
+    return best_score
+
+
+def alphabeta(side: Side, board: Board, depth: int = 4, rating_heuristic=None, alpha: int = -1000,
+              beta: int = 1000, table: TranspositionTable | None = None, deadline: float | None = None,
+              stop=None, ordering: MoveOrdering | None = None, ply: int = 0, stats: SearchStats | None = None,
+              quiescence_cap: int = 0, null_windows: bool = False, tablebase: Tablebase | None = None,
+              reductions: bool = False, futility_margin: int | None = None) -> int:
     """
     Returns best possible score for a given side from current board.
+    The board is walked in place with make_move/unmake_move and is left unchanged afterwards.
+    :param table: optional transposition table used to reuse scores of already searched positions
+    :param deadline: optional time.monotonic() value after which SearchTimeout is raised
+    :param stop: optional event (any object with is_set method); SearchTimeout is raised once it is set
+    :param ordering: optional move ordering (killer moves, history heuristic) shared by the whole search
+    :param ply: distance from the root of the search, used by move ordering and to select the move buffer
+    :param stats: optional statistics collector; nothing is measured if it is not given
+    :param quiescence_cap: maximal number of capture plies searched by quiescence below leaves; 0 disables quiescence
+    :param null_windows: whether to search as Principal Variation Search (see pvs function)
+    :param tablebase: optional endgame tablebase; positions with at most its number of pieces are scored by it
+                      without searching
+    :param reductions: whether to use late move reductions: late quiet moves (see LMR_MIN_MOVES) are searched with
+                       a reduced depth and a null window first, and searched again with full depth only if they turn
+                       out to be better than the best move so far
+    :param futility_margin: if given, futility pruning is used: in nodes one ply above the leaves whose rating is
+                            worse than the window by more than the margin, quiet moves are not searched, as they are
+                            not expected to change the rating that much; captures, promotions and moves leaving the
+                            opponent without moves (checked if it has few pieces, see FUTILITY_BLOCK_PIECES) are still
+                            searched
+    """
+    if deadline is not None and monotonic() > deadline or stop is not None and stop.is_set():
+        raise SearchTimeout()
+    if stats is not None:
+        stats.count_node(ply)
+        started = perf_counter()
+    rating = rating_heuristic(board)
+    if stats is not None:
+        stats.eval_seconds += perf_counter() - started
+    if abs(rating) == 1000:
+        return rating
+    # Draws by the rules and repetitions of positions of the game or of the searched line are scored as draws; both
+    # are checked in O(1) (see models.DrawHistory). The root is not a repetition, as it is the position to move from.
+    if board.is_in_draw_state or ply and board.history.is_repetition:
+        return 0
+    if tablebase is not None and board.totals.white_count + board.totals.black_count <= tablebase.max_pieces:
+        score = tablebase.score(board, side)
+        if score is not None:
+            return score
+    if depth == 0:
+        if quiescence_cap:
+            return quiescence(side, board, rating, rating_heuristic, alpha, beta, quiescence_cap, stats, ply,
+                              deadline, stop)
+        return rating
+
+    # Quiet moves are expected to change the rating by at most the margin, so they cannot bring it back into the
+    # window. Captures and promotions change it by more, and moves leaving the opponent without moves win, so they are
+    # searched anyway.
+    futile = futility_margin is not None and depth == 1 \
+        and (rating + futility_margin <= alpha if side == Side.White else rating - futility_margin >= beta)
+
+    if futile:
+        opponent_pieces = board.totals.black_count if side == Side.White else board.totals.white_count
+        check_blocks = opponent_pieces <= FUTILITY_BLOCK_PIECES
+
+    alpha_orig, beta_orig = alpha, beta
+    tt_move = None
+    if table is not None:
+        key = board.zobrist_key ^ side_key(side)
+        entry = table.probe(key)
+        if stats is not None:
+            stats.tt_probes += 1
+            stats.tt_hits += entry is not None
+        if entry is not None:
+            tt_move = entry.best_move
+            if entry.depth >= depth:
+                if entry.bound == Bound.Exact:
+                    return entry.score
+                elif entry.bound == Bound.Lower:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score
+
+    # Moves are generated lazily, so that the ones after a cutoff are never generated
+    moves = staged_moves(board, side, ply, ordering, tt_move)
+    if stats is not None:
+        moves = _timed_moves(moves, stats)
+
+    best_score = None
+    best_move = None
+    pruned = False
+    child_kwargs = dict(table=table, deadline=deadline, stop=stop, ordering=ordering, ply=ply + 1, stats=stats,
+                        quiescence_cap=quiescence_cap, null_windows=null_windows, tablebase=tablebase,
+                        reductions=reductions, futility_margin=futility_margin)
+    for i, move in enumerate(moves):
+        # Moves leaving the opponent without moves win, like checkmates in chess, so they are searched one ply deeper
+        # for the win to be found below the leaves
+        extension = 0
+        if futile and not captured_count(board, move) and not is_promotion(board, move):
+            if not (check_blocks and _blocks(board, side, move)):
+                if stats is not None:
+                    stats.futility_prunes += 1
+                pruned = True
+                continue
+            extension = 1
+        child_depth = depth - 1 + extension
+        reduce = reductions and i >= LMR_MIN_MOVES and depth >= LMR_MIN_DEPTH and not captured_count(board, move)
+        if stats is not None:
+            stats.expanded_nodes += best_move is None
+            stats.children += 1
+            started = perf_counter()
+        undo = board.make_move(move)
+        if stats is not None:
+            stats.apply_seconds += perf_counter() - started
+        try:
+            null_alpha, null_beta = (alpha, alpha + 1) if side == Side.White else (beta - 1, beta)
+            if reduce:
+                if stats is not None:
+                    stats.reductions += 1
+                score = alphabeta(side.next, board, depth - 1 - LMR_REDUCTION, rating_heuristic, null_alpha,
+                                  null_beta, **child_kwargs)
+                # A reduced move that fails high may be better than the best one, so it is searched with full depth
+                reduce = score <= alpha if side == Side.White else score >= beta
+                if not reduce and stats is not None:
+                    stats.researches += 1
+            if not reduce:
+                if null_windows and i > 0:
+                    # Moves after the first one are expected to be worse, which is cheaper to prove with a null window
+                    score = alphabeta(side.next, board, child_depth, rating_heuristic, null_alpha, null_beta,
+                                      **child_kwargs)
+                    if alpha < score < beta:
+                        if stats is not None:
+                            stats.researches += 1
+                        score = alphabeta(side.next, board, child_depth, rating_heuristic, alpha, beta, **child_kwargs)
+                else:
+                    score = alphabeta(side.next, board, child_depth, rating_heuristic, alpha, beta, **child_kwargs)
+        finally:
+            if stats is not None:
+                started = perf_counter()
+            board.unmake_move(undo)
+            if stats is not None:
+                stats.apply_seconds += perf_counter() - started
+        if side == Side.White:
+            if best_score is None or score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+        else:
+            if best_score is None or score < best_score:
+                best_score, best_move = score, move
+            beta = min(beta, score)
+        if alpha >= beta:
+            if ordering is not None:
+                ordering.record_cutoff(move, ply, depth, i)
+            if stats is not None:
+                stats.cutoffs += 1
+            break
+
+    if pruned:
+        # Pruned moves are expected to score at most the rating with the margin, which is a fail-soft bound
+        bound = rating + futility_margin if side == Side.White else rating - futility_margin
+        if best_move is None:
+            return bound
+        best_score = max(best_score, bound) if side == Side.White else min(best_score, bound)
+    if best_move is None:
+        # A side that cannot move loses (see Board.status)
+        return -1000 if side == Side.White else 1000
+    if table is not None:
+        if best_score <= alpha_orig:
+            bound = Bound.Upper
+        elif best_score >= beta_orig:
+            bound = Bound.Lower
+        else:
+            bound = Bound.Exact
+        table.store(key, depth, best_score, bound, best_move)
+    return best_score
+
+
+def pvs(side: Side, board: Board, depth: int = 4, rating_heuristic=None, alpha: int = -1000, beta: int = 1000,
+        **kwargs) -> int:
+    """
+    Principal Variation Search (NegaScout): the first move of every node is searched with the full window and the
+    rest with null windows, which are re-searched with the full window only when the move turns out to be better.
+    It returns the same scores as alphabeta, searching fewer nodes when moves are well ordered.
+    :param kwargs: other arguments of alphabeta
     """
-    if abs(rating_heuristic(board)) == 1000 or depth == 0:
-        return rating_heuristic(board)
-    next_boards = (board.move(move) for move in board.get_possible_moves_of_side(side))
-    if side == Side.White:
-        for next_board in next_boards:
-            score = alphabeta(side.next, next_board, depth - 1, rating_heuristic, alpha, beta)
-            if score > alpha:
-                alpha = score
-            if alpha >= beta:
-                return alpha
-        return alpha
-    else:
-        for next_board in next_boards:
-            score = alphabeta(side.next, next_board, depth - 1, rating_heuristic, alpha, beta)
-            if score < beta:
-                beta = score
-            if alpha >= beta:
-                return beta
-        return beta
+    return alphabeta(side, board, depth, rating_heuristic, alpha, beta, null_windows=True, **kwargs)
@@ -0,0 +1,191 @@
+"""
+Re-analysis of stored games (see records module): positions of the games are streamed from a game records file,
+deduplicated by their Zobrist keys and analysed by fixed-depth alphabeta in a process pool. Every analysis is
+appended as a JSON line to a results file as soon as it is finished, and a checkpoint file keeps the number of games
+whose all positions are analysed, so an interrupted run continues where it stopped.
+Analyses score every legal move of a position, so moves played in the games can be compared with the best ones
+(see blunders).
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from pathlib import Path
+
+from si_project.checkers.alphabeta import alphabeta
+from si_project.checkers.models import Side, GameStatus
+from si_project.checkers.notation import notation, to_fen, pack_position, unpack_position
+from si_project.checkers.ordering import MoveOrdering
+from si_project.checkers.records import GameRecord, read_games
+from si_project.checkers.tournament import RATINGS, load_results, open_results
+from si_project.checkers.transposition import TranspositionTable
+from si_project.checkers.zobrist import side_key
+
+ANALYSIS_TABLE_SIZE = 1 << 14
+
+
+def analyse_position(position: bytes, depth: int, rating: str = 'base_rating') -> dict:
+    """
+    :param position: packed position (see notation.pack_position)
+    :param depth: depth of the analysis in plies, including the scored move
+    :param rating: name of a rating function of tournament.RATINGS
+    :return: analysis record, as stored in the results file: key and FEN of the position, scores of all its moves,
+             the best move and its score
+    """
+    board, side = unpack_position(position)
+    rating_heuristic = RATINGS[rating]
+    table = TranspositionTable(ANALYSIS_TABLE_SIZE)
+    ordering = MoveOrdering()
+    scores = {}
+    for move in sorted(board.get_possible_moves_of_side(side), key=notation):
+        undo = board.make_move(board.from_move(move))
+        scores[notation(move)] = alphabeta(side.next, board, depth - 1, rating_heuristic, table=table,
+                                           ordering=ordering, ply=1)
+        board.unmake_move(undo)
+    best_move = (max if side == Side.White else min)(scores, key=scores.get)
+    return {
+        'key': board.zobrist_key ^ side_key(side),
+        'fen': to_fen(board, side),
+        'depth': depth,
+        'rating': rating,
+        'best_move': best_move,
+        'score': scores[best_move],
+        'scores': scores,
+    }
+
+
+def positions(game: GameRecord):
+    """
+    :return: generator of keys and packed positions of all positions of the game in which the side to move has moves
+    """
+    for board, side in game.positions():
+        if board.decided_status() == GameStatus.Ongoing:
+            yield board.zobrist_key ^ side_key(side), pack_position(board, side)
+
+
+def _load_checkpoint(path: Path, depth: int, rating: str) -> int:
+    if not path.exists():
+        return 0
+    checkpoint = json.loads(path.read_text())
+    if (checkpoint['depth'], checkpoint['rating']) != (depth, rating):
+        raise ValueError(f'{path} belongs to an analysis to depth {checkpoint["depth"]} with {checkpoint["rating"]}')
+    return checkpoint['games']
+
+
+def _save_checkpoint(path: Path, games: int, depth: int, rating: str) -> None:
+    # Written to a temporary file first, so that an interruption never leaves a partially written checkpoint
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_text(json.dumps({'games': games, 'depth': depth, 'rating': rating}))
+    os.replace(temporary, path)
+
+
+def analyse_games(records_path: Path, results_path: Path, depth: int, rating: str = 'base_rating',
+                  workers: int | None = None, executor: ProcessPoolExecutor | None = None,
+                  checkpoint_path: Path | None = None, max_pending: int | None = None, on_result=None) -> int:
+    """
+    Analyses all distinct positions of games of the records file, appending every analysis to results_path as soon
+    as it is finished. Positions already analysed (by a previous, interrupted run with the same depth and rating) are
+    not analysed again; games whose all positions were analysed are not even expanded again. A corrupted game of the
+    records file raises ValueError (see records.read_games), so that it is never analysed nor checkpointed.
+    :param workers: number of worker processes, os.cpu_count() if not given
+    :param executor: pool to run analyses in; a new pool of given number of workers is created if not passed
+    :param checkpoint_path: file with the number of completely analysed games, results_path with .checkpoint suffix
+                            by default
+    :param max_pending: maximal number of analyses submitted to the pool at once, so that positions are read from
+                        the records file only as fast as they are analysed; 4 per worker by default
+    :param on_result: optional function called with every new analysis record, e.g. to report progress
+    :return: number of new analyses
+    """
+    checkpoint_path = checkpoint_path or results_path.with_name(results_path.name + '.checkpoint')
+    completed_games = _load_checkpoint(checkpoint_path, depth, rating)
+    seen = {record['key'] for record in load_results(results_path)}
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    max_pending = max_pending or 4 * (workers or os.cpu_count() or 1)
+
+    # Analyses still awaited by every game, games awaiting analysis of every key, and analyses submitted to the pool
+    remaining: dict[int, int] = {}
+    waiting: dict[int, list[int]] = {}
+    pending = set()
+    analysed = 0
+
+    def finish(futures, results_file) -> None:
+        nonlocal completed_games, analysed
+        for future in futures:
+            record = future.result()
+            results_file.write(json.dumps(record) + '\n')
+            results_file.flush()
+            analysed += 1
+            for game in waiting.pop(record['key']):
+                remaining[game] -= 1
+            if on_result is not None:
+                on_result(record)
+        # Games are expanded in order, so the checkpoint moves over a prefix of completely analysed games
+        previous = completed_games
+        while remaining.get(completed_games) == 0:
+            del remaining[completed_games]
+            completed_games += 1
+        if completed_games != previous:
+            _save_checkpoint(checkpoint_path, completed_games, depth, rating)
+
+    try:
+        with open_results(results_path) as results_file:
+            for index, game in enumerate(read_games(records_path)):
+                if index < completed_games:
+                    continue
+                # The game awaits its own expansion too, so that it is not completed while it is being expanded
+                remaining[index] = 1
+                for key, position in positions(game):
+                    if key in waiting:
+                        waiting[key].append(index)
+                        remaining[index] += 1
+                    elif key not in seen:
+                        seen.add(key)
+                        waiting[key] = [index]
+                        remaining[index] += 1
+                        pending.add(executor.submit(analyse_position, position, depth, rating))
+                        if len(pending) >= max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            finish(done, results_file)
+                remaining[index] -= 1
+                finish([], results_file)
+            done, pending = wait(pending).done, set()
+            finish(done, results_file)
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+    return analysed
+
+
+@dataclass
+class Blunder:
+    game: int
+    ply: int
+    side: Side
+    played: str
+    best_move: str
+    # Score lost by the played move, from the point of view of the side that played it
+    loss: int
+
+
+def blunders(records_path: Path, results_path: Path, threshold: int):
+    """
+    :param threshold: minimal score lost by a move to be reported
+    :return: generator of moves of games of the records file losing at least threshold points compared to the best
+             move, according to analyses stored in the results file
+    """
+    analyses = {record['key']: record for record in load_results(results_path)}
+    for index, game in enumerate(read_games(records_path)):
+        boards = game.positions()
+        for ply, ((board, side), move) in enumerate(zip(boards, game.moves)):
+            analysis = analyses.get(board.zobrist_key ^ side_key(side))
+            if analysis is None:
+                continue
+            played = notation(board.to_move(move))
+            loss = analysis['score'] - analysis['scores'][played]
+            if side == Side.Black:
+                loss = -loss
+            if loss >= threshold:
+                yield Blunder(index, ply, side, played, analysis['best_move'], loss)
@@ -0,0 +1,95 @@
+"""
+Vectorised evaluation of many positions at once. Requires NumPy.
+
+Positions are packed into (N, 32) arrays of piece codes, one column per playable square (in bitboard.SQUARES order):
+0 - empty, 1 - white man, 2 - white king, 3 - black man, 4 - black king.
+"""
+from functools import cache
+
+import numpy as np
+
+from si_project.checkers.bitboard import SQUARES, PLAYABLE_SQUARES, BitBoard
+from si_project.checkers.models import Side, PieceType, Piece
+from si_project.checkers.ratings import PIECE_VALUES
+
+EMPTY, WHITE_MAN, WHITE_KING, BLACK_MAN, BLACK_KING = range(5)
+CODE_PIECES = {
+    WHITE_MAN: Piece(PieceType.Man, Side.White),
+    WHITE_KING: Piece(PieceType.King, Side.White),
+    BLACK_MAN: Piece(PieceType.Man, Side.Black),
+    BLACK_KING: Piece(PieceType.King, Side.Black),
+}
+_SQUARE_INDICES = np.arange(PLAYABLE_SQUARES)
+
+
+@cache
+def weight_table(rating_heuristic) -> np.ndarray:
+    """
+    :param rating_heuristic: one of rating functions from ratings module (a key of ratings.PIECE_VALUES)
+    :return: (5, 32) array of signed values of every piece code on every square
+    """
+    piece_value = PIECE_VALUES[rating_heuristic]
+    table = np.zeros((5, PLAYABLE_SQUARES), dtype=np.int32)
+    for code, piece in CODE_PIECES.items():
+        sign = 1 if piece.side == Side.White else -1
+        table[code] = [sign * piece_value(sq, piece) for sq in SQUARES]
+    table.setflags(write=False)
+    return table
+
+
+def pack_masks(masks: np.ndarray) -> np.ndarray:
+    """
+    :param masks: (N, 4) array of white men, white kings, black men and black kings bitmasks (see BitBoard)
+    :return: (N, 32) array of piece codes
+    """
+    bits = (np.asarray(masks, dtype=np.uint32)[:, :, np.newaxis] >> _SQUARE_INDICES.astype(np.uint32)) & 1
+    codes = bits.astype(np.int8) * np.arange(1, 5, dtype=np.int8)[np.newaxis, :, np.newaxis]
+    return codes.sum(axis=1, dtype=np.int8)
+
+
+def pack_boards(boards) -> np.ndarray:
+    """
+    :param boards: iterable of BitBoards or models.Boards
+    :return: (N, 32) array of piece codes
+    """
+    masks = []
+    for board in boards:
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        masks.append((board.white_men, board.white_kings, board.black_men, board.black_kings))
+    return pack_masks(np.array(masks, dtype=np.uint32).reshape(-1, 4))
+
+
+def batch_rating(positions: np.ndarray, rating_heuristic) -> np.ndarray:
+    """
+    Scores all positions at once, with the same results as calling rating_heuristic on every one of them.
+    :param positions: (N, 32) array of piece codes
+    :param rating_heuristic: one of rating functions from ratings module
+    :return: (N,) array of ratings
+    """
+    positions = np.asarray(positions)
+    scores = weight_table(rating_heuristic)[positions, _SQUARE_INDICES].sum(axis=1, dtype=np.int32)
+    is_any_white = ((positions == WHITE_MAN) | (positions == WHITE_KING)).any(axis=1)
+    is_any_black = ((positions == BLACK_MAN) | (positions == BLACK_KING)).any(axis=1)
+    scores[is_any_black & ~is_any_white] = -1000
+    scores[is_any_white & ~is_any_black] = 1000
+    return scores
+
+
+def rate_children(board, side: Side, rating_heuristic) -> dict:
+    """
+    Evaluates all positions reachable from the board in one move (e.g. leaf children of a frontier node) in one call.
+    :return: mapping of moves to ratings of positions after them
+    """
+    if not isinstance(board, BitBoard):
+        board = BitBoard.from_board(board)
+    moves = list(board.get_possible_moves_of_side(side))
+    if not moves:
+        return {}
+    children = []
+    for move in moves:
+        undo = board.make_move(move)
+        children.append((board.white_men, board.white_kings, board.black_men, board.black_kings))
+        board.unmake_move(undo)
+    scores = batch_rating(pack_masks(np.array(children, dtype=np.uint32)), rating_heuristic)
+    return dict(zip(moves, scores.tolist()))
@@ -0,0 +1,639 @@
+from functools import cache
+from io import StringIO
+
+from .evaluation import MaterialTotals, BASE_VALUES, square_values
+from .models import Side, PieceType, Square, Piece, Move, SimpleMove, CrownMove, GameStatus, STATUS_CACHE_SIZE, \
+    DrawHistory
+from .utilities import Symbols
+from .zobrist import piece_key
+
+# The bitboard engine is tied to the standard 8x8 board, independently of Settings.BoardSize
+BOARD_SIZE = 8
+PLAYABLE_SQUARES = BOARD_SIZE * BOARD_SIZE // 2
+
+DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def square_index(x: int, y: int) -> int | None:
+    """
+    :return: index (0-31) of a playable square or None if the square is not playable
+    """
+    if not (0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE) or (x + y) % 2 == 0:
+        return None
+    return x * (BOARD_SIZE // 2) + y // 2
+
+
+def iter_bits(mask: int):
+    """
+    :return: generator of indices of set bits in the mask, from the lowest one
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _build_tables():
+    squares = []
+    for i in range(PLAYABLE_SQUARES):
+        x = i // (BOARD_SIZE // 2)
+        y = 2 * (i % (BOARD_SIZE // 2)) + (1 if x % 2 == 0 else 0)
+        squares.append(Square(x, y))
+
+    rays, jumps, forward, sector = [], [], ([], []), []
+    for sq in squares:
+        sq_rays = []
+        sq_jumps = []
+        for x_step, y_step in DIRECTIONS:
+            ray = []
+            x, y = sq.x + x_step, sq.y + y_step
+            while square_index(x, y) is not None:
+                ray.append(square_index(x, y))
+                x, y = x + x_step, y + y_step
+            sq_rays.append(tuple(ray))
+            if len(ray) >= 2:
+                sq_jumps.append((ray[0], ray[1]))
+        rays.append(tuple(sq_rays))
+        jumps.append(tuple(sq_jumps))
+        # White men go towards row 0 and black men towards the last row
+        forward[0].append(tuple(r[0] for r, (x_step, _) in zip(sq_rays, DIRECTIONS) if r and x_step == -1))
+        forward[1].append(tuple(r[0] for r, (x_step, _) in zip(sq_rays, DIRECTIONS) if r and x_step == 1))
+        sector.append(sq.sector_multiplier)
+
+    # Kings standing on the edge of the board cannot capture (mirrors Board._single_captures)
+    capture_rays = [
+        r if 0 < sq.x < BOARD_SIZE - 1 and 0 < sq.y < BOARD_SIZE - 1 else ((), (), (), ())
+        for sq, r in zip(squares, rays)
+    ]
+
+    between = {}
+    for i, sq_rays in enumerate(rays):
+        for ray in sq_rays:
+            mask = 0
+            for j in ray:
+                between[(i, j)] = mask
+                mask |= 1 << j
+
+    return tuple(squares), tuple(rays), tuple(capture_rays), tuple(jumps), (tuple(forward[0]), tuple(forward[1])), \
+        tuple(sector), between
+
+
+SQUARES, RAYS, CAPTURE_RAYS, JUMPS, FORWARD, SECTOR, BETWEEN = _build_tables()
+WHITE_PROMOTION_ROW = sum(1 << i for i, sq in enumerate(SQUARES) if sq.x == 0)
+BLACK_PROMOTION_ROW = sum(1 << i for i, sq in enumerate(SQUARES) if sq.x == BOARD_SIZE - 1)
+
+# Moves generated for search (see BitBoard.generate_moves) are packed into ints: bits 0-4 hold index of the from
+# square, bits 5-9 index of the to square and the rest the mask of captured pieces (0 for simple moves)
+MOVE_TO_SHIFT = 5
+MOVE_CAPTURED_SHIFT = 10
+MOVE_SQUARE_MASK = 31
+
+# Moves are never mutated once generated, so simple moves can be shared between boards
+SIMPLE_MOVES = {
+    (i, j): SimpleMove(SQUARES[i], SQUARES[j]) for i in range(PLAYABLE_SQUARES) for ray in RAYS[i] for j in ray
+}
+
+WHITE_MAN = Piece(PieceType.Man, Side.White)
+WHITE_KING = Piece(PieceType.King, Side.White)
+BLACK_MAN = Piece(PieceType.Man, Side.Black)
+BLACK_KING = Piece(PieceType.King, Side.Black)
+
+# Zobrist keys of white men, white kings, black men and black kings, per square index
+ZOBRIST_KEYS = tuple(
+    tuple(piece_key(sq.x, sq.y, piece.side, piece.type_) for sq in SQUARES)
+    for piece in (WHITE_MAN, WHITE_KING, BLACK_MAN, BLACK_KING)
+)
+
+
+@cache
+def kind_square_values() -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """
+    :return: signed values of pieces (see evaluation.square_values) of white men, white kings, black men and black
+             kings, per square index; built on first use, as piece values come from ratings module
+    """
+    return tuple(
+        tuple(square_values(sq.x, sq.y, piece.side, piece.type_) for sq in SQUARES)
+        for piece in (WHITE_MAN, WHITE_KING, BLACK_MAN, BLACK_KING)
+    )
+
+
+def zobrist_delta(changed: int, keys: tuple[int, ...]) -> int:
+    """
+    :return: XOR of keys of squares set in changed mask
+    """
+    delta = 0
+    for i in iter_bits(changed):
+        delta ^= keys[i]
+    return delta
+
+
+class BitBoard:
+    """
+    Board implementation that keeps the 32 playable squares packed into four integer bitmasks.
+    Bit i of a mask corresponds to the i-th playable square counting row by row (see SQUARES).
+    It offers the same public surface as models.Board and follows the same rules.
+    """
+    white_men: int
+    white_kings: int
+    black_men: int
+    black_kings: int
+    moves: list[Move | int]
+    zobrist_key: int
+    totals: MaterialTotals
+    status_cache: dict[int, GameStatus]
+    move_buffers: list[list[int]]
+    history: DrawHistory
+
+    def __init__(self, white_men: int = 0, white_kings: int = 0, black_men: int = 0, black_kings: int = 0,
+                 moves: list[Move | int] = None):
+        self.white_men = white_men
+        self.white_kings = white_kings
+        self.black_men = black_men
+        self.black_kings = black_kings
+        self.moves = moves or []
+        self.zobrist_key = self.compute_zobrist_key()
+        self.totals = MaterialTotals.of(self.pieces())
+        self.status_cache = {}
+        self.move_buffers = []
+        self.history = DrawHistory(self.zobrist_key)
+
+    def compute_zobrist_key(self) -> int:
+        """
+        :return: Zobrist key of the position computed from scratch, the same as models.Board's key
+        """
+        return zobrist_delta(self.white_men, ZOBRIST_KEYS[0]) ^ zobrist_delta(self.white_kings, ZOBRIST_KEYS[1]) \
+            ^ zobrist_delta(self.black_men, ZOBRIST_KEYS[2]) ^ zobrist_delta(self.black_kings, ZOBRIST_KEYS[3])
+
+    @staticmethod
+    def populate_initial_board() -> 'BitBoard':
+        black_men = sum(1 << i for i, sq in enumerate(SQUARES) if sq.x < 2)
+        white_men = sum(1 << i for i, sq in enumerate(SQUARES) if sq.x >= BOARD_SIZE - 2)
+        return BitBoard(white_men=white_men, black_men=black_men)
+
+    @classmethod
+    def from_num_repr(cls, arr) -> 'BitBoard':
+        board = cls()
+        for x, y, color, type_ in arr:
+            bit = 1 << square_index(x, y)
+            if color == 0 and type_ == 0:
+                board.white_men |= bit
+            elif color == 0:
+                board.white_kings |= bit
+            elif type_ == 0:
+                board.black_men |= bit
+            else:
+                board.black_kings |= bit
+        board.zobrist_key = board.compute_zobrist_key()
+        board.totals = MaterialTotals.of(board.pieces())
+        board.history = DrawHistory(board.zobrist_key)
+        return board
+
+    @classmethod
+    def from_board(cls, board) -> 'BitBoard':
+        """
+        :param board: models.Board (or any object with to_num_repr method)
+        """
+        return cls.from_num_repr(board.to_num_repr())
+
+    def to_num_repr(self):
+        arr = []
+        for i in iter_bits(self.white_men | self.white_kings | self.black_men | self.black_kings):
+            bit = 1 << i
+            color = 0 if bit & (self.white_men | self.white_kings) else 1
+            type_ = 0 if bit & (self.white_men | self.black_men) else 1
+            arr.append((SQUARES[i].x, SQUARES[i].y, color, type_))
+        return tuple(arr)
+
+    @property
+    def white(self) -> int:
+        return self.white_men | self.white_kings
+
+    @property
+    def black(self) -> int:
+        return self.black_men | self.black_kings
+
+    @property
+    def occupied(self) -> int:
+        return self.white_men | self.white_kings | self.black_men | self.black_kings
+
+    def piece_at(self, square: Square) -> Piece | None:
+        i = square_index(square.x, square.y)
+        if i is None:
+            return None
+        bit = 1 << i
+        if bit & self.white_men:
+            return Piece(PieceType.Man, Side.White)
+        elif bit & self.white_kings:
+            return Piece(PieceType.King, Side.White)
+        elif bit & self.black_men:
+            return Piece(PieceType.Man, Side.Black)
+        elif bit & self.black_kings:
+            return Piece(PieceType.King, Side.Black)
+        return None
+
+    def pieces(self):
+        """
+        :return: generator of (square, piece) pairs of occupied squares. Yielded pieces are shared between calls
+                 and must not be modified.
+        """
+        for mask, piece in ((self.white_men, WHITE_MAN), (self.white_kings, WHITE_KING),
+                            (self.black_men, BLACK_MAN), (self.black_kings, BLACK_KING)):
+            for i in iter_bits(mask):
+                yield SQUARES[i], piece
+
+    @property
+    def squares(self) -> dict[Square, Piece | None]:
+        """
+        :return: a models.Board-like mapping of squares to pieces. It is built on every access, so it is meant only
+                 for compatibility with code written for models.Board, not for search.
+        """
+        squares = {Square(x, y): None for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)}
+        for sq, piece in self.pieces():
+            squares[sq] = Piece(piece.type_, piece.side)
+        return squares
+
+    @property
+    def rating(self) -> int:
+        """
+        :return: Rating of the state of the game, see models.Board.rating.
+        """
+        status = self.decided_status()
+        if status == GameStatus.BlackWon:
+            return -1000
+        elif status == GameStatus.WhiteWon:
+            return 1000
+        return self.totals.sums[BASE_VALUES]
+
+    @property
+    def is_in_draw_state(self) -> bool:
+        """
+        :return: whether the game is drawn by the number of moves made: QUIET_PLIES_DRAW plies of kings without
+                 captures or MAX_PLIES_DRAW plies in total (see models.DrawHistory), in O(1)
+        """
+        return self.history.is_draw
+
+    def decided_status(self) -> GameStatus:
+        """
+        :return: WhiteWon or BlackWon if one of the sides has no pieces or no legal moves, Ongoing otherwise,
+                 see models.Board.decided_status
+        """
+        status = self.status_cache.get(self.zobrist_key)
+        if status is None:
+            white, black = self.white, self.black
+            if (black and not white) or not self.has_moves(Side.White):
+                status = GameStatus.BlackWon
+            elif white and not black or not self.has_moves(Side.Black):
+                status = GameStatus.WhiteWon
+            else:
+                status = GameStatus.Ongoing
+            if len(self.status_cache) >= STATUS_CACHE_SIZE:
+                self.status_cache.clear()
+            self.status_cache[self.zobrist_key] = status
+        return status
+
+    def status(self) -> GameStatus:
+        """
+        :return: status of the game, see models.Board.status
+        """
+        status = self.decided_status()
+        if status == GameStatus.Ongoing and self.is_in_draw_state:
+            return GameStatus.Draw
+        return status
+
+    def _pieces_of(self, side: Side) -> tuple[int, int]:
+        if side == Side.White:
+            return self.white_men, self.white_kings
+        return self.black_men, self.black_kings
+
+    def _simple_moves(self, side: Side) -> list[SimpleMove]:
+        men, kings = self._pieces_of(side)
+        empty = ~self.occupied
+        forward = FORWARD[0 if side == Side.White else 1]
+        moves = []
+        for i in iter_bits(men):
+            for j in forward[i]:
+                if empty & (1 << j):
+                    moves.append(SIMPLE_MOVES[(i, j)])
+        for i in iter_bits(kings):
+            for ray in RAYS[i]:
+                for j in ray:
+                    if not empty & (1 << j):
+                        break
+                    moves.append(SIMPLE_MOVES[(i, j)])
+        return moves
+
+    def has_moves(self, side: Side) -> bool:
+        """
+        :return: whether the side has at least one legal move, without generating all of them
+        """
+        men, kings = self._pieces_of(side)
+        own = men | kings
+        enemy = self.black if side == Side.White else self.white
+        empty = ~(own | enemy)
+        forward = FORWARD[0 if side == Side.White else 1]
+        for i in iter_bits(men):
+            for j in forward[i]:
+                if empty & (1 << j):
+                    return True
+        for i in iter_bits(kings):
+            for ray in RAYS[i]:
+                if ray and empty & (1 << ray[0]):
+                    return True
+        for i in iter_bits(own):
+            for _ in self._single_captures(i, bool(kings & (1 << i)), own & ~(1 << i), enemy):
+                return True
+        return False
+
+    @staticmethod
+    def _single_captures(i: int, is_king: bool, own: int, enemy: int):
+        """
+        :return: generator of (landing square index, mask of captured pieces) pairs for one jump from square i
+        """
+        if not is_king:
+            for over, land in JUMPS[i]:
+                if enemy & (1 << over) and not (own | enemy) & (1 << land):
+                    yield land, 1 << over
+        else:
+            for ray in CAPTURE_RAYS[i]:
+                captured = 0
+                for j in ray:
+                    bit = 1 << j
+                    if own & bit:
+                        break
+                    elif enemy & bit:
+                        captured |= bit
+                    elif captured:
+                        yield j, captured
+
+    def _explore_captures(self, start: int, i: int, is_king: bool, own: int, enemy: int, path: list[int],
+                          taken: int, promotion_row: int, sequences: list[tuple[int, tuple[int, ...], int]]) -> None:
+        is_leaf = True
+        for land, captured in self._single_captures(i, is_king, own, enemy):
+            is_leaf = False
+            path.append(land)
+            self._explore_captures(start, land, is_king or bool(promotion_row & (1 << land)), own, enemy & ~captured,
+                                   path, taken | captured, promotion_row, sequences)
+            path.pop()
+        if is_leaf and path:
+            sequences.append((start, tuple(path), taken))
+
+    def _capture_sequences(self, side: Side) -> list[tuple[int, tuple[int, ...], int]]:
+        """
+        :return: (from square index, indices of landing squares, mask of captured pieces) of capture moves of the side
+                 with the most jumps
+        """
+        men, kings = self._pieces_of(side)
+        own = men | kings
+        enemy = self.black if side == Side.White else self.white
+        promotion_row = WHITE_PROMOTION_ROW if side == Side.White else BLACK_PROMOTION_ROW
+        sequences = []
+        for i in iter_bits(own):
+            self._explore_captures(i, i, bool(kings & (1 << i)), own & ~(1 << i), enemy, [], 0, promotion_row,
+                                   sequences)
+        if sequences:
+            most_steps = max(len(path) for _, path, _ in sequences)
+            sequences = [sequence for sequence in sequences if len(sequence[1]) == most_steps]
+        return sequences
+
+    def get_capture_moves_of_side(self, side: Side) -> set[CrownMove]:
+        """
+        :return: capture moves of the side with the most jumps (the only ones allowed when any capture is possible)
+        """
+        return {
+            CrownMove(SQUARES[start], [SQUARES[j] for j in path]) for start, path, _ in self._capture_sequences(side)
+        }
+
+    def get_possible_moves_of_side(self, side: Side) -> set[Move]:
+        return self.get_capture_moves_of_side(side) or set(self._simple_moves(side))
+
+    def generate_moves(self, side: Side, ply: int = 0, captures_only: bool = False) -> list[int]:
+        """
+        Generates legal moves of the side packed into ints (see MOVE_CAPTURED_SHIFT) into a move buffer kept for the
+        given ply, so that the search does not allocate new collections for moves in every node.
+        The buffer is overwritten by the next call for the same ply. Use to_move to get a Move of a packed move.
+        :param ply: distance from the root of the search, selects the buffer
+        :param captures_only: whether to generate only captures (no moves are generated if there are none)
+        :return: the buffer filled with moves
+        """
+        while len(self.move_buffers) <= ply:
+            self.move_buffers.append([])
+        buffer = self.move_buffers[ply]
+        buffer.clear()
+        # Sequences with different paths but the same squares and captured pieces lead to the same position
+        buffer.extend(dict.fromkeys(start | path[-1] << MOVE_TO_SHIFT | taken << MOVE_CAPTURED_SHIFT
+                                    for start, path, taken in self._capture_sequences(side)))
+        if buffer or captures_only:
+            return buffer
+        buffer.extend(self.iter_simple_moves(side))
+        return buffer
+
+    def iter_simple_moves(self, side: Side):
+        """
+        Generates simple moves lazily, piece by piece, so that a search can stop generating after a cutoff.
+        The moves are legal only if the side has no capture (see generate_moves with captures_only).
+        :return: generator of simple moves of the side packed into ints
+        """
+        men, kings = self._pieces_of(side)
+        empty = ~self.occupied
+        forward = FORWARD[0 if side == Side.White else 1]
+        for i in iter_bits(men):
+            for j in forward[i]:
+                if empty & (1 << j):
+                    yield i | j << MOVE_TO_SHIFT
+        for i in iter_bits(kings):
+            for ray in RAYS[i]:
+                for j in ray:
+                    if not empty & (1 << j):
+                        break
+                    yield i | j << MOVE_TO_SHIFT
+
+    def is_simple_move_possible(self, side: Side, move: Move | int) -> bool:
+        """
+        Checks a move remembered from another position (e.g. a killer move) without generating moves.
+        Like moves of iter_simple_moves, the move is legal only if the side has no capture.
+        :param move: packed move or Move
+        :return: whether the move is a simple move the side can make on the board
+        """
+        if not isinstance(move, int):
+            if not isinstance(move, SimpleMove):
+                return False
+            move = self.from_move(move)
+        if move >> MOVE_CAPTURED_SHIFT:
+            return False
+        from_i = move & MOVE_SQUARE_MASK
+        to_i = move >> MOVE_TO_SHIFT & MOVE_SQUARE_MASK
+        men, kings = self._pieces_of(side)
+        if self.occupied & (1 << to_i):
+            return False
+        if men & (1 << from_i):
+            return to_i in FORWARD[0 if side == Side.White else 1][from_i]
+        if kings & (1 << from_i):
+            between = BETWEEN.get((from_i, to_i))
+            return between is not None and not between & self.occupied
+        return False
+
+    def from_move(self, move: Move) -> int:
+        """
+        :param move: legal move on the board
+        :return: the move packed into an int, like the ones generated by generate_moves
+        """
+        from_i = square_index(move.from_sq.x, move.from_sq.y)
+        to_i = square_index(move.to_sq.x, move.to_sq.y)
+        captured = 0
+        if isinstance(move, CrownMove):
+            prev = from_i
+            for sq in move.through:
+                curr = square_index(sq.x, sq.y)
+                captured |= BETWEEN[(prev, curr)]
+                prev = curr
+            captured &= self.black if self.white & (1 << from_i) else self.white
+        return from_i | to_i << MOVE_TO_SHIFT | captured << MOVE_CAPTURED_SHIFT
+
+    def to_move(self, move: int) -> Move:
+        """
+        :param move: legal move on the board packed into an int
+        :return: the move as a Move object, e.g. for printing. Captures are looked up among legal moves of the board,
+                 so this is meant only for the boundary of the search.
+        """
+        from_i = move & MOVE_SQUARE_MASK
+        to_i = move >> MOVE_TO_SHIFT & MOVE_SQUARE_MASK
+        captured = move >> MOVE_CAPTURED_SHIFT
+        if not captured:
+            return SIMPLE_MOVES[(from_i, to_i)]
+        side = Side.White if self.white & (1 << from_i) else Side.Black
+        for start, path, taken in self._capture_sequences(side):
+            if start == from_i and path[-1] == to_i and taken == captured:
+                return CrownMove(SQUARES[start], [SQUARES[j] for j in path])
+        raise ValueError(f'{move} is not a legal capture on the board')
+
+    def make_move(self, move: Move | int) -> tuple:
+        """
+        Applies a move with its all consequences (promotion to a king, etc.) in place.
+        :param move: move generated by get_possible_moves_of_side method or packed move generated by generate_moves
+        :return: undo record to be passed to unmake_move method: the previous masks, Zobrist key and lists of totals
+        """
+        totals = self.totals
+        undo = (self.white_men, self.white_kings, self.black_men, self.black_kings, self.zobrist_key, totals.counts,
+                totals.sums)
+        code = move if isinstance(move, int) else self.from_move(move)
+        from_i = code & MOVE_SQUARE_MASK
+        to_i = code >> MOVE_TO_SHIFT & MOVE_SQUARE_MASK
+        captured = code >> MOVE_CAPTURED_SHIFT
+        from_bit, to_bit = 1 << from_i, 1 << to_i
+        occupied = self.white_men | self.white_kings | self.black_men | self.black_kings
+        if not occupied & from_bit:
+            raise ValueError(f'{SQUARES[from_i]} is empty, but it was attempted to move piece from it')
+        if to_i != from_i and occupied & to_bit:
+            raise ValueError(f'{SQUARES[to_i]} is occupied, but it was attempted to move piece to it')
+
+        if captured:
+            self.white_men &= ~captured
+            self.white_kings &= ~captured
+            self.black_men &= ~captured
+            self.black_kings &= ~captured
+
+        # Kinds of the moved piece before and after the move, indices of masks in undo record and of ZOBRIST_KEYS
+        if self.white_men & from_bit:
+            from_kind = 0
+            self.white_men &= ~from_bit
+            if to_bit & WHITE_PROMOTION_ROW:
+                to_kind = 1
+                self.white_kings |= to_bit
+            else:
+                to_kind = 0
+                self.white_men |= to_bit
+        elif self.white_kings & from_bit:
+            from_kind = to_kind = 1
+            self.white_kings = self.white_kings & ~from_bit | to_bit
+        elif self.black_men & from_bit:
+            from_kind = 2
+            self.black_men &= ~from_bit
+            if to_bit & BLACK_PROMOTION_ROW:
+                to_kind = 3
+                self.black_kings |= to_bit
+            else:
+                to_kind = 2
+                self.black_men |= to_bit
+        else:
+            from_kind = to_kind = 3
+            self.black_kings = self.black_kings & ~from_bit | to_bit
+
+        # Key and totals are updated from the squares changed by the move only. Totals get new lists, so that the
+        # previous ones stay in the undo record.
+        values = kind_square_values()
+        self.zobrist_key ^= ZOBRIST_KEYS[from_kind][from_i] ^ ZOBRIST_KEYS[to_kind][to_i]
+        sums = [total - before + after
+                for total, before, after in zip(totals.sums, values[from_kind][from_i], values[to_kind][to_i])]
+        if from_kind != to_kind or captured:
+            counts = list(totals.counts)
+            counts[from_kind] -= 1
+            counts[to_kind] += 1
+            for kind in ((2, 3) if from_kind < 2 else (0, 1)) if captured else ():
+                for i in iter_bits(undo[kind] & captured):
+                    self.zobrist_key ^= ZOBRIST_KEYS[kind][i]
+                    counts[kind] -= 1
+                    sums = [total - value for total, value in zip(sums, values[kind][i])]
+            totals.counts = counts
+        totals.sums = sums
+        self.moves.append(move)
+        self.history.push(self.zobrist_key, captured != 0 or from_kind in (0, 2))
+        return undo
+
+    def unmake_move(self, undo: tuple) -> None:
+        """
+        Reverts a move applied by make_move method. Moves have to be reverted in reversed order of applying them.
+        :param undo: undo record returned by make_move method
+        """
+        self.white_men, self.white_kings, self.black_men, self.black_kings, self.zobrist_key, self.totals.counts, \
+            self.totals.sums = undo
+        self.moves.pop()
+        self.history.pop()
+
+    def move(self, move: Move) -> 'BitBoard':
+        """
+        Applies a move with its all consequences (promotion to a king, etc.)
+        :param move: move generated by get_possible_moves_of_side method
+        :return: new board, the current one is left untouched
+        """
+        this = BitBoard(self.white_men, self.white_kings, self.black_men, self.black_kings, list(self.moves))
+        this.history = self.history.copy()
+        this.status_cache = self.status_cache
+        this.make_move(move)
+        return this
+
+    def dump(self, stream=None):
+        if stream is None:
+            stream = StringIO()
+        stream.write('\t' + '\t'.join((str(i + 1) for i in range(BOARD_SIZE))) + '\n')
+        for row in range(BOARD_SIZE):
+            stream.write(chr(row + 97) + '\t')
+            for col in range(BOARD_SIZE):
+                sq = Square(row, col)
+                piece = self.piece_at(sq)
+                if not piece:
+                    match sq.side:
+                        case Side.White:
+                            stream.write(Symbols.WhiteSquare + '\t')
+                        case Side.Black:
+                            stream.write(Symbols.BlackSquare + '\t')
+                else:
+                    match (piece.type_, piece.side):
+                        case (PieceType.Man, Side.White):
+                            stream.write(Symbols.WhiteMan + '\t')
+                        case (PieceType.King, Side.White):
+                            stream.write(Symbols.WhiteKing + '\t')
+                        case (PieceType.Man, Side.Black):
+                            stream.write(Symbols.BlackMan + '\t')
+                        case (PieceType.King, Side.Black):
+                            stream.write(Symbols.BlackKing + '\t')
+            stream.write(chr(row + 97) + '\t\n')
+        stream.write('\t' + '\t'.join((str(i + 1) for i in range(BOARD_SIZE))) + '\n')
+
+    def __eq__(self, other):
+        if not isinstance(other, BitBoard):
+            return NotImplemented
+        return (self.white_men, self.white_kings, self.black_men, self.black_kings) == \
+            (other.white_men, other.white_kings, other.black_men, other.black_kings)
+
+    def __hash__(self):
+        return self.zobrist_key
@@ -0,0 +1,149 @@
+"""
+Opening book: scores of moves of positions from the first plies of the game, computed offline by deep searches.
+
+File layout (little-endian): header (magic, format version, depth of the book in plies, number of records) followed by
+records (key of the position with side to move, move packed like by BitBoard.generate_moves, score of the move)
+sorted by key, so that moves of a position are found by binary search.
+"""
+import mmap
+import struct
+from collections import deque
+from pathlib import Path
+from random import Random
+
+from si_project.checkers.alphabeta import alphabeta
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.models import Side, Move
+from si_project.checkers.ordering import MoveOrdering
+from si_project.checkers.ratings import base_rating
+from si_project.checkers.transposition import TranspositionTable
+from si_project.checkers.zobrist import side_key
+
+BOOK_PATH = Path(__file__).parent.parent.parent.resolve() / 'assets' / 'checkers_book' / 'book.bin'
+
+_MAGIC = b'CKOB'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBBI')
+_RECORD = struct.Struct('<QQh')
+
+
+def _best_score(side: Side, scores) -> int:
+    return max(scores) if side == Side.White else min(scores)
+
+
+def build_book(depth: int, search_depth: int, margin: int = 0, rating_heuristic=base_rating,
+               board: BitBoard | None = None, side: Side = Side.White) -> list[tuple[int, int, int]]:
+    """
+    Scores all moves of positions reachable from the board in less than depth plies, when both sides play moves
+    scored at most margin worse than the best one. Every move is scored by alphabeta to search_depth plies,
+    including the move.
+    :param board: position to start from, the initial one by default
+    :return: records (key, packed move, score) sorted by key, to be written by save_book
+    """
+    board = board or BitBoard.populate_initial_board()
+    table = TranspositionTable(1 << 18)
+    ordering = MoveOrdering()
+    records = []
+    queue = deque([(board, side, 0)])
+    visited = set()
+    while queue:
+        board, side, ply = queue.popleft()
+        key = board.zobrist_key ^ side_key(side)
+        if key in visited:
+            continue
+        visited.add(key)
+        scored = []
+        for move in list(board.generate_moves(side)):
+            undo = board.make_move(move)
+            scored.append((move, alphabeta(side.next, board, search_depth - 1, rating_heuristic, table=table,
+                                           ordering=ordering, ply=1)))
+            board.unmake_move(undo)
+        if not scored:
+            continue
+        best = _best_score(side, [score for _, score in scored])
+        for move, score in scored:
+            records.append((key, move, score))
+            if ply + 1 < depth and abs(score - best) <= margin:
+                queue.append((board.move(move), side.next, ply + 1))
+    return sorted(records)
+
+
+def save_book(records: list[tuple[int, int, int]], depth: int, path: Path = BOOK_PATH) -> None:
+    """
+    Writes records built by build_book to depth plies.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as book_file:
+        book_file.write(_HEADER.pack(_MAGIC, _VERSION, depth, len(records)))
+        for record in sorted(records):
+            book_file.write(_RECORD.pack(*record))
+
+
+class OpeningBook:
+    """
+    Opening book file mapped into memory.
+    Moves are chosen at random among the ones scored at most margin worse than the best one; margin 0 still chooses
+    among equally scored moves. Use as a context manager or call close once it is no longer needed.
+    """
+    depth: int
+    margin: int
+
+    def __init__(self, path: Path = BOOK_PATH, margin: int = 0, seed: int | None = None):
+        with open(path, 'rb') as book_file:
+            self._mm = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.depth, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f'{path} is not an opening book of version {_VERSION}')
+        self.margin = margin
+        self._random = Random(seed)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, i: int) -> tuple[int, int, int]:
+        return _RECORD.unpack_from(self._mm, _HEADER.size + i * _RECORD.size)
+
+    def moves(self, board, side: Side) -> list[tuple[Move, int]]:
+        """
+        :param board: models.Board or bitboard.BitBoard
+        :return: moves of the position stored in the book with their scores, empty if the position is not in the book
+        """
+        key = board.zobrist_key ^ side_key(side)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count or self._record(low)[0] != key:
+            return []
+        bitboard = board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+        found = []
+        while low < self._count:
+            record_key, move, score = self._record(low)
+            if record_key != key:
+                break
+            found.append((bitboard.to_move(move), score))
+            low += 1
+        return found
+
+    def choose(self, board, side: Side) -> tuple[Move, int] | None:
+        """
+        :return: move of the book for the position with its score, or None if the position is not in the book
+        """
+        moves = self.moves(board, side)
+        if not moves:
+            return None
+        best = _best_score(side, [score for _, score in moves])
+        return self._random.choice([(move, score) for move, score in moves if abs(score - best) <= self.margin])
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
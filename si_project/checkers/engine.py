@@ -0,0 +1,299 @@
+"""
+Engine process speaking a line-based protocol over stdin/stdout, so that a GUI or a tournament harness can drive
+engines as local subprocesses (see EngineClient).
+
+Commands (one per line):
+- isready - answered with readyok once previous commands are handled,
+- position startpos|fen <fen> [moves <move> ...] - sets the position reached by given moves from the initial one or
+  from the one in FEN-like notation (see notation.to_fen),
+- go [depth <plies>] [movetime <seconds>] - searches the position (until stop if no limit is given) and answers
+  with "info depth <plies> score <score> pv <move> ..." and "bestmove <move> [ponder <move>]" ("bestmove none" if
+  the side to move has no moves),
+- stop - finishes the search early, answering with its best move,
+- ponder on|off - whether to search the position after the predicted reply while waiting for the next command,
+- quit - stops the engine.
+Moves are written like "c3-d4" (simple move) or "c3xe5xg7" (capture through all landing squares), see
+notation.notation.
+Errors are reported with a line starting with "error".
+
+The transposition table and move ordering are kept between searches, so that results of previous searches (and of
+pondering) are reused by the next ones.
+"""
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Thread, Event, Lock
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.book import OpeningBook, BOOK_PATH
+from si_project.checkers.models import Side
+from si_project.checkers.notation import notation, parse_move, from_fen
+from si_project.checkers.ordering import MoveOrdering
+from si_project.checkers.ratings import base_rating
+from si_project.checkers.search import search
+from si_project.checkers.tablebase import Tablebase, TABLEBASE_PATH
+from si_project.checkers.transposition import TranspositionTable
+
+ROOT_PATH = Path(__file__).parent.parent.parent.resolve()
+ENGINE_COMMAND = [sys.executable, '-m', 'si_project.checkers.engine']
+
+QUIESCENCE_CAP = 8
+TABLE_SIZE = 1 << 18
+BOOK_MARGIN = 1
+
+
+class Engine:
+    """
+    Protocol handler. Searches (and pondering after them) run in a background thread, so that stop is handled while
+    searching; at most one background search runs at a time.
+    """
+    board: BitBoard
+    side: Side
+    table: TranspositionTable
+    ordering: MoveOrdering
+    ponder: bool
+
+    def __init__(self, output=None, rating_heuristic=base_rating, table_size: int = TABLE_SIZE,
+                 quiescence_cap: int = QUIESCENCE_CAP, ponder: bool = True, tablebase: Tablebase | None = None,
+                 book: OpeningBook | None = None):
+        self.output = output or sys.stdout
+        self.rating_heuristic = rating_heuristic
+        self.quiescence_cap = quiescence_cap
+        self.ponder = ponder
+        self.tablebase = tablebase
+        self.book = book
+        self.board = BitBoard.populate_initial_board()
+        self.side = Side.White
+        self.table = TranspositionTable(table_size)
+        self.ordering = MoveOrdering()
+        self._output_lock = Lock()
+        self._thread: Thread | None = None
+        self._stop = Event()
+
+    def send(self, line: str) -> None:
+        with self._output_lock:
+            print(line, file=self.output, flush=True)
+
+    def stop(self) -> None:
+        """
+        Stops the background search or pondering and waits for it to finish.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def handle(self, line: str) -> bool:
+        """
+        :return: False once the engine should quit, True otherwise
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'quit':
+            self.stop()
+            return False
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'stop':
+            self.stop()
+        elif command == 'position':
+            self._position(args)
+        elif command == 'go':
+            self._go(args)
+        elif command == 'ponder' and args in (['on'], ['off']):
+            self.ponder = args[0] == 'on'
+        else:
+            self.send(f'error unknown command {line.strip()}')
+        return True
+
+    def run(self, input_stream=None) -> None:
+        """
+        Handles commands read from the stream (stdin by default) until quit or end of the stream.
+        """
+        for line in input_stream or sys.stdin:
+            if not self.handle(line):
+                return
+        self.stop()
+
+    def _position(self, args: list[str]) -> None:
+        try:
+            if args[:1] == ['startpos']:
+                board, side = BitBoard.populate_initial_board(), Side.White
+                moves = args[1:]
+            elif args[:1] == ['fen'] and len(args) > 1:
+                board, side = from_fen(args[1])
+                moves = args[2:]
+            else:
+                raise ValueError(args)
+            if moves and moves[0] != 'moves':
+                raise ValueError(moves)
+        except ValueError:
+            self.send(f'error invalid position {" ".join(args)}')
+            return
+        for token in moves[1:]:
+            move = parse_move(board, side, token)
+            if move is None:
+                self.send(f'error illegal move {token}')
+                return
+            board.make_move(move)
+            side = side.next
+        self.stop()
+        self.board, self.side = board, side
+
+    def _go(self, args: list[str]) -> None:
+        depth, movetime = None, None
+        try:
+            for name, value in zip(args[::2], args[1::2]):
+                if name == 'depth':
+                    depth = int(value)
+                elif name == 'movetime':
+                    movetime = float(value)
+                else:
+                    raise ValueError(name)
+            if len(args) % 2:
+                raise ValueError(args[-1])
+        except ValueError:
+            self.send(f'error invalid go {" ".join(args)}')
+            return
+        self.stop()
+        self._stop = Event()
+        self._thread = Thread(target=self._search, args=(self.board, self.side, depth, movetime, self._stop),
+                              daemon=True)
+        self._thread.start()
+
+    def _search(self, board: BitBoard, side: Side, depth: int | None, movetime: float | None, stop: Event) -> None:
+        result = search(board, side, self.rating_heuristic, time_limit=movetime, max_depth=depth, table=self.table,
+                        ordering=self.ordering, stop=stop, quiescence_cap=self.quiescence_cap,
+                        tablebase=self.tablebase, book=self.book)
+        if result.best_move is None:
+            self.send('bestmove none')
+            return
+        self.send(f'info depth {result.depth} score {result.score} pv {" ".join(map(notation, result.pv))}')
+        if len(result.pv) < 2:
+            self.send(f'bestmove {notation(result.best_move)}')
+            return
+        self.send(f'bestmove {notation(result.best_move)} ponder {notation(result.pv[1])}')
+        if self.ponder and not stop.is_set():
+            # The opponent is expected to play the predicted reply; searching the position after it fills the table
+            # for the next search until the next command stops pondering
+            ponder_board = board.move(result.pv[0]).move(result.pv[1])
+            search(ponder_board, side, self.rating_heuristic, table=self.table, ordering=self.ordering, stop=stop,
+                   quiescence_cap=self.quiescence_cap, tablebase=self.tablebase)
+
+
+@dataclass
+class EngineReply:
+    best_move: str | None
+    ponder_move: str | None = None
+    score: int | None = None
+    depth: int | None = None
+    pv: list[str] = field(default_factory=list)
+
+
+class EngineClient:
+    """
+    Engine run as a subprocess and driven through the protocol. Use as a context manager or call close once it is no
+    longer needed.
+    """
+
+    def __init__(self, command: list[str] | None = None, cwd: Path = ROOT_PATH):
+        """
+        :param command: command starting the engine, this module's engine by default
+        """
+        self._process = subprocess.Popen(command or ENGINE_COMMAND, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         text=True, bufsize=1, cwd=cwd)
+
+    def send(self, command: str) -> None:
+        self._process.stdin.write(command + '\n')
+        self._process.stdin.flush()
+
+    def _read_line(self) -> str:
+        line = self._process.stdout.readline()
+        if not line:
+            raise RuntimeError('Engine process has exited')
+        if line.startswith('error'):
+            raise RuntimeError(f'Engine reported: {line.strip()}')
+        return line.strip()
+
+    def is_ready(self) -> None:
+        """
+        Waits until the engine has handled all commands sent so far.
+        """
+        self.send('isready')
+        while self._read_line() != 'readyok':
+            pass
+
+    def position(self, moves: list[str] = (), fen: str | None = None) -> None:
+        """
+        :param moves: moves played from the starting position, in notation of the protocol
+        :param fen: starting position in FEN-like notation, the initial one if not given
+        """
+        command = ['position', 'startpos'] if fen is None else ['position', 'fen', fen]
+        self.send(' '.join(command + ['moves', *moves] if moves else command))
+
+    def go(self, depth: int | None = None, movetime: float | None = None) -> None:
+        """
+        Starts a search; without limits it lasts until stop. Its result is read by best_move.
+        """
+        command = ['go']
+        if depth is not None:
+            command += ['depth', str(depth)]
+        if movetime is not None:
+            command += ['movetime', str(movetime)]
+        self.send(' '.join(command))
+
+    def stop(self) -> None:
+        self.send('stop')
+
+    def best_move(self) -> EngineReply:
+        """
+        Waits for the result of the search started by go.
+        """
+        reply = EngineReply(None)
+        while True:
+            tokens = self._read_line().split()
+            if tokens[0] == 'info':
+                reply.depth = int(tokens[tokens.index('depth') + 1])
+                reply.score = int(tokens[tokens.index('score') + 1])
+                reply.pv = tokens[tokens.index('pv') + 1:]
+            elif tokens[0] == 'bestmove':
+                reply.best_move = None if tokens[1] == 'none' else tokens[1]
+                reply.ponder_move = tokens[3] if len(tokens) > 3 else None
+                return reply
+
+    def search(self, depth: int | None = None, movetime: float | None = None) -> EngineReply:
+        """
+        :return: result of a search of the current position with given limits
+        """
+        self.go(depth, movetime)
+        return self.best_move()
+
+    def close(self, timeout: float = 5) -> None:
+        if self._process.poll() is None:
+            try:
+                self.send('quit')
+                self._process.wait(timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+        self._process.stdin.close()
+        self._process.stdout.close()
+
+    def __enter__(self) -> 'EngineClient':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def main():
+    tablebase = Tablebase() if TABLEBASE_PATH.exists() else None
+    book = OpeningBook(margin=BOOK_MARGIN) if BOOK_PATH.exists() else None
+    Engine(tablebase=tablebase, book=book).run()
+
+
+if __name__ == '__main__':
+    main()
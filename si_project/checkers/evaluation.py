@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import Side, PieceType
+
+# This module is imported by models, so Side and PieceType are only used through their values
+# and piece values are taken from ratings module on first use.
+PIECE_KINDS = 4
+# Index of ratings.base_piece_value in MaterialTotals.sums (it is the first entry of ratings.PIECE_VALUES)
+BASE_VALUES = 0
+
+
+@cache
+def value_functions() -> tuple:
+    """
+    :return: piece value functions of ratings.PIECE_VALUES, in order of MaterialTotals.sums
+    """
+    from .ratings import PIECE_VALUES
+    return tuple(PIECE_VALUES.values())
+
+
+@cache
+def square_values(x: int, y: int, side: 'Side', type_: 'PieceType') -> tuple[int, ...]:
+    """
+    :return: signed (positive for white, negative for black) values of a piece standing on square (x, y),
+             one for every function of value_functions()
+    """
+    from .models import Square, Piece
+    sign = 1 if side.value == 1 else -1
+    return tuple(sign * piece_value(Square(x, y), Piece(type_, side)) for piece_value in value_functions())
+
+
+@dataclass(slots=True)
+class MaterialTotals:
+    """
+    Running totals of pieces on a board, kept up to date by methods changing the board,
+    so that ratings do not have to sum values of all pieces in every node.
+    """
+    counts: list[int]  # numbers of white men, white kings, black men and black kings
+    sums: list[int]  # values of white pieces minus values of black pieces, for every function of value_functions()
+
+    @classmethod
+    def of(cls, pieces) -> 'MaterialTotals':
+        """
+        :param pieces: iterable of (square, piece) pairs, e.g. result of board's pieces method
+        :return: totals computed from scratch
+        """
+        totals = cls([0] * PIECE_KINDS, [0] * len(value_functions()))
+        for sq, piece in pieces:
+            totals.update(sq.x, sq.y, piece.side, piece.type_, 1)
+        return totals
+
+    def update(self, x: int, y: int, side: 'Side', type_: 'PieceType', sign: int) -> None:
+        """
+        Adds (sign 1) or removes (sign -1) a piece standing on square (x, y).
+        """
+        self.counts[(side.value - 1) * 2 + type_.value - 1] += sign
+        sums = self.sums
+        for i, value in enumerate(square_values(x, y, side, type_)):
+            sums[i] += sign * value
+
+    @property
+    def white_count(self) -> int:
+        return self.counts[0] + self.counts[1]
+
+    @property
+    def black_count(self) -> int:
+        return self.counts[2] + self.counts[3]
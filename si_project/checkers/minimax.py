@@ -1,22 +1,54 @@
+from time import perf_counter
+
 from si_project.checkers.models import Side, Board
+from si_project.checkers.stats import SearchStats
 
 
-def minimax(side: Side, board: Board, depth=4, rating_heuristic=None) -> int:
+def minimax(side: Side, board: Board, depth=4, rating_heuristic=None, ply: int = 0,
+            stats: SearchStats | None = None) -> int:
     """
     Returns best possible score for a given side from current board.
+    The board is walked in place with make_move/unmake_move and is left unchanged afterwards.
+    :param ply: distance from the root of the search, used by statistics and to select the move buffer
+    :param stats: optional statistics collector; nothing is measured if it is not given
     """
-    if abs(rating_heuristic(board)) == 1000 or depth == 0:
-        return rating_heuristic(board)
-    next_boards = (board.move(move) for move in board.get_possible_moves_of_side(side))
-    if not next_boards:
-        return rating_heuristic(board)
+    if stats is not None:
+        stats.count_node(ply)
+        started = perf_counter()
+    rating = rating_heuristic(board)
+    if stats is not None:
+        stats.eval_seconds += perf_counter() - started
+    if abs(rating) == 1000:
+        return rating
+    # Draws are scored like by alphabeta
+    if board.is_in_draw_state or ply and board.history.is_repetition:
+        return 0
+    if depth == 0:
+        return rating
+    if stats is not None:
+        started = perf_counter()
+    moves = board.generate_moves(side, ply)
+    if stats is not None:
+        stats.movegen_seconds += perf_counter() - started
+        stats.expanded_nodes += 1
+        stats.children += len(moves)
+    res = []
+    for move in moves:
+        if stats is not None:
+            started = perf_counter()
+        undo = board.make_move(move)
+        if stats is not None:
+            stats.apply_seconds += perf_counter() - started
+        res.append(minimax(side.next, board, depth - 1, rating_heuristic, ply + 1, stats))
+        if stats is not None:
+            started = perf_counter()
+        board.unmake_move(undo)
+        if stats is not None:
+            stats.apply_seconds += perf_counter() - started
+    if not res:
+        # A side that cannot move loses (see Board.status)
+        return -1000 if side == Side.White else 1000
     if side == Side.White:
-        res = [minimax(Side.Black, board, depth - 1, rating_heuristic) for board in next_boards]
-        if not res:
-            return rating_heuristic(board)
         return max(res)
     else:
-        res = [minimax(Side.White, board, depth - 1, rating_heuristic) for board in next_boards]
-        if not res:
-            return rating_heuristic(board)
         return min(res)
@@ -1,12 +1,12 @@
 from abc import ABC
-from copy import copy
 from dataclasses import dataclass
 from enum import Enum
-from functools import cached_property, cache
 from io import StringIO
 from itertools import product
 
+from .evaluation import MaterialTotals, BASE_VALUES
 from .utilities import Symbols, Settings
+from .zobrist import piece_key, BLACK_TO_MOVE
 
 
 class Side(Enum):
@@ -26,145 +26,149 @@ class PieceType(Enum):
     King = 2
 
 
-class SquareUtilities:
-    @staticmethod
-    @cache
-    def side(x, y):
-        return Side.White if (x + y) % 2 == 0 else Side.Black
-
-    @staticmethod
-    @cache
-    def top(x, y):
-        return Square(x - 1, y)
-
-    @staticmethod
-    @cache
-    def bottom(x, y):
-        return Square(x + 1, y)
-
-    @staticmethod
-    @cache
-    def left(x, y):
-        return Square(x, y - 1)
-
-    @staticmethod
-    @cache
-    def right(x, y):
-        return Square(x, y + 1)
-
-    @staticmethod
-    @cache
-    def sector_multiplier(x, y):
-        if 2 <= x <= 5 and 2 <= y <= 5:
-            return 7
-        elif 1 <= x <= 6 and 1 <= y <= 6:
-            return 6
-        else:
-            return 5
-
-    @staticmethod
-    @cache
-    def get_squares_to(x, y, other: 'Square') -> list['Square']:
-        """
-        :param other: other Square
-        :return: a list of squares on a diagonal between current square (exclusive) and the other square (inclusive)
-        """
-        if abs(x - other.x) != abs(y - other.y):
-            return []
-        start_from_left = y <= other.y
-        start_from_top = x <= other.x
-        squares = []
-        while other.x != x or other.y != y:
-            squares.insert(0, other)
-            other = Square(
-                other.x - (1 if start_from_top else -1),
-                other.y - (1 if start_from_left else -1)
-            )
-        return squares
-
-    @staticmethod
-    @cache
-    def diagonal_squares(x, y) -> set['Square']:
-        """
-        :return: set of squares that are on the same diagonal (i.e. it is possible for King to get there in one move)
-        """
-        squares = set()
-        for direction in (1, 1), (1, -1), (-1, 1), (-1, -1):
-            x_step, y_step = direction
-            current_x, current_y = x, y
-            while 0 <= current_x <= Settings.BoardSize - 1 and 0 <= current_y <= Settings.BoardSize - 1:
-                squares.add(Square(current_x, current_y))
-                current_x, current_y = current_x + x_step, current_y + y_step
-        squares.remove(Square(x, y))
-        return squares
-
-    @staticmethod
-    @cache
-    def neighbours(x, y) -> set['Square']:
-        """
-        :return: set of squares that are on the same diagonal and are direct neigbours of current square
-        """
-        return {s for s in Square(x, y).diagonal_squares if abs(x - s.x) == 1 and abs(y - s.y) == 1}
-
-    @staticmethod
-    @cache
-    def neighbours_with_subsequent(x, y) -> set[tuple['Square', 'Square']]:
-        """
-        :return: set of pairs (neighbour, neighbour of a neighbour on the same diagonal) squares,
-                 i.e. where would a crowning take place and where would a Man go after crowning
-        """
-        squares = set()
-        for direction in (2, 2), (2, -2), (-2, 2), (-2, -2):
-            x_step, y_step = direction
-            if 0 <= x + x_step <= Settings.BoardSize - 1 and 0 <= y + y_step <= Settings.BoardSize - 1:
-                squares.add((
-                    Square(x + int(x_step / 2), y + int(y_step / 2)),
-                    Square(x + x_step, y + y_step)
-                ))
-        return squares
-
-    @staticmethod
-    @cache
-    def get_forward_neighbours(x, y, side: Side) -> set['Square']:
-        """
-        :param side: side used as a reference
-        :return: list of neigbour diagonal squares that are "in front" given a side (white or black)
-        """
-        x_diff = -1 if side == Side.Black else 1
-        return {s for s in Square(x, y).diagonal_squares if x - s.x == x_diff and abs(y - s.y) == 1}
+class GameStatus(Enum):
+    Ongoing = 1
+    WhiteWon = 2
+    BlackWon = 3
+    Draw = 4
+
+
+# Number of positions for which boards remember whether the game is decided, before the memory is cleared
+STATUS_CACHE_SIZE = 1 << 16
+
+# The game is drawn after this many plies without a capture or a move of a man (i.e. of kings' moves only), or after
+# this many plies in total
+QUIET_PLIES_DRAW = 15
+MAX_PLIES_DRAW = 100
+
+
+DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _squares_between(x: int, y: int, other: 'Square') -> list['Square']:
+    """
+    :return: a list of squares on a diagonal between (x, y) square (exclusive) and the other square (inclusive)
+    """
+    if abs(x - other.x) != abs(y - other.y):
+        return []
+    x_step = 1 if x <= other.x else -1
+    y_step = 1 if y <= other.y else -1
+    return [Square(x + i * x_step, y + i * y_step) for i in range(1, abs(x - other.x) + 1)]
+
+
+class BoardGeometry:
+    """
+    Relations between squares of a board of given size, precomputed into tables indexed by [x][y] of a square, so that
+    move generation only indexes lists. Tables are shared and must not be modified.
+    Geometry of the board of Settings.BoardSize is returned by current method.
+    """
+    __slots__ = ('size', 'squares', 'diagonal', 'neighbours', 'forward', 'jumps', 'rays', 'capture_rays', 'between')
+
+    _by_size: dict[int, 'BoardGeometry'] = {}
+    _current: 'BoardGeometry | None' = None
+
+    def __init__(self, size: int):
+        def on_board(x, y):
+            return 0 <= x < size and 0 <= y < size
+
+        coordinates = range(size)
+        self.size = size
+        self.squares = [[Square(x, y) for y in coordinates] for x in coordinates]
+        # Squares on every diagonal through the square, ordered from the nearest one, for each of DIRECTIONS
+        self.rays = [[tuple(
+            tuple(Square(x + i * x_step, y + i * y_step) for i in range(1, size)
+                  if on_board(x + i * x_step, y + i * y_step))
+            for x_step, y_step in DIRECTIONS
+        ) for y in coordinates] for x in coordinates]
+        # Kings standing on an edge cannot capture
+        self.capture_rays = [[
+            self.rays[x][y] if 0 < x < size - 1 and 0 < y < size - 1 else () for y in coordinates
+        ] for x in coordinates]
+        self.diagonal = [[
+            frozenset(sq for ray in self.rays[x][y] for sq in ray) for y in coordinates
+        ] for x in coordinates]
+        self.neighbours = [[
+            frozenset(ray[0] for ray in self.rays[x][y] if ray) for y in coordinates
+        ] for x in coordinates]
+        # Forward neighbours of Side.White and Side.Black, indexed by Side.value - 1
+        self.forward = tuple([[
+            frozenset(sq for sq in self.neighbours[x][y] if x - sq.x == x_diff) for y in coordinates
+        ] for x in coordinates] for x_diff in (1, -1))
+        self.jumps = [[frozenset(
+            (ray[0], ray[1]) for ray in self.rays[x][y] if len(ray) >= 2
+        ) for y in coordinates] for x in coordinates]
+        self.between = [[[[
+            _squares_between(x, y, self.squares[other_x][other_y]) for other_y in coordinates
+        ] for other_x in coordinates] for y in coordinates] for x in coordinates]
+
+    @classmethod
+    def of(cls, size: int) -> 'BoardGeometry':
+        geometry = cls._by_size.get(size)
+        if geometry is None:
+            geometry = cls._by_size[size] = cls(size)
+        return geometry
+
+    @classmethod
+    def current(cls) -> 'BoardGeometry':
+        """
+        :return: geometry of the board of Settings.BoardSize
+        """
+        geometry = cls._current
+        if geometry is None or geometry.size != Settings.BoardSize:
+            geometry = cls._current = cls.of(Settings.BoardSize)
+        return geometry
 
 
-@dataclass
 class Square:
-    x: int
-    y: int
+    """
+    Square of a board. Squares are interned, so there is exactly one Square object of given coordinates, which makes
+    them cheap to compare (by identity) and to hash. Squares are immutable.
+    """
+    __slots__ = ('x', 'y', 'side', 'sector_multiplier', '_hash')
+
+    _interned: dict[tuple[int, int], 'Square'] = {}
+
+    def __new__(cls, x: int, y: int) -> 'Square':
+        square = cls._interned.get((x, y))
+        if square is None:
+            square = object.__new__(cls)
+            object.__setattr__(square, 'x', x)
+            object.__setattr__(square, 'y', y)
+            object.__setattr__(square, 'side', Side.White if (x + y) % 2 == 0 else Side.Black)
+            if 2 <= x <= 5 and 2 <= y <= 5:
+                sector_multiplier = 7
+            elif 1 <= x <= 6 and 1 <= y <= 6:
+                sector_multiplier = 6
+            else:
+                sector_multiplier = 5
+            object.__setattr__(square, 'sector_multiplier', sector_multiplier)
+            object.__setattr__(square, '_hash', hash((x, y)))
+            cls._interned[(x, y)] = square
+        return square
 
-    @cached_property
-    def side(self):
-        return SquareUtilities.side(self.x, self.y)
+    def __setattr__(self, name, value):
+        raise AttributeError(f'Square is immutable, cannot set {name}')
 
-    @cached_property
+    def __reduce__(self):
+        return Square, (self.x, self.y)
+
+    @property
     def top(self):
-        return SquareUtilities.top(self.x, self.y)
+        return Square(self.x - 1, self.y)
 
-    @cached_property
+    @property
     def bottom(self):
-        return SquareUtilities.bottom(self.x, self.y)
+        return Square(self.x + 1, self.y)
 
-    @cached_property
+    @property
     def left(self):
-        return SquareUtilities.left(self.x, self.y)
+        return Square(self.x, self.y - 1)
 
-    @cached_property
+    @property
     def right(self):
-        return SquareUtilities.right(self.x, self.y)
-
-    @cached_property
-    def sector_multiplier(self):
-        return SquareUtilities.sector_multiplier(self.x, self.y)
+        return Square(self.x, self.y + 1)
 
     @staticmethod
-    @cache
     def from_symbol(symbol: str) -> 'Square | None':
         """
         :param symbol: a string representation of a square that consist of lowercase letter representing row
@@ -177,50 +181,63 @@ class Square:
         except ValueError:
             return None
 
-    @cache
+    def _on_board(self, geometry: BoardGeometry) -> bool:
+        return 0 <= self.x < geometry.size and 0 <= self.y < geometry.size
+
     def get_squares_to(self, other: 'Square') -> list['Square']:
         """
         :param other: other Square
         :return: a list of squares on a diagonal between current square (exclusive) and the other square (inclusive)
         """
-        return SquareUtilities.get_squares_to(self.x, self.y, other)
+        geometry = BoardGeometry.current()
+        if self._on_board(geometry) and other._on_board(geometry):
+            return geometry.between[self.x][self.y][other.x][other.y]
+        return _squares_between(self.x, self.y, other)
 
     @property
-    def diagonal_squares(self) -> set['Square']:
+    def diagonal_squares(self) -> frozenset['Square']:
         """
         :return: set of squares that are on the same diagonal (i.e. it is possible for King to get there in one move)
         """
-        return SquareUtilities.diagonal_squares(self.x, self.y)
+        return BoardGeometry.current().diagonal[self.x][self.y]
 
     @property
-    def neighbours(self) -> set['Square']:
+    def neighbours(self) -> frozenset['Square']:
         """
         :return: set of squares that are on the same diagonal and are direct neigbours of current square
         """
-        return SquareUtilities.neighbours(self.x, self.y)
+        return BoardGeometry.current().neighbours[self.x][self.y]
 
     @property
-    def neighbours_with_subsequent(self) -> set[tuple['Square', 'Square']]:
+    def neighbours_with_subsequent(self) -> frozenset[tuple['Square', 'Square']]:
         """
         :return: set of pairs (neighbour, neighbour of a neighbour on the same diagonal) squares,
                  i.e. where would a crowning take place and where would a Man go after crowning
         """
-        return SquareUtilities.neighbours_with_subsequent(self.x, self.y)
+        return BoardGeometry.current().jumps[self.x][self.y]
 
-    def get_forward_neighbours(self, side: Side) -> set['Square']:
+    def get_forward_neighbours(self, side: Side) -> frozenset['Square']:
         """
         :param side: side used as a reference
         :return: list of neigbour diagonal squares that are "in front" given a side (white or black)
         """
-        return SquareUtilities.get_forward_neighbours(self.x, self.y, side)
+        return BoardGeometry.current().forward[side.value - 1][self.x][self.y]
 
     def __str__(self):
         x_fmt = chr(self.x + 97)
         y_fmt = self.y + 1
         return f'{x_fmt}{y_fmt}'
 
+    def __repr__(self):
+        return f'Square(x={self.x}, y={self.y})'
+
+    # Squares are interned, so the default identity comparison is equality
     def __hash__(self):
-        return hash((self.x, self.y))
+        return self._hash
+
+
+# Geometry of the default board is computed at import, other sizes when they are first used
+BoardGeometry.current()
 
 
 @dataclass
@@ -242,7 +259,7 @@ class SimpleMove(Move):
         return f'{self.from_sq.__str__()} -> {self.to_sq.__str__()}'
 
     def __hash__(self):
-        return hash(self.__str__())
+        return hash((self.from_sq, self.to_sq))
 
 
 @dataclass
@@ -265,16 +282,115 @@ class CrownMove(Move):
         return ' -> '.join([sq.__str__() for sq in [self.from_sq] + self.through]) + ' (bicie!)'
 
     def __hash__(self):
-        return hash(self.__str__())
+        return hash((self.from_sq, *self.through))
+
+
+class DrawHistory:
+    """
+    History of a game needed by draw rules, updated in O(1) per move: numbers of plies since the last capture or move
+    of a man and numbers of occurrences of positions. Positions are counted by Zobrist key and parity of the ply, so
+    that the same squares with different sides to move are different positions.
+    """
+    __slots__ = ('quiet_plies', 'keys', 'counts')
+
+    def __init__(self, key: int):
+        # Plies since the last capture or move of a man after every ply, and keys of positions after every ply (the
+        # first one before any move)
+        self.quiet_plies = [0]
+        self.keys = [key]
+        self.counts = {key: 1}
+
+    def push(self, key: int, irreversible: bool) -> None:
+        """
+        Records the position after a move.
+        :param irreversible: whether the move was a capture or a move of a man, which resets the count of quiet plies
+        """
+        keys, quiet_plies, counts = self.keys, self.quiet_plies, self.counts
+        if len(keys) & 1:
+            key ^= BLACK_TO_MOVE
+        quiet_plies.append(0 if irreversible else quiet_plies[-1] + 1)
+        keys.append(key)
+        counts[key] = counts.get(key, 0) + 1
+
+    def pop(self) -> None:
+        """
+        Forgets the position after the last move, when the move is reverted.
+        """
+        self.quiet_plies.pop()
+        key = self.keys.pop()
+        count = self.counts[key]
+        # Positions visited only by reverted moves are removed, so that searches do not grow the counts
+        if count == 1:
+            del self.counts[key]
+        else:
+            self.counts[key] = count - 1
+
+    def copy(self) -> 'DrawHistory':
+        history = DrawHistory.__new__(DrawHistory)
+        history.quiet_plies = list(self.quiet_plies)
+        history.keys = list(self.keys)
+        history.counts = dict(self.counts)
+        return history
+
+    @property
+    def plies(self) -> int:
+        return len(self.keys) - 1
+
+    @property
+    def is_draw(self) -> bool:
+        """
+        :return: whether the game is drawn by QUIET_PLIES_DRAW or MAX_PLIES_DRAW rules
+        """
+        return self.quiet_plies[-1] >= QUIET_PLIES_DRAW or self.plies >= MAX_PLIES_DRAW
+
+    @property
+    def is_repetition(self) -> bool:
+        """
+        :return: whether the current position (with the same side to move) has already occurred in the game. It is
+                 not a draw by the rules, but search scores it as one, as the side to move can repeat the moves.
+        """
+        return self.counts[self.keys[-1]] > 1
+
+
+@dataclass
+class MoveUndo:
+    """
+    Information needed to revert a move applied in place by Board.make_move.
+    """
+    move: Move
+    piece: Piece
+    captured: list[tuple[Square, Piece]]
+    promoted: bool
+    zobrist_key: int
 
 
 class Board:
     squares: dict[Square, Piece | None]
     moves: list[Move]
+    zobrist_key: int
+    totals: MaterialTotals
+    status_cache: dict[int, GameStatus]
+    move_buffers: list[list[Move]]
+    history: DrawHistory
 
     def __init__(self, squares: dict[Square, Piece | None], moves: list[Move] = None):
         self.squares = squares
         self.moves = moves or []
+        self.zobrist_key = self.compute_zobrist_key()
+        self.totals = MaterialTotals.of(self.pieces())
+        self.status_cache = {}
+        self.move_buffers = []
+        self.history = DrawHistory(self.zobrist_key)
+
+    def compute_zobrist_key(self) -> int:
+        """
+        :return: Zobrist key of the position computed from scratch. Methods changing the board keep zobrist_key
+                 (and totals) up to date incrementally, so this is needed only after modifying squares directly.
+        """
+        key = 0
+        for sq, piece in self.pieces():
+            key ^= piece_key(sq.x, sq.y, piece.side, piece.type_)
+        return key
 
     def to_num_repr(self):
         arr = []
@@ -286,12 +402,21 @@ class Board:
         return tuple(arr)
 
     def from_num_repr(self, arr):
-        board = Board({Square(i, j): None for i, j in product(range(8), range(8))})
+        squares = {Square(i, j): None for i, j in product(range(8), range(8))}
         for i, j, color, type_ in arr:
             color = Side.White if color == 0 else Side.Black
             type_ = PieceType.Man if type_ == 0 else PieceType.King
-            board.squares[Square(i, j)] = Piece(type_, color)
-        return board
+            squares[Square(i, j)] = Piece(type_, color)
+        return Board(squares)
+
+    def piece_at(self, square: Square) -> Piece | None:
+        return self.squares.get(square)
+
+    def pieces(self):
+        """
+        :return: generator of (square, piece) pairs of occupied squares
+        """
+        return ((sq, piece) for sq, piece in self.squares.items() if piece)
 
     @staticmethod
     def populate_initial_board() -> 'Board':
@@ -314,33 +439,65 @@ class Board:
                  Sign of rating indicates which side has advantage. A positive number means that the white player has
                     advantage and a negative number means that the black player has advantage.
         """
-        is_any_white = False
-        is_any_black = False
-        total_sum = 0
-
-        for sq, piece in self.squares.items():
-            if piece:
-                piece_value = sq.sector_multiplier * (3 if piece.type_ == PieceType.King else 1)
-                if piece.side == Side.White:
-                    is_any_white = True
-                else:
-                    is_any_black = True
-                    piece_value *= -1
-                total_sum += piece_value
-
-        if (is_any_black and not is_any_white) or not self.get_possible_moves_of_side(Side.White):
+        status = self.decided_status()
+        if status == GameStatus.BlackWon:
             return -1000
-        elif is_any_white and not is_any_black or not self.get_possible_moves_of_side(Side.Black):
+        elif status == GameStatus.WhiteWon:
             return 1000
         else:
-            return total_sum
+            return self.totals.sums[BASE_VALUES]
 
     @property
     def is_in_draw_state(self) -> bool:
-        if len(self.moves) >= 100:
-            return True
-        return len(self.moves) >= 15 \
-               and all([isinstance(move, SimpleMove) for move in self.moves[:-15]])
+        """
+        :return: whether the game is drawn by the number of moves made: QUIET_PLIES_DRAW plies of kings without
+                 captures or MAX_PLIES_DRAW plies in total (see DrawHistory), in O(1)
+        """
+        return self.history.is_draw
+
+    def has_moves(self, side: Side) -> bool:
+        """
+        :return: whether the side has at least one legal move; stops at the first one found instead of generating all
+        """
+        for square, piece in self.squares.items():
+            if not piece or piece.side != side:
+                continue
+            targets = square.neighbours if piece.type_ == PieceType.King else square.get_forward_neighbours(side)
+            if any(not self.squares[target_sq] for target_sq in targets):
+                return True
+            for _ in self._single_captures(square, piece, piece.type_ == PieceType.King, square, set()):
+                return True
+        return False
+
+    def decided_status(self) -> GameStatus:
+        """
+        :return: WhiteWon or BlackWon if one of the sides has no pieces or no legal moves, Ongoing otherwise.
+                 Draws are not detected, as they depend on history of moves and not only on the position.
+                 The result is remembered per position (by Zobrist key) in status_cache.
+        """
+        status = self.status_cache.get(self.zobrist_key)
+        if status is None:
+            is_any_white = self.totals.white_count > 0
+            is_any_black = self.totals.black_count > 0
+            if (is_any_black and not is_any_white) or not self.has_moves(Side.White):
+                status = GameStatus.BlackWon
+            elif is_any_white and not is_any_black or not self.has_moves(Side.Black):
+                status = GameStatus.WhiteWon
+            else:
+                status = GameStatus.Ongoing
+            if len(self.status_cache) >= STATUS_CACHE_SIZE:
+                self.status_cache.clear()
+            self.status_cache[self.zobrist_key] = status
+        return status
+
+    def status(self) -> GameStatus:
+        """
+        :return: status of the game: won by one of the sides (the same condition as rating of +-1000), drawn or ongoing
+        """
+        status = self.decided_status()
+        if status == GameStatus.Ongoing and self.is_in_draw_state:
+            return GameStatus.Draw
+        return status
 
     @property
     def top_left_sq(self) -> Square:
@@ -391,6 +548,10 @@ class Board:
         piece = self.squares[from_sq]
         self.squares[from_sq] = None
         self.squares[to_sq] = piece
+        self.zobrist_key ^= piece_key(from_sq.x, from_sq.y, piece.side, piece.type_) \
+            ^ piece_key(to_sq.x, to_sq.y, piece.side, piece.type_)
+        self.totals.update(from_sq.x, from_sq.y, piece.side, piece.type_, -1)
+        self.totals.update(to_sq.x, to_sq.y, piece.side, piece.type_, 1)
 
     def _crown(self, sq: Square | str) -> None:
         """
@@ -404,7 +565,10 @@ class Board:
             raise ValueError(f'{sq} does not exist, but it was attempted to be crowned')
         if not self.squares[sq]:
             raise ValueError(f'{sq} is empty, but it was attempted to be crowned')
+        piece = self.squares[sq]
         self.squares[sq] = None
+        self.zobrist_key ^= piece_key(sq.x, sq.y, piece.side, piece.type_)
+        self.totals.update(sq.x, sq.y, piece.side, piece.type_, -1)
 
     def _promote(self, sq: Square | str) -> None:
         """
@@ -420,31 +584,78 @@ class Board:
             raise ValueError(f'{sq} is empty, but it was attempted to be crowned')
         if self.squares[sq].type_ == PieceType.King:
             raise ValueError(f'{sq} has already King')
-        self.squares[sq].type_ = PieceType.King
+        # Pieces may be shared with boards copied by move method, so the piece is replaced instead of modified
+        side = self.squares[sq].side
+        self.squares[sq] = Piece(PieceType.King, side)
+        self.zobrist_key ^= piece_key(sq.x, sq.y, side, PieceType.Man) ^ piece_key(sq.x, sq.y, side, PieceType.King)
+        self.totals.update(sq.x, sq.y, side, PieceType.Man, -1)
+        self.totals.update(sq.x, sq.y, side, PieceType.King, 1)
 
-    def move(self, move: Move) -> 'Board':
+    def make_move(self, move: Move) -> MoveUndo:
         """
-        Applies a move with its all consequences (promotion to a king, etc.)
+        Applies a move with its all consequences (promotion to a king, etc.) in place.
         :param move: move generated by possible_moves method
+        :return: undo record to be passed to unmake_move method
         """
-        this = self.from_num_repr(self.to_num_repr())
-        this._move(move.from_sq, move.to_sq)
-        piece = self.squares[move.from_sq]
-        try:
-            if piece.side == Side.White and move.to_sq.x == 0:
-                this._promote(move.to_sq)
-            elif piece.side == Side.Black and move.to_sq.x == Settings.BoardSize - 1:
-                this._promote(move.to_sq)
-        except:
-            pass
-
+        piece = self.squares.get(move.from_sq)
+        if not piece:
+            raise ValueError(f'{move.from_sq} is empty, but it was attempted to move piece from it')
+        if move.to_sq != move.from_sq and self.squares.get(move.to_sq, True):
+            raise ValueError(f'{move.to_sq} is occupied or does not exist, but it was attempted to move piece to it')
+        zobrist_key = self.zobrist_key
+        self.squares[move.from_sq] = None
+        self.zobrist_key ^= piece_key(move.from_sq.x, move.from_sq.y, piece.side, piece.type_)
+        self.totals.update(move.from_sq.x, move.from_sq.y, piece.side, piece.type_, -1)
+
+        captured = []
         if isinstance(move, CrownMove):
             for curr_sq, next_sq in zip([move.from_sq] + move.through, move.through):
                 for sq in curr_sq.get_squares_to(next_sq)[:-1]:
-                    if this.squares[sq]:
-                        this._crown(sq)
+                    if self.squares[sq]:
+                        captured.append((sq, self.squares[sq]))
+                        self._crown(sq)
+
+        self.squares[move.to_sq] = piece
+        self.zobrist_key ^= piece_key(move.to_sq.x, move.to_sq.y, piece.side, piece.type_)
+        self.totals.update(move.to_sq.x, move.to_sq.y, piece.side, piece.type_, 1)
+        promoted = piece.type_ == PieceType.Man and (
+            piece.side == Side.White and move.to_sq.x == 0
+            or piece.side == Side.Black and move.to_sq.x == Settings.BoardSize - 1
+        )
+        if promoted:
+            self._promote(move.to_sq)
         self.moves.append(move)
+        self.history.push(self.zobrist_key, bool(captured) or piece.type_ == PieceType.Man)
+        return MoveUndo(move, piece, captured, promoted, zobrist_key)
+
+    def unmake_move(self, undo: MoveUndo) -> None:
+        """
+        Reverts a move applied by make_move method. Moves have to be reverted in reversed order of applying them.
+        :param undo: undo record returned by make_move method
+        """
+        self.moves.pop()
+        self.history.pop()
+        from_sq, to_sq, piece = undo.move.from_sq, undo.move.to_sq, undo.piece
+        self.squares[to_sq] = None
+        self.squares[from_sq] = piece
+        self.totals.update(to_sq.x, to_sq.y, piece.side, PieceType.King if undo.promoted else piece.type_, -1)
+        self.totals.update(from_sq.x, from_sq.y, piece.side, piece.type_, 1)
+        for sq, captured in undo.captured:
+            self.squares[sq] = captured
+            self.totals.update(sq.x, sq.y, captured.side, captured.type_, 1)
+        self.zobrist_key = undo.zobrist_key
 
+    def move(self, move: Move) -> 'Board':
+        """
+        Applies a move with its all consequences (promotion to a king, etc.)
+        :param move: move generated by possible_moves method
+        :return: new board, the current one is left untouched
+        """
+        this = Board(dict(self.squares), list(self.moves))
+        this.history = self.history.copy()
+        # Statuses are stored by position, so boards derived from each other can share them
+        this.status_cache = self.status_cache
+        this.make_move(move)
         return this
 
     def get_possible_simple_moves_from_square(self, square) -> set[SimpleMove]:
@@ -458,68 +669,81 @@ class Board:
                 if not self.squares[target_sq]:
                     moves.add(SimpleMove(square, target_sq))
         else:
-            for direction in (1, 1), (1, -1), (-1, 1), (-1, -1):
-                x_step, y_step = direction
-                current = square
-                while 0 <= current.x <= Settings.BoardSize - 1 and 0 <= current.y <= Settings.BoardSize - 1:
-                    current = Square(current.x + x_step, current.y + y_step)
-                    if current in self.squares and self.squares[current]:
+            for ray in BoardGeometry.current().rays[square.x][square.y]:
+                for current in ray:
+                    if self.squares[current]:
                         break
-                    elif current in self.squares:
-                        moves.add(SimpleMove(square, current))
+                    moves.add(SimpleMove(square, current))
         return moves
 
-    def _get_single_crown_moves_from_square(self, square: Square) -> set[CrownMove]:
-        piece = self.squares[square]
-        if not piece:
-            return set()
-        moves = set()
+    def _single_captures(self, square: Square, piece: Piece, is_king: bool, origin: Square, captured: set[Square]):
+        """
+        Finds single jumps of a piece in the middle of a capture, without modifying the board. The capturing piece is
+        treated as if it has already left the origin square and captured pieces as if they were already removed.
+        :return: generator of (landing square, list of squares of pieces captured by the jump) pairs
+        """
+        def occupant(sq: Square) -> Piece | None:
+            return None if sq == origin or sq in captured else self.squares[sq]
 
-        if piece.type_ == PieceType.Man:
+        if not is_king:
             for neighbour_sq, next_sq in square.neighbours_with_subsequent:
-                if self.squares[neighbour_sq] \
-                        and self.squares[neighbour_sq].side != piece.side \
-                        and not self.squares[next_sq]:
-                    moves.add(CrownMove(square, [next_sq]))
+                neighbour = occupant(neighbour_sq)
+                if neighbour and neighbour.side != piece.side and not occupant(next_sq):
+                    yield next_sq, [neighbour_sq]
         else:
-            for direction in (1, 1), (1, -1), (-1, 1), (-1, -1):
-                x_step, y_step = direction
-                has_already_jumped_over_enemy = False
-                current = square
-                while 0 < current.x < Settings.BoardSize - 1 and 0 < current.y < Settings.BoardSize - 1:
-                    current = Square(current.x + x_step, current.y + y_step)
-                    if self.squares[current] and self.squares[current].side == piece.side:
+            for ray in BoardGeometry.current().capture_rays[square.x][square.y]:
+                jumped_over = []
+                for current in ray:
+                    current_piece = occupant(current)
+                    if current_piece and current_piece.side == piece.side:
                         break
-                    elif self.squares[current] \
-                            and self.squares[current].side != piece.side \
-                            and not has_already_jumped_over_enemy:
-                        has_already_jumped_over_enemy = True
-                    elif not self.squares[current] and has_already_jumped_over_enemy:
-                        moves.add(CrownMove(square, [current]))
-        return moves
+                    elif current_piece:
+                        jumped_over.append(current)
+                    elif jumped_over:
+                        yield current, list(jumped_over)
+
+    def _explore_captures(self, origin: Square, square: Square, piece: Piece, is_king: bool, path: list[Square],
+                          captured: set[Square], moves: list[CrownMove], maximal_only: bool) -> None:
+        """
+        Walks all capture sequences of a piece on the unmodified board, backtracking over a single path and a single
+        set of captured squares. Only complete sequences (that cannot be continued) are appended to moves.
+        :param maximal_only: whether to keep only sequences with the most jumps found so far
+        """
+        is_leaf = True
+        for landing_sq, taken in self._single_captures(square, piece, is_king, origin, captured):
+            is_leaf = False
+            path.append(landing_sq)
+            captured.update(taken)
+            promoted = piece.side == Side.White and landing_sq.x == 0 \
+                or piece.side == Side.Black and landing_sq.x == Settings.BoardSize - 1
+            self._explore_captures(origin, landing_sq, piece, is_king or promoted, path, captured, moves,
+                                   maximal_only)
+            captured.difference_update(taken)
+            path.pop()
+        if is_leaf and path:
+            if maximal_only and moves and len(moves[0].through) > len(path):
+                return
+            if maximal_only and moves and len(moves[0].through) < len(path):
+                moves.clear()
+            moves.append(CrownMove(origin, list(path)))
 
     def get_possible_crown_moves_from_square(self, square: Square) -> set[CrownMove]:
         piece = self.squares[square]
         if not piece:
             return set()
-        moves = set()
+        moves = []
+        self._explore_captures(square, square, piece, piece.type_ == PieceType.King, [], set(), moves, False)
+        return set(moves)
 
-        def _explore(so_far: CrownMove | None, start: Square, board: Board):
-            single_crown_moves = board._get_single_crown_moves_from_square(start)
-            if not single_crown_moves:
-                if so_far:
-                    moves.add(so_far)
-            else:
-                for single_crown_move in single_crown_moves:
-                    next_board = board.move(single_crown_move)
-                    if so_far:
-                        new_so_far = copy(so_far)
-                        new_so_far.through.append(single_crown_move.through[0])
-                    else:
-                        new_so_far = CrownMove(start, [single_crown_move.through[0]])
-                    _explore(new_so_far, single_crown_move.through[0], next_board)
-        _explore(None, square, self)
-        return moves
+    def get_capture_moves_of_side(self, side: Side) -> set[CrownMove]:
+        """
+        :return: capture moves of the side with the most jumps (the only ones allowed when any capture is possible)
+        """
+        moves = []
+        for square, piece in self.squares.items():
+            if piece and piece.side == side:
+                self._explore_captures(square, square, piece, piece.type_ == PieceType.King, [], set(), moves, True)
+        return set(moves)
 
     def get_possible_moves_from_square(self, square) -> set[Move]:
         return self.get_possible_simple_moves_from_square(square) | self.get_possible_crown_moves_from_square(square)
@@ -532,16 +756,57 @@ class Board:
         return moves
 
     def get_possible_moves_of_side(self, side: Side) -> set[Move]:
-        moves = set()
+        moves = self.get_capture_moves_of_side(side)
+        if moves:
+            return moves
         for square, piece in self.squares.items():
             if piece and piece.side == side:
-                moves = moves.union(self.get_possible_moves_from_square(square))
-        if any(isinstance(move, CrownMove) for move in moves):
-            moves = {move for move in moves if isinstance(move, CrownMove)}
-            most_steps = max(len(move.through) for move in moves)
-            moves = {move for move in moves if len(move.through) == most_steps}
+                moves |= self.get_possible_simple_moves_from_square(square)
         return moves
 
+    def iter_simple_moves(self, side: Side):
+        """
+        Generates simple moves lazily, piece by piece, so that a search can stop generating after a cutoff.
+        The moves are legal only if the side has no capture (see generate_moves with captures_only).
+        :return: generator of simple moves of the side
+        """
+        for square, piece in self.squares.items():
+            if piece and piece.side == side:
+                yield from self.get_possible_simple_moves_from_square(square)
+
+    def is_simple_move_possible(self, side: Side, move: Move) -> bool:
+        """
+        Checks a move remembered from another position (e.g. a killer move), generating only moves of its piece.
+        Like moves of iter_simple_moves, the move is legal only if the side has no capture.
+        :return: whether the move is a simple move the side can make on the board
+        """
+        if not isinstance(move, SimpleMove):
+            return False
+        piece = self.squares.get(move.from_sq)
+        return piece is not None and piece.side == side \
+            and move in self.get_possible_simple_moves_from_square(move.from_sq)
+
+    def generate_moves(self, side: Side, ply: int = 0, captures_only: bool = False) -> list[Move]:
+        """
+        Generates legal moves of the side into a move buffer kept for the given ply, like BitBoard.generate_moves.
+        Moves of this board are Move objects, so to_move and from_move return them unchanged.
+        :param ply: distance from the root of the search, selects the buffer
+        :param captures_only: whether to generate only captures (no moves are generated if there are none)
+        :return: the buffer filled with moves
+        """
+        while len(self.move_buffers) <= ply:
+            self.move_buffers.append([])
+        buffer = self.move_buffers[ply]
+        buffer.clear()
+        buffer.extend(self.get_capture_moves_of_side(side) if captures_only else self.get_possible_moves_of_side(side))
+        return buffer
+
+    def from_move(self, move: Move) -> Move:
+        return move
+
+    def to_move(self, move: Move) -> Move:
+        return move
+
     def dump(self, stream=None):
         if stream is None:
             stream = StringIO()
@@ -571,4 +836,4 @@ class Board:
         stream.write('\t' + '\t'.join((str(i + 1) for i in range(Settings.BoardSize))) + '\n')
 
     def __hash__(self):
-        return hash(self.to_num_repr())
+        return self.zobrist_key
@@ -0,0 +1,105 @@
+"""
+Serialisation of moves and positions:
+- moves as single tokens, e.g. "c3-d4" (simple move) or "c3xe5xg7" (capture through all landing squares),
+- positions as FEN-like text, e.g. "W:W21,22,K30:B1,2,K5": side to move, then white and black pieces given by numbers
+  of playable squares (1-32, counting row by row like bitboard.SQUARES), kings prefixed with K,
+- positions as fixed-width binary records of POSITION struct: four 32-bit masks of BitBoard (white men, white kings,
+  black men, black kings) and the side to move.
+"""
+import struct
+
+from si_project.checkers.bitboard import BitBoard, PLAYABLE_SQUARES, iter_bits
+from si_project.checkers.models import Side, Move, CrownMove
+
+POSITION = struct.Struct('<IIIIB')
+
+_FEN_SIDES = {'W': Side.White, 'B': Side.Black}
+_FEN_LETTERS = {side: letter for letter, side in _FEN_SIDES.items()}
+
+
+def notation(move: Move) -> str:
+    """
+    :return: move written as a single token
+    """
+    if isinstance(move, CrownMove):
+        return 'x'.join(str(square) for square in [move.from_sq] + move.through)
+    return f'{move.from_sq}-{move.to_sq}'
+
+
+def parse_move(board, side: Side, token: str) -> Move | None:
+    """
+    :param board: models.Board or bitboard.BitBoard
+    :return: legal move of the side written as the token, or None if there is no such move
+    """
+    for move in board.get_possible_moves_of_side(side):
+        if notation(move) == token:
+            return move
+    return None
+
+
+def _as_bitboard(board) -> BitBoard:
+    return board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+
+
+def _as_board_class(board: BitBoard, board_class):
+    if board_class is BitBoard:
+        return board
+    # models.Board builds boards through an instance
+    return board_class.populate_initial_board().from_num_repr(board.to_num_repr())
+
+
+def to_fen(board, side: Side) -> str:
+    """
+    :param board: models.Board or bitboard.BitBoard
+    :return: the position with the side to move in FEN-like notation
+    """
+    board = _as_bitboard(board)
+
+    def pieces(men: int, kings: int) -> str:
+        squares = sorted([(i, '') for i in iter_bits(men)] + [(i, 'K') for i in iter_bits(kings)])
+        return ','.join(f'{prefix}{i + 1}' for i, prefix in squares)
+
+    return f'{_FEN_LETTERS[side]}:W{pieces(board.white_men, board.white_kings)}' \
+           f':B{pieces(board.black_men, board.black_kings)}'
+
+
+def from_fen(fen: str, board_class=BitBoard):
+    """
+    :param board_class: bitboard.BitBoard or models.Board
+    :return: board and side to move of the position in FEN-like notation (see to_fen)
+    """
+    parts = fen.strip().split(':')
+    if len(parts) != 3 or parts[0] not in _FEN_SIDES or {parts[1][:1], parts[2][:1]} != {'W', 'B'}:
+        raise ValueError(f'Invalid FEN: {fen}')
+    masks = {'W': [0, 0], 'B': [0, 0]}
+    for part in parts[1:]:
+        for token in filter(None, part[1:].split(',')):
+            is_king = token.startswith('K')
+            number = token[1:] if is_king else token
+            if not number.isdigit() or not 1 <= int(number) <= PLAYABLE_SQUARES:
+                raise ValueError(f'Invalid square {token} in FEN: {fen}')
+            masks[part[0]][is_king] |= 1 << (int(number) - 1)
+    board = BitBoard(*masks['W'], *masks['B'])
+    if board.white_men.bit_count() + board.white_kings.bit_count() + board.black_men.bit_count() \
+            + board.black_kings.bit_count() != board.occupied.bit_count():
+        raise ValueError(f'Square occupied twice in FEN: {fen}')
+    return _as_board_class(board, board_class), _FEN_SIDES[parts[0]]
+
+
+def pack_position(board, side: Side) -> bytes:
+    """
+    :param board: models.Board or bitboard.BitBoard
+    :return: the position with the side to move as POSITION record
+    """
+    board = _as_bitboard(board)
+    return POSITION.pack(board.white_men, board.white_kings, board.black_men, board.black_kings, side.value)
+
+
+def unpack_position(data, offset: int = 0, board_class=BitBoard):
+    """
+    :param data: bytes-like object holding a POSITION record at the offset
+    :param board_class: bitboard.BitBoard or models.Board
+    :return: board and side to move of the record
+    """
+    white_men, white_kings, black_men, black_kings, side = POSITION.unpack_from(data, offset)
+    return _as_board_class(BitBoard(white_men, white_kings, black_men, black_kings), board_class), Side(side)
@@ -0,0 +1,172 @@
+from si_project.checkers.bitboard import MOVE_CAPTURED_SHIFT, MOVE_TO_SHIFT, MOVE_SQUARE_MASK, WHITE_PROMOTION_ROW, \
+    BLACK_PROMOTION_ROW
+from si_project.checkers.models import Move, CrownMove, PieceType, Side
+from si_project.checkers.utilities import Settings
+
+KILLERS_PER_PLY = 2
+
+
+def captured_count(board, move: Move | int) -> int:
+    """
+    :param move: Move or a move packed into an int by BitBoard.generate_moves
+    :return: number of pieces taken by the move on the board (0 for simple moves)
+    """
+    if isinstance(move, int):
+        return (move >> MOVE_CAPTURED_SHIFT).bit_count()
+    if not isinstance(move, CrownMove):
+        return 0
+    count = 0
+    for curr_sq, next_sq in zip([move.from_sq] + move.through, move.through):
+        for sq in curr_sq.get_squares_to(next_sq)[:-1]:
+            if board.piece_at(sq):
+                count += 1
+    return count
+
+
+def is_promotion(board, move: Move | int) -> bool:
+    """
+    :param move: Move or a move packed into an int by BitBoard.generate_moves
+    :return: whether the move crowns a man of the board
+    """
+    if isinstance(move, int):
+        from_bit = 1 << (move & MOVE_SQUARE_MASK)
+        to_bit = 1 << (move >> MOVE_TO_SHIFT & MOVE_SQUARE_MASK)
+        return bool(board.white_men & from_bit and to_bit & WHITE_PROMOTION_ROW
+                    or board.black_men & from_bit and to_bit & BLACK_PROMOTION_ROW)
+    piece = board.piece_at(move.from_sq)
+    return piece.type_ == PieceType.Man \
+        and move.to_sq.x == (0 if piece.side == Side.White else Settings.BoardSize - 1)
+
+
+def _history_key(move: Move | int):
+    # Packed moves without captured pieces are just the pair of squares
+    return move if isinstance(move, int) else (move.from_sq, move.to_sq)
+
+
+class MoveOrdering:
+    """
+    Orders moves for alphabeta: the transposition table (or PV) move first, then captures by number of pieces taken,
+    then killer moves of the ply, then the rest by history heuristic.
+    Killers and history are learned from beta cutoffs, which are also counted to measure quality of the ordering.
+    """
+    killers: list[list[Move]]
+    history: dict[tuple, int]
+    cutoffs: int
+    first_move_cutoffs: int
+    cutoff_move_index_sum: int
+
+    def __init__(self):
+        self.killers = []
+        self.history = {}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.cutoff_move_index_sum = 0
+
+    def _killers_of(self, ply: int) -> list[Move]:
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        return self.killers[ply]
+
+    def order(self, board, moves, ply: int, tt_move: Move | None = None) -> list[Move]:
+        """
+        :param moves: legal moves of the side to move on the board
+        :param ply: distance from the root of the search
+        :param tt_move: best move stored for the position, if any
+        :return: list of moves in order in which they should be searched
+        """
+        killers = self._killers_of(ply)
+
+        def key(move: Move):
+            if move == tt_move:
+                return 0, 0
+            taken = captured_count(board, move)
+            if taken:
+                return 1, -taken
+            if move in killers:
+                return 2, killers.index(move)
+            return 3, -self.history.get(_history_key(move), 0)
+
+        return sorted(moves, key=key)
+
+    def record_cutoff(self, move: Move, ply: int, depth: int, move_index: int) -> None:
+        """
+        Updates killers and history after the move caused a beta cutoff.
+        :param move_index: position of the move in the order it was searched in
+        """
+        self.cutoffs += 1
+        self.cutoff_move_index_sum += move_index
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+        if isinstance(move, CrownMove) or isinstance(move, int) and move >> MOVE_CAPTURED_SHIFT:
+            return
+        killers = self._killers_of(ply)
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+        history_key = _history_key(move)
+        self.history[history_key] = self.history.get(history_key, 0) + depth * depth
+
+    def order_quiet(self, moves) -> list:
+        """
+        :return: simple moves sorted by history heuristic (moves not in history keep their order)
+        """
+        return sorted(moves, key=lambda move: -self.history.get(_history_key(move), 0))
+
+    def new_search(self) -> None:
+        """
+        Forgets killers, which are specific to plies of the previous search, and halves history scores.
+        """
+        self.killers = []
+        self.history = {key: value // 2 for key, value in self.history.items() if value > 1}
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        :return: fraction of beta cutoffs caused by the first searched move, 0 if there were no cutoffs
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def average_cutoff_move_index(self) -> float:
+        """
+        :return: average number of moves searched before the one causing a beta cutoff
+        """
+        return self.cutoff_move_index_sum / self.cutoffs if self.cutoffs else 0.0
+
+
+def staged_moves(board, side, ply: int, ordering: MoveOrdering | None = None, tt_move: Move | int | None = None):
+    """
+    Generates legal moves of the side in stages, so that a search that cuts off early skips the later ones:
+    1. captures - all of them, as only the ones with the most jumps are legal; ordered like by MoveOrdering.order,
+       and nothing else is generated if there are any,
+    2. the transposition table move and killer moves of the ply, checked without generating other moves,
+    3. the remaining simple moves, ordered by history heuristic if ordering is given, otherwise generated lazily
+       piece by piece.
+    :param board: board supporting generate_moves (models.Board or bitboard.BitBoard)
+    :param ply: distance from the root of the search, selects the move buffer and killer moves
+    :param tt_move: best move stored for the position, if any
+    :return: generator of moves, in order in which they should be searched
+    """
+    captures = board.generate_moves(side, ply, captures_only=True)
+    if captures:
+        if ordering is not None:
+            yield from ordering.order(board, captures, ply, tt_move)
+        elif tt_move in captures:
+            yield tt_move
+            yield from (move for move in captures if move != tt_move)
+        else:
+            yield from captures
+        return
+
+    searched = []
+    # Killers are copied, as a cutoff on one of them changes the list while this generator is suspended
+    for move in [tt_move] + (list(ordering._killers_of(ply)) if ordering is not None else []):
+        if move is not None and move not in searched and board.is_simple_move_possible(side, move):
+            searched.append(move)
+            yield move
+    quiet = board.iter_simple_moves(side)
+    if ordering is not None:
+        quiet = ordering.order_quiet(quiet)
+    for move in quiet:
+        if move not in searched:
+            yield move
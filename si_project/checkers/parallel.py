@@ -0,0 +1,239 @@
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from enum import Enum
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+
+from si_project.checkers.alphabeta import alphabeta
+from si_project.checkers.models import Side, Board, Move, SimpleMove, CrownMove, Square
+from si_project.checkers.ordering import MoveOrdering
+from si_project.checkers.ratings import base_rating
+from si_project.checkers.search import search, SearchResult
+from si_project.checkers.transposition import TranspositionTable, TTEntry, Bound
+
+# Entry layout: key xor checksum of the rest, score, depth, bound, move kind, number of squares, squares of the move
+_ENTRY = struct.Struct('<QhBBBB14s')
+_ENTRY_SIZE = 32
+_MAX_MOVE_SQUARES = 14
+_SIMPLE_MOVE, _CROWN_MOVE, _PACKED_MOVE = 1, 2, 3
+# Packed moves (see BitBoard.generate_moves) take at most 42 bits
+_PACKED_MOVE_BYTES = 8
+
+
+def _encode_move(move: Move | int | None) -> tuple[int, int, bytes]:
+    if move is None:
+        return 0, 0, b''
+    if isinstance(move, int):
+        return _PACKED_MOVE, _PACKED_MOVE_BYTES, move.to_bytes(_PACKED_MOVE_BYTES, 'little')
+    if isinstance(move, CrownMove):
+        kind, squares = _CROWN_MOVE, [move.from_sq] + move.through
+    else:
+        kind, squares = _SIMPLE_MOVE, [move.from_sq, move.to_sq]
+    if len(squares) > _MAX_MOVE_SQUARES:
+        return 0, 0, b''
+    return kind, len(squares), bytes(sq.x * 16 + sq.y for sq in squares)
+
+
+def _decode_move(kind: int, length: int, data: bytes) -> Move | int | None:
+    if kind == _PACKED_MOVE:
+        return int.from_bytes(data[:length], 'little')
+    squares = [Square(b // 16, b % 16) for b in data[:length]]
+    if kind == _SIMPLE_MOVE:
+        return SimpleMove(squares[0], squares[1])
+    elif kind == _CROWN_MOVE:
+        return CrownMove(squares[0], squares[1:])
+    return None
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table kept in multiprocessing.shared_memory, so it can be used by many processes at once.
+    It has the same bucket layout and replacement policy as TranspositionTable. Entries are written without locks;
+    the stored key is XOR-ed with a checksum of the entry, so entries torn by concurrent writes are not returned.
+    Pickling the table (e.g. when passing it to a worker process) only passes the name of the shared block.
+    The process that created the table has to call unlink once the table is no longer needed.
+    """
+
+    def __init__(self, size: int = 1 << 16, name: str | None = None):
+        if size <= 0:
+            raise ValueError('Size of transposition table has to be positive')
+        self.size = size
+        self.probes = 0
+        self.hits = 0
+        if name is None:
+            self._shm = SharedMemory(create=True, size=2 * size * _ENTRY_SIZE)
+            self._shm.buf[:] = bytes(len(self._shm.buf))
+        else:
+            self._shm = SharedMemory(name=name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __getstate__(self):
+        return self.size, self.name
+
+    def __setstate__(self, state):
+        size, name = state
+        self.size = size
+        self.probes = 0
+        self.hits = 0
+        self._shm = SharedMemory(name=name)
+
+    def _read(self, slot: int) -> TTEntry | None:
+        offset = slot * _ENTRY_SIZE
+        checked_key, score, depth, bound, kind, length, squares = _ENTRY.unpack_from(self._shm.buf, offset)
+        if not bound:
+            return None
+        data = bytes(self._shm.buf[offset + 8:offset + _ENTRY.size])
+        return TTEntry(checked_key ^ zlib.crc32(data), depth, score, Bound(bound), _decode_move(kind, length, squares))
+
+    def _write(self, slot: int, entry: TTEntry) -> None:
+        kind, length, squares = _encode_move(entry.best_move)
+        packed = _ENTRY.pack(0, entry.score, min(entry.depth, 255), entry.bound.value, kind, length, squares)
+        key_field = (entry.key ^ zlib.crc32(packed[8:])).to_bytes(8, 'little')
+        offset = slot * _ENTRY_SIZE
+        self._shm.buf[offset:offset + _ENTRY.size] = key_field + packed[8:]
+
+    def probe(self, key: int) -> TTEntry | None:
+        self.probes += 1
+        index = key % self.size
+        for slot in (2 * index, 2 * index + 1):
+            entry = self._read(slot)
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: Bound, best_move: Move | None) -> None:
+        index = key % self.size
+        entry = TTEntry(key, depth, score, bound, best_move)
+        current = self._read(2 * index)
+        if current is None or current.key == key or depth >= current.depth:
+            self._write(2 * index, entry)
+        else:
+            self._write(2 * index + 1, entry)
+
+    def clear(self) -> None:
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+        self.probes = 0
+        self.hits = 0
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SharedFlag:
+    """
+    Event-like flag in shared memory. Unlike multiprocessing.Event it can be passed to ProcessPoolExecutor tasks,
+    and checking it is cheap enough to be done in every node of the search.
+    """
+
+    def __init__(self, name: str | None = None):
+        if name is None:
+            self._shm = SharedMemory(create=True, size=1)
+            self._shm.buf[0] = 0
+        else:
+            self._shm = SharedMemory(name=name)
+
+    def __getstate__(self):
+        return self._shm.name
+
+    def __setstate__(self, name):
+        self._shm = SharedMemory(name=name)
+
+    def is_set(self) -> bool:
+        return self._shm.buf[0] == 1
+
+    def set(self) -> None:
+        self._shm.buf[0] = 1
+
+    def unlink(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+class ParallelMode(Enum):
+    RootSplitting = 1
+    LazySMP = 2
+
+
+def _search_root_move(board: Board, side: Side, move: Move, depth: int, rating_heuristic,
+                      table: TranspositionTable | None) -> int:
+    board.make_move(move)
+    return alphabeta(side.next, board, depth - 1, rating_heuristic, table=table or TranspositionTable(),
+                     ordering=MoveOrdering(), ply=1)
+
+
+def _lazy_smp_worker(board: Board, side: Side, depth: int, rating_heuristic, table: TranspositionTable | None,
+                     stop: SharedFlag, helper_index: int) -> SearchResult:
+    # Helpers search one ply deeper every second time, so that they fill the table ahead of the main worker
+    return search(board, side, rating_heuristic, max_depth=depth + helper_index % 2, table=table, stop=stop)
+
+
+def parallel_search(board: Board, side: Side, depth: int, rating_heuristic=base_rating, workers: int = 4,
+                    mode: ParallelMode = ParallelMode.RootSplitting, shared_table: bool = True,
+                    table_size: int = 1 << 16, executor: ProcessPoolExecutor | None = None) -> SearchResult:
+    """
+    Searches the board to given depth (in plies, including the root move) with many processes.
+    - RootSplitting: root moves are spread across workers, every one is searched with full alpha-beta window.
+    - LazySMP: all workers search the whole tree (every second one a ply deeper), sharing the transposition table;
+      the first finished search gives the result and the rest are stopped.
+    :param rating_heuristic: has to be picklable (e.g. a function from ratings module, not a lambda)
+    :param shared_table: whether workers share a SharedTranspositionTable; otherwise each one uses its own table
+    :param executor: pool to run workers in; a new pool of given number of workers is created if not passed
+    """
+    moves = sorted(board.get_possible_moves_of_side(side), key=str)
+    if not moves:
+        return SearchResult(None, -1000 if side == Side.White else 1000)
+
+    table = SharedTranspositionTable(table_size) if shared_table else None
+    stop = SharedFlag()
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        if mode == ParallelMode.RootSplitting:
+            scores = list(executor.map(_search_root_move, *zip(*[
+                (board, side, move, depth, rating_heuristic, table) for move in moves
+            ])))
+            best_score = max(scores) if side == Side.White else min(scores)
+            return SearchResult(moves[scores.index(best_score)], best_score, [moves[scores.index(best_score)]], depth)
+        else:
+            futures = [executor.submit(_lazy_smp_worker, board, side, depth, rating_heuristic, table, stop, i)
+                       for i in range(workers)]
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            stop.set()
+            wait(futures)
+            return max((future.result() for future in done), key=lambda result: result.depth)
+    finally:
+        if own_executor:
+            executor.shutdown()
+        stop.unlink()
+        if table is not None:
+            table.unlink()
+
+
+def speedup_report(board: Board, side: Side, depth: int, rating_heuristic=base_rating,
+                   workers_counts=(1, 2, 4, 8), mode: ParallelMode = ParallelMode.RootSplitting,
+                   shared_table: bool = True) -> dict[int, float]:
+    """
+    :return: speedup of parallel_search against single-core alphabeta (through search) for every number of workers
+    """
+    start = perf_counter()
+    search(board, side, rating_heuristic, max_depth=depth)
+    single_core = perf_counter() - start
+
+    speedups = {}
+    for workers in workers_counts:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Warm the pool up, so that starting processes is not measured
+            list(executor.map(abs, range(workers)))
+            start = perf_counter()
+            parallel_search(board, side, depth, rating_heuristic, workers, mode, shared_table, executor=executor)
+            speedups[workers] = single_core / (perf_counter() - start)
+    return speedups
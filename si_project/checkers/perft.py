@@ -0,0 +1,124 @@
+"""
+Perft (performance test) of the move generator: counts leaf nodes of the full game tree to a fixed depth.
+Counts are compared against a JSON baseline with reference counts (and reference speed) of stored positions,
+so that every change of move generation can be checked for correctness and compared for speed.
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+from si_project.checkers.models import Side
+
+BASELINE_PATH = Path(__file__).parent.parent.parent.resolve() / 'assets' / 'checkers_perft' / 'perft_baseline.json'
+
+
+def perft(board, side: Side, depth: int) -> int:
+    """
+    :return: number of positions reachable from the board in exactly depth plies, with side to move first.
+             The board is walked in place with make_move/unmake_move and is left unchanged afterwards.
+    """
+    if depth == 0:
+        return 1
+    moves = board.get_possible_moves_of_side(side)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += perft(board, side.next, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+@dataclass
+class PerftPosition:
+    name: str
+    side: Side
+    num_repr: tuple
+    # Reference node counts for depths 1, 2, ...
+    nodes: list[int] = field(default_factory=list)
+
+    def board(self, board_cls):
+        """
+        :param board_cls: models.Board or bitboard.BitBoard
+        """
+        return board_cls.populate_initial_board().from_num_repr(self.num_repr)
+
+
+@dataclass
+class PerftResult:
+    position: str
+    board: str
+    depth: int
+    nodes: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class PerftBaseline:
+    positions: list[PerftPosition]
+    # Nodes per second of every board class on the whole baseline, at the time it was recorded
+    nodes_per_second: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path = BASELINE_PATH) -> 'PerftBaseline':
+        with open(path) as baseline_file:
+            raw = json.load(baseline_file)
+        positions = [
+            PerftPosition(p['name'], Side[p['side']], tuple(tuple(piece) for piece in p['board']), p['nodes'])
+            for p in raw['positions']
+        ]
+        return cls(positions, raw.get('nodes_per_second', {}))
+
+    def save(self, path: Path = BASELINE_PATH) -> None:
+        raw = {
+            'positions': [
+                {'name': p.name, 'side': p.side.name, 'board': [list(piece) for piece in p.num_repr], 'nodes': p.nodes}
+                for p in self.positions
+            ],
+            'nodes_per_second': self.nodes_per_second,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as baseline_file:
+            # One line per position keeps the file readable and its diffs small
+            baseline_file.write('{\n  "positions": [\n    ')
+            baseline_file.write(',\n    '.join(json.dumps(position) for position in raw['positions']))
+            baseline_file.write(f'\n  ],\n  "nodes_per_second": {json.dumps(raw["nodes_per_second"])}\n}}\n')
+
+
+def run_perft(positions: list[PerftPosition], board_cls, max_depth: int | None = None) -> list[PerftResult]:
+    """
+    Runs perft of every position to every depth it has reference counts for (limited to max_depth, if given).
+    """
+    results = []
+    for position in positions:
+        board = position.board(board_cls)
+        for depth in range(1, min(len(position.nodes), max_depth or len(position.nodes)) + 1):
+            start = perf_counter()
+            nodes = perft(board, position.side, depth)
+            seconds = perf_counter() - start
+            results.append(PerftResult(position.name, board_cls.__name__, depth, nodes, seconds))
+    return results
+
+
+def mismatches(results: list[PerftResult], baseline: PerftBaseline) -> list[str]:
+    """
+    :return: descriptions of results with node counts different from the baseline
+    """
+    expected = {position.name: position.nodes for position in baseline.positions}
+    return [
+        f'{result.board}, {result.position}, depth {result.depth}: {result.nodes} nodes, '
+        f'expected {expected[result.position][result.depth - 1]}'
+        for result in results if expected[result.position][result.depth - 1] != result.nodes
+    ]
+
+
+def total_nodes_per_second(results: list[PerftResult]) -> float:
+    seconds = sum(result.seconds for result in results)
+    return sum(result.nodes for result in results) / seconds if seconds else 0.0
+
@@ -1,43 +1,42 @@
 from si_project.checkers.models import Side, PieceType
 
 
-def base_rating(board) -> int:
-    is_any_white = False
-    is_any_black = False
-    total_sum = 0
+def base_piece_value(sq, piece) -> int:
+    return sq.sector_multiplier * (3 if piece.type_ == PieceType.King else 1)
 
-    for sq, piece in board.squares.items():
-        if piece:
-            piece_value = sq.sector_multiplier * (3 if piece.type_ == PieceType.King else 1)
-            if piece.side == Side.White:
-                is_any_white = True
-            else:
-                is_any_black = True
-                piece_value *= -1
-            total_sum += piece_value
 
-    if is_any_black and not is_any_white:
-        return -1000
-    elif is_any_white and not is_any_black:
-        return 1000
-    else:
-        return total_sum
+def no_king_multip_piece_value(sq, piece) -> int:
+    return sq.sector_multiplier
 
 
-def no_king_multip_rating(board) -> int:
+def forward_extra_piece_value(sq, piece) -> int:
+    piece_value = sq.sector_multiplier * (3 if piece.type_ == PieceType.King else 1)
+    if piece.side == Side.White and sq.x < 4 or piece.side == Side.Black and sq.x >= 4:
+        piece_value *= 3
+    return piece_value
+
+
+def very_basic_piece_value(sq, piece) -> int:
+    return 2 if piece.type_ == PieceType.King else 1
+
+
+def material_rating(board, piece_value) -> int:
+    """
+    :param piece_value: function returning (non-negative) value of a piece standing on a square
+    :return: sum of values of white pieces minus sum of values of black pieces,
+             or 1000 / -1000 if only white / black pieces are left
+    """
     is_any_white = False
     is_any_black = False
     total_sum = 0
 
-    for sq, piece in board.squares.items():
-        if piece:
-            piece_value = sq.sector_multiplier
-            if piece.side == Side.White:
-                is_any_white = True
-            else:
-                is_any_black = True
-                piece_value *= -1
-            total_sum += piece_value
+    for sq, piece in board.pieces():
+        if piece.side == Side.White:
+            is_any_white = True
+            total_sum += piece_value(sq, piece)
+        else:
+            is_any_black = True
+            total_sum -= piece_value(sq, piece)
 
     if is_any_black and not is_any_white:
         return -1000
@@ -47,51 +46,41 @@ def no_king_multip_rating(board) -> int:
         return total_sum
 
 
-def forward_extra_rating(board) -> int:
-    is_any_white = False
-    is_any_black = False
-    total_sum = 0
-
-    for sq, piece in board.squares.items():
-        if piece:
-            piece_value = sq.sector_multiplier * (3 if piece.type_ == PieceType.King else 1)
-            if piece.side == Side.White:
-                is_any_white = True
-                if sq.x < 4:
-                    piece_value *= 3
-            else:
-                is_any_black = True
-                if sq.x >= 4:
-                    piece_value *= 3
-                piece_value *= -1
-            total_sum += piece_value
-
-    if is_any_black and not is_any_white:
+def incremental_rating(board, values_index: int) -> int:
+    """
+    The same as material_rating, but in O(1), using running totals kept by the board (see evaluation module).
+    :param values_index: index of the piece value function in PIECE_VALUES
+    """
+    totals = board.totals
+    if totals.black_count and not totals.white_count:
         return -1000
-    elif is_any_white and not is_any_black:
+    elif totals.white_count and not totals.black_count:
         return 1000
     else:
-        return total_sum
+        return totals.sums[values_index]
+
+
+def base_rating(board) -> int:
+    return incremental_rating(board, 0)
+
+
+def no_king_multip_rating(board) -> int:
+    return incremental_rating(board, 1)
+
+
+def forward_extra_rating(board) -> int:
+    return incremental_rating(board, 2)
 
 
 def very_basic(board) -> int:
-    is_any_white = False
-    is_any_black = False
-    total_sum = 0
+    return incremental_rating(board, 3)
 
-    for sq, piece in board.squares.items():
-        if piece:
-            piece_value = (2 if piece.type_ == PieceType.King else 1)
-            if piece.side == Side.White:
-                is_any_white = True
-            else:
-                is_any_black = True
-                piece_value *= -1
-            total_sum += piece_value
 
-    if is_any_black and not is_any_white:
-        return -1000
-    elif is_any_white and not is_any_black:
-        return 1000
-    else:
-        return total_sum
+# Piece values behind every rating function, used to precompute weight tables (e.g. by batch_ratings)
+# and running totals of boards; indices passed to incremental_rating follow the order of this mapping
+PIECE_VALUES = {
+    base_rating: base_piece_value,
+    no_king_multip_rating: no_king_multip_piece_value,
+    forward_extra_rating: forward_extra_piece_value,
+    very_basic: very_basic_piece_value,
+}
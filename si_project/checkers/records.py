@@ -0,0 +1,163 @@
+"""
+Append-only files of game records, e.g. of self-play games, scanned game by game without loading the whole file.
+
+File layout (little-endian): header (magic, format version) followed by games, every one being: outcome
+(GameStatus value) and number of plies, starting position (notation.POSITION record), moves packed like by
+BitBoard.generate_moves (8 bytes each) and CRC-32 of all previous bytes of the game. Every game is written with a
+single write, so a file cut short by an interrupted writer loses at most its last game: readers skip it, and
+GameWriter cuts it off before appending. A game not matching its checksum raises ValueError instead of being read.
+"""
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.models import Side, Move, GameStatus
+from si_project.checkers.notation import POSITION, pack_position, unpack_position
+
+_MAGIC = b'CKGR'
+_VERSION = 2
+_HEADER = struct.Struct('<4sB')
+_GAME = struct.Struct('<BH')
+_MOVE = struct.Struct('<Q')
+_CHECKSUM = struct.Struct('<I')
+
+
+def _copy(board: BitBoard) -> BitBoard:
+    """
+    :return: the position of the board without its history of moves
+    """
+    return BitBoard(board.white_men, board.white_kings, board.black_men, board.black_kings)
+
+
+@dataclass
+class GameRecord:
+    start: BitBoard
+    side: Side
+    # Moves packed into ints (see BitBoard.from_move)
+    moves: list[int] = field(default_factory=list)
+    outcome: GameStatus = GameStatus.Ongoing
+
+    @classmethod
+    def from_moves(cls, moves: list[Move | int], outcome: GameStatus, start: BitBoard | None = None,
+                   side: Side = Side.White) -> 'GameRecord':
+        """
+        :param moves: moves played from the start position, as Move objects or packed
+        :param start: starting position, the initial one by default
+        """
+        start = start or BitBoard.populate_initial_board()
+        board = _copy(start)
+        packed = []
+        for move in moves:
+            move = move if isinstance(move, int) else board.from_move(move)
+            board.make_move(move)
+            packed.append(move)
+        return cls(_copy(start), side, packed, outcome)
+
+    def positions(self):
+        """
+        :return: generator of (board, side to move) of all positions of the game, from the starting one to the final
+                 one. The same board is updated in place between positions, so it has to be copied to be kept.
+        """
+        board = _copy(self.start)
+        side = self.side
+        yield board, side
+        for move in self.moves:
+            board.make_move(move)
+            side = side.next
+            yield board, side
+
+    def to_bytes(self) -> bytes:
+        data = _GAME.pack(self.outcome.value, len(self.moves)) + pack_position(self.start, self.side) \
+            + b''.join(_MOVE.pack(move) for move in self.moves)
+        return data + _CHECKSUM.pack(zlib.crc32(data))
+
+
+class GameWriter:
+    """
+    Appends games to a records file, creating it if needed. Use as a context manager or call close once it is no
+    longer needed.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, 'r+b' if path.exists() else 'wb')
+        try:
+            if self._file.seek(0, os.SEEK_END) == 0:
+                self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+                return
+            self._file.seek(0)
+            _check_header(self._file.read(_HEADER.size), path)
+            # A game cut short by an interrupted writer is removed, so that new games do not continue it
+            end = _HEADER.size
+            for end, _, _ in _scan(self._file, path):
+                pass
+            self._file.truncate(end)
+            self._file.seek(end)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def write(self, record: GameRecord) -> None:
+        self._file.write(record.to_bytes())
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'GameWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _check_header(data: bytes, path: Path) -> None:
+    if len(data) != _HEADER.size or _HEADER.unpack(data) != (_MAGIC, _VERSION):
+        raise ValueError(f'{path} is not a game records file of version {_VERSION}')
+
+
+def _scan(records_file, path: Path):
+    """
+    :param records_file: records file opened in binary mode, positioned after its header
+    :return: generator of (offset of the end of the game, head, moves data) of all complete games of the file; an
+             incomplete last game ends the scan
+    """
+    while True:
+        head = records_file.read(_GAME.size + POSITION.size)
+        if len(head) < _GAME.size + POSITION.size:
+            return
+        _, plies = _GAME.unpack_from(head)
+        data = records_file.read(plies * _MOVE.size + _CHECKSUM.size)
+        if len(data) < plies * _MOVE.size + _CHECKSUM.size:
+            return
+        checksum, = _CHECKSUM.unpack_from(data, plies * _MOVE.size)
+        if zlib.crc32(data[:-_CHECKSUM.size], zlib.crc32(head)) != checksum:
+            raise ValueError(f'{path} has a corrupted game at offset {records_file.tell() - len(head) - len(data)}')
+        yield records_file.tell(), head, data[:-_CHECKSUM.size]
+
+
+def read_games(path: Path):
+    """
+    :return: generator of games stored in the records file, in order of writing; ValueError is raised when a
+             corrupted game is reached
+    """
+    with open(path, 'rb') as records_file:
+        _check_header(records_file.read(_HEADER.size), path)
+        for _, head, data in _scan(records_file, path):
+            outcome, plies = _GAME.unpack_from(head)
+            start, side = unpack_position(head, _GAME.size)
+            moves = list(struct.unpack(f'<{plies}Q', data))
+            yield GameRecord(start, side, moves, GameStatus(outcome))
+
+
+def read_positions(path: Path):
+    """
+    :return: generator of (board, side to move, outcome of the game) of all positions of all games of the file; the
+             board is updated in place, see GameRecord.positions
+    """
+    for game in read_games(path):
+        for board, side in game.positions():
+            yield board, side, game.outcome
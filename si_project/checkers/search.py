@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+from time import monotonic
+
+from si_project.checkers.alphabeta import alphabeta, SearchTimeout
+from si_project.checkers.book import OpeningBook
+from si_project.checkers.models import Side, Board, Move
+from si_project.checkers.ordering import MoveOrdering
+from si_project.checkers.ratings import base_rating
+from si_project.checkers.stats import SearchStats
+from si_project.checkers.tablebase import Tablebase
+from si_project.checkers.transposition import TranspositionTable
+from si_project.checkers.zobrist import side_key
+
+MAX_DEPTH = 64
+
+
+@dataclass
+class SearchResult:
+    best_move: Move | None
+    score: int
+    pv: list[Move] = field(default_factory=list)
+    depth: int = 0
+
+
+def principal_variation(board: Board, side: Side, table: TranspositionTable, depth: int) -> list[Move]:
+    """
+    :return: sequence of best moves stored in the transposition table, starting from the board
+    """
+    pv = []
+    undos = []
+    while len(pv) < depth:
+        entry = table.probe(board.zobrist_key ^ side_key(side))
+        if entry is None or entry.best_move is None or entry.best_move not in board.generate_moves(side):
+            break
+        pv.append(board.to_move(entry.best_move))
+        undos.append(board.make_move(entry.best_move))
+        side = side.next
+    for undo in reversed(undos):
+        board.unmake_move(undo)
+    return pv
+
+
+def _search_root(board: Board, side: Side, moves: list[Move], depth: int, rating_heuristic, alpha: int, beta: int,
+                 **kwargs) -> tuple[Move, int]:
+    """
+    :param kwargs: arguments of alphabeta passed to searches of root moves
+    :return: best move and its score; the score is only a bound if it is outside of (alpha, beta) window
+    """
+    best_move, best_score = None, None
+    null_windows, stats = kwargs.get('null_windows'), kwargs.get('stats')
+    if stats is not None:
+        stats.count_node(0)
+        stats.expanded_nodes += 1
+        stats.children += len(moves)
+    for i, move in enumerate(moves):
+        undo = board.make_move(move)
+        try:
+            if null_windows and i > 0:
+                null_alpha, null_beta = (alpha, alpha + 1) if side == Side.White else (beta - 1, beta)
+                score = alphabeta(side.next, board, depth - 1, rating_heuristic, null_alpha, null_beta, ply=1, **kwargs)
+                if alpha < score < beta:
+                    if stats is not None:
+                        stats.researches += 1
+                    score = alphabeta(side.next, board, depth - 1, rating_heuristic, alpha, beta, ply=1, **kwargs)
+            else:
+                score = alphabeta(side.next, board, depth - 1, rating_heuristic, alpha, beta, ply=1, **kwargs)
+        finally:
+            board.unmake_move(undo)
+        if side == Side.White and (best_score is None or score > best_score):
+            best_move, best_score = move, score
+            alpha = max(alpha, score)
+        elif side == Side.Black and (best_score is None or score < best_score):
+            best_move, best_score = move, score
+            beta = min(beta, score)
+        if alpha >= beta:
+            break
+    return best_move, best_score
+
+
+def search(board: Board, side: Side, rating_heuristic=base_rating, time_limit: float | None = None,
+           max_depth: int | None = None, table: TranspositionTable | None = None,
+           ordering: MoveOrdering | None = None, stop=None, stats: SearchStats | None = None,
+           quiescence_cap: int = 0, null_windows: bool = False,
+           aspiration_window: int | None = None, tablebase: Tablebase | None = None,
+           book: OpeningBook | None = None, reductions: bool = False,
+           futility_margin: int | None = None) -> SearchResult:
+    """
+    Iterative deepening alpha-beta search from the root position.
+    The first iteration (depth 1) is always completed, next ones are searched until time_limit runs out, stop is set
+    or max_depth is reached. Result of an interrupted iteration is discarded.
+    :param time_limit: time budget in seconds
+    :param max_depth: maximal depth in plies, including the root move
+    :param table: transposition table, shared between iterations; pass the same table to keep it between moves
+    :param ordering: move ordering, shared between iterations; pass the same one to keep history between moves
+    :param stop: optional event (any object with is_set method) that interrupts the search like the time limit
+    :param stats: optional statistics collector, gathering statistics of all iterations
+    :param quiescence_cap: maximal number of capture plies searched below leaves (see alphabeta.quiescence)
+    :param null_windows: whether to use Principal Variation Search (see alphabeta.pvs) instead of plain alphabeta
+    :param aspiration_window: if given, every iteration after the first one is searched with a window of this
+                              half-width around the previous score first, and again with the full window if the
+                              score falls outside of it
+    :param tablebase: optional endgame tablebase probed by alphabeta (see tablebase module)
+    :param book: optional opening book; a move of the book is returned without searching (with depth 0)
+    :param reductions: whether alphabeta uses late move reductions (see alphabeta)
+    :param futility_margin: margin of futility pruning of alphabeta, disabled if not given (see alphabeta)
+    :return: best move for the side with its score, principal variation and depth of last completed iteration
+    """
+    if time_limit is None and max_depth is None and stop is None:
+        raise ValueError('At least one of time_limit, max_depth and stop has to be given')
+    if book is not None:
+        book_move = book.choose(board, side)
+        if book_move is not None:
+            move, score = book_move
+            return SearchResult(move, score, [move], 0)
+    deadline = monotonic() + time_limit if time_limit is not None else None
+    max_depth = max_depth or MAX_DEPTH
+    table = table or TranspositionTable()
+    ordering = ordering or MoveOrdering()
+    ordering.new_search()
+
+    # Moves are searched in representation native to the board (see generate_moves) and converted back at the end
+    moves = [board.from_move(move) for move in sorted(board.get_possible_moves_of_side(side), key=str)]
+    if not moves:
+        return SearchResult(None, -1000 if side == Side.White else 1000)
+
+    result = None
+    for depth in range(1, max_depth + 1):
+        if result is not None:
+            moves.remove(result.best_move)
+            moves.insert(0, result.best_move)
+        search_kwargs = dict(table=table, deadline=deadline if depth > 1 else None, stop=stop if depth > 1 else None,
+                             ordering=ordering, stats=stats, quiescence_cap=quiescence_cap, null_windows=null_windows,
+                             tablebase=tablebase, reductions=reductions, futility_margin=futility_margin)
+        try:
+            if aspiration_window and result is not None:
+                alpha, beta = max(result.score - aspiration_window, -1000), min(result.score + aspiration_window, 1000)
+                best_move, score = _search_root(board, side, moves, depth, rating_heuristic, alpha, beta,
+                                                **search_kwargs)
+                if not alpha < score < beta:
+                    if stats is not None:
+                        stats.researches += 1
+                    best_move, score = _search_root(board, side, moves, depth, rating_heuristic, -1000, 1000,
+                                                    **search_kwargs)
+            else:
+                best_move, score = _search_root(board, side, moves, depth, rating_heuristic, -1000, 1000,
+                                                **search_kwargs)
+        except SearchTimeout:
+            break
+        result = SearchResult(best_move, score, [board.to_move(best_move)], depth)
+        undo = board.make_move(best_move)
+        result.pv += principal_variation(board, side.next, table, depth - 1)
+        board.unmake_move(undo)
+        if abs(score) == 1000 or (deadline is not None and monotonic() > deadline) \
+                or (stop is not None and stop.is_set()):
+            break
+    result.best_move = board.to_move(result.best_move)
+    return result
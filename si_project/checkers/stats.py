@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SearchStats:
+    """
+    Statistics collected by minimax/alphabeta when passed as their stats argument.
+    Times are cumulative, in seconds, measured with time.perf_counter. Time of move generation includes ordering
+    of the generated moves; time of move application includes both make_move and unmake_move.
+    """
+    nodes_per_ply: dict[int, int] = field(default_factory=dict)
+    # Nodes searched by quiescence below the leaves, not included in nodes_per_ply
+    quiescence_nodes: int = 0
+    expanded_nodes: int = 0
+    children: int = 0
+    cutoffs: int = 0
+    # Searches repeated with a wider window, after a null window (PVS) or an aspiration window failed, or with full
+    # depth, after a reduced search of a late move failed high
+    researches: int = 0
+    # Moves searched with reduced depth (late move reductions) and moves not searched due to futility pruning
+    reductions: int = 0
+    futility_prunes: int = 0
+    tt_probes: int = 0
+    tt_hits: int = 0
+    movegen_seconds: float = 0.0
+    apply_seconds: float = 0.0
+    eval_seconds: float = 0.0
+
+    # Columns of as_row, in order
+    CSV_COLUMNS = ('Wezly', 'Wezly quiescence', 'Odciecia', 'Ponowne przeszukania', 'Redukcje', 'Przyciete wezly',
+                   'Wspolczynnik rozgalezienia', 'Zapytania TT', 'Trafienia TT', 'Generowanie ruchow [ms]',
+                   'Wykonywanie ruchow [ms]', 'Ocena [ms]')
+
+    def count_node(self, ply: int) -> None:
+        self.nodes_per_ply[ply] = self.nodes_per_ply.get(ply, 0) + 1
+
+    @property
+    def nodes(self) -> int:
+        return sum(self.nodes_per_ply.values())
+
+    @property
+    def branching_factor(self) -> float:
+        """
+        :return: average number of moves searched in nodes with moves, 0 if there were none. Moves after a cutoff
+                 are not generated by alphabeta, so this is its effective branching factor.
+        """
+        return self.children / self.expanded_nodes if self.expanded_nodes else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def merge(self, other: 'SearchStats') -> None:
+        """
+        Adds statistics of other search (e.g. of other move of the same game) to these ones.
+        """
+        for ply, nodes in other.nodes_per_ply.items():
+            self.nodes_per_ply[ply] = self.nodes_per_ply.get(ply, 0) + nodes
+        self.quiescence_nodes += other.quiescence_nodes
+        self.expanded_nodes += other.expanded_nodes
+        self.children += other.children
+        self.cutoffs += other.cutoffs
+        self.researches += other.researches
+        self.reductions += other.reductions
+        self.futility_prunes += other.futility_prunes
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+        self.movegen_seconds += other.movegen_seconds
+        self.apply_seconds += other.apply_seconds
+        self.eval_seconds += other.eval_seconds
+
+    def as_row(self) -> list[str]:
+        """
+        :return: values for CSV_COLUMNS, e.g. to be appended to a row of the CSV written by scripts/checkers_tests.py
+        """
+        return [
+            str(self.nodes),
+            str(self.quiescence_nodes),
+            str(self.cutoffs),
+            str(self.researches),
+            str(self.reductions),
+            str(self.futility_prunes),
+            f'{self.branching_factor:.2f}',
+            str(self.tt_probes),
+            str(self.tt_hits),
+            f'{self.movegen_seconds * 1000:.1f}',
+            f'{self.apply_seconds * 1000:.1f}',
+            f'{self.eval_seconds * 1000:.1f}',
+        ]
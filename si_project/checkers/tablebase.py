@@ -0,0 +1,291 @@
+"""
+Endgame tablebase: game-theoretic values (win, loss or draw and distance to the end) of all positions with few pieces.
+Tables are generated offline by retrograde analysis (see generate) with moves of bitboard.BitBoard, so they follow
+the same rules as the engine, and probed from alphabeta through mmap (see Tablebase).
+
+File layout (little-endian):
+- header: magic, format version, maximal number of pieces, number of material signatures,
+- for every signature: numbers of white men, white kings, black men and black kings, offset and size of its values,
+- values: one byte per position, see _encode.
+Positions of a signature are indexed by colex ranks of squares of every kind of pieces and the side to move (see
+_local_index), so a lookup is a few additions and a single byte read.
+"""
+import mmap
+import struct
+from array import array
+from collections import deque
+from itertools import combinations, product
+from math import comb
+from pathlib import Path
+
+from si_project.checkers.bitboard import BitBoard, PLAYABLE_SQUARES, WHITE_PROMOTION_ROW, BLACK_PROMOTION_ROW, \
+    iter_bits
+from si_project.checkers.models import Side, GameStatus, QUIET_PLIES_DRAW, MAX_PLIES_DRAW
+
+TABLEBASE_PATH = Path(__file__).parent.parent.parent.resolve() / 'assets' / 'checkers_tablebase' / 'tablebase.bin'
+
+_MAGIC = b'CKTB'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBBH')
+_SIGNATURE = struct.Struct('<BBBBII')
+
+# Value bytes: 0 - not a position (pieces on the same square, men on their promotion row), 1 - draw,
+# 2 + d - decided in d plies: a loss of the side to move for even d, a win for odd d
+_INVALID, _DRAW, _DECIDED = 0, 1, 2
+MAX_DISTANCE = 255 - _DECIDED
+
+# Tablebase wins are scored below 1000 (which marks positions that are already decided), but above any heuristic
+# rating, and closer wins are scored higher
+TABLEBASE_WIN = 900
+
+_BINOMIAL = [[comb(n, k) for k in range(PLAYABLE_SQUARES + 1)] for n in range(PLAYABLE_SQUARES + 1)]
+
+
+def _rank(mask: int) -> int:
+    """
+    :return: colex rank of the set of squares in the mask among sets of the same size
+    """
+    rank = 0
+    for k, i in enumerate(iter_bits(mask), 1):
+        rank += _BINOMIAL[i][k]
+    return rank
+
+
+def _signature_size(signature: tuple[int, int, int, int]) -> int:
+    size = 2
+    for count in signature:
+        size *= _BINOMIAL[PLAYABLE_SQUARES][count]
+    return size
+
+
+def _local_index(signature: tuple[int, int, int, int], masks: tuple[int, int, int, int], side: Side) -> int:
+    index = 0
+    for count, mask in zip(signature, masks):
+        index = index * _BINOMIAL[PLAYABLE_SQUARES][count] + _rank(mask)
+    return index * 2 + (0 if side == Side.White else 1)
+
+
+def signatures(max_pieces: int) -> list[tuple[int, int, int, int]]:
+    """
+    :return: numbers of (white men, white kings, black men, black kings) of positions with at most max_pieces pieces
+             in which both sides have pieces (a side without pieces has already lost)
+    """
+    return [
+        signature for signature in product(range(max_pieces + 1), repeat=4)
+        if sum(signature) <= max_pieces and signature[0] + signature[1] and signature[2] + signature[3]
+    ]
+
+
+def _encode(distance: int | None) -> int:
+    if distance is None or distance > MAX_DISTANCE:
+        return _DRAW
+    return _DECIDED + distance
+
+
+def decode(value: int, side: Side) -> tuple[GameStatus, int] | None:
+    """
+    :param value: byte of a position stored in the tablebase
+    :param side: side to move in the position
+    :return: result of the game and its distance in plies, or None if the byte does not belong to a valid position
+    """
+    if value == _INVALID:
+        return None
+    if value == _DRAW:
+        return GameStatus.Draw, 0
+    distance = value - _DECIDED
+    side_to_move_wins = distance % 2 == 1
+    return (GameStatus.WhiteWon if side_to_move_wins == (side == Side.White) else GameStatus.BlackWon), distance
+
+
+def _positions(signature: tuple[int, int, int, int]):
+    """
+    :return: generator of masks (white men, white kings, black men, black kings) of all positions of the signature
+    """
+    white_men_count, white_kings_count, black_men_count, black_kings_count = signature
+    # Men standing on their promotion row would have been crowned
+    white_men_squares = [i for i in range(PLAYABLE_SQUARES) if not WHITE_PROMOTION_ROW & (1 << i)]
+    black_men_squares = [i for i in range(PLAYABLE_SQUARES) if not BLACK_PROMOTION_ROW & (1 << i)]
+    all_squares = range(PLAYABLE_SQUARES)
+
+    def masks(squares, count):
+        return [sum(1 << i for i in chosen) for chosen in combinations(squares, count)]
+
+    for white_men in masks(white_men_squares, white_men_count):
+        for white_kings in masks(all_squares, white_kings_count):
+            if white_kings & white_men:
+                continue
+            for black_men in masks(black_men_squares, black_men_count):
+                if black_men & (white_men | white_kings):
+                    continue
+                for black_kings in masks(all_squares, black_kings_count):
+                    if not black_kings & (white_men | white_kings | black_men):
+                        yield white_men, white_kings, black_men, black_kings
+
+
+def generate(max_pieces: int) -> tuple[list[tuple[int, int, int, int]], bytearray]:
+    """
+    Solves all positions with at most max_pieces pieces by retrograde analysis: starting from lost positions (the side
+    to move has no moves), a position is won if any move leads to a lost one, and lost if all moves lead to won ones.
+    Distances are the shortest ones for the winner and the longest ones for the loser. Unsolved positions are draws.
+    Draw rules counting moves (see Board.is_in_draw_state) are not taken into account here, but when probing (see
+    Tablebase.score).
+    :return: signatures and values of their positions, in the layout of the file (see save)
+    """
+    sigs = signatures(max_pieces)
+    offsets = {}
+    total = 0
+    for signature in sigs:
+        offsets[signature] = total
+        total += _signature_size(signature)
+
+    def global_index(masks: tuple[int, int, int, int], side: Side) -> int:
+        signature = tuple(mask.bit_count() for mask in masks)
+        return offsets[signature] + _local_index(signature, masks, side)
+
+    values = bytearray(total)
+    # Moves of every position are stored as a flat list of indices of children (-1 for a child in which the side to
+    # move has no pieces left), position i having children[starts[i]:ends[i]]
+    children = array('q')
+    starts = array('q', [0]) * total
+    ends = array('q', [0]) * total
+    for signature in sigs:
+        for masks in _positions(signature):
+            board = BitBoard(*masks)
+            for side in Side:
+                index = global_index(masks, side)
+                values[index] = _DRAW
+                starts[index] = len(children)
+                for move in board.generate_moves(side):
+                    undo = board.make_move(move)
+                    child = (board.white_men, board.white_kings, board.black_men, board.black_kings)
+                    board.unmake_move(undo)
+                    if (child[0] | child[1]) and (child[2] | child[3]):
+                        children.append(global_index(child, side.next))
+                    else:
+                        children.append(-1)
+                ends[index] = len(children)
+
+    # Parents are grouped by child in the same flat layout as children
+    parent_counts = array('q', [0]) * (total + 1)
+    for child in children:
+        if child >= 0:
+            parent_counts[child + 1] += 1
+    parent_starts = array('q', [0]) * (total + 1)
+    for index in range(total):
+        parent_starts[index + 1] = parent_starts[index] + parent_counts[index + 1]
+    parents = array('q', [0]) * len(children)
+    filled = array('q', parent_starts)
+    for index in range(total):
+        for child in children[starts[index]:ends[index]]:
+            if child >= 0:
+                parents[filled[child]] = index
+                filled[child] += 1
+
+    distances = array('q', [-1]) * total
+    unresolved = array('q', (ends[index] - starts[index] for index in range(total)))
+    queue = deque()
+    for index in range(total):
+        if values[index] == _DRAW and unresolved[index] == 0:
+            distances[index] = 0
+            queue.append(index)
+    for index in range(total):
+        if distances[index] < 0 and -1 in children[starts[index]:ends[index]]:
+            distances[index] = 1
+            queue.append(index)
+    while queue:
+        index = queue.popleft()
+        distance = distances[index]
+        for parent in parents[parent_starts[index]:parent_starts[index + 1]]:
+            if distances[parent] >= 0:
+                continue
+            if distance % 2 == 0:
+                distances[parent] = distance + 1
+                queue.append(parent)
+            else:
+                unresolved[parent] -= 1
+                if unresolved[parent] == 0:
+                    distances[parent] = distance + 1
+                    queue.append(parent)
+    for index in range(total):
+        if values[index] == _DRAW and distances[index] >= 0:
+            values[index] = _encode(distances[index])
+    return sigs, values
+
+
+def save(sigs: list[tuple[int, int, int, int]], values: bytearray, path: Path = TABLEBASE_PATH) -> None:
+    """
+    Writes a tablebase generated by generate function.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header_size = _HEADER.size + _SIGNATURE.size * len(sigs)
+    with open(path, 'wb') as tablebase_file:
+        tablebase_file.write(_HEADER.pack(_MAGIC, _VERSION, max(map(sum, sigs)), len(sigs)))
+        offset = header_size
+        for signature in sigs:
+            size = _signature_size(signature)
+            tablebase_file.write(_SIGNATURE.pack(*signature, offset, size))
+            offset += size
+        tablebase_file.write(values)
+
+
+class Tablebase:
+    """
+    Read-only tablebase file mapped into memory; only the pages of probed positions are read from disk.
+    Use as a context manager or call close once it is no longer needed.
+    """
+    max_pieces: int
+
+    def __init__(self, path: Path = TABLEBASE_PATH):
+        with open(path, 'rb') as tablebase_file:
+            self._mm = mmap.mmap(tablebase_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f'{path} is not a tablebase of version {_VERSION}')
+        self._offsets = {}
+        for i in range(count):
+            *signature, offset, _ = _SIGNATURE.unpack_from(self._mm, _HEADER.size + i * _SIGNATURE.size)
+            self._offsets[tuple(signature)] = offset
+
+    def probe(self, board, side: Side) -> tuple[GameStatus, int] | None:
+        """
+        :param board: bitboard.BitBoard, or models.Board (converted to BitBoard first)
+        :return: result of the game with best play of both sides and its distance in plies, or None if the position
+                 is not in the tablebase
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        masks = (board.white_men, board.white_kings, board.black_men, board.black_kings)
+        signature = tuple(mask.bit_count() for mask in masks)
+        offset = self._offsets.get(signature)
+        if offset is None:
+            return None
+        return decode(self._mm[offset + _local_index(signature, masks, side)], side)
+
+    def score(self, board, side: Side) -> int | None:
+        """
+        :return: score of the position for alphabeta (positive when White wins), or None if it is not in the tablebase
+                 or its win may not be reached before the game is drawn by the number of moves (see
+                 models.DrawHistory), in which case the position has to be searched
+        """
+        result = self.probe(board, side)
+        if result is None:
+            return None
+        status, distance = result
+        if status == GameStatus.Draw:
+            return 0
+        # The win is certain only if it takes no more plies than the draw rules leave; a longer one is not
+        # necessarily a draw, as captures and moves of men on the way reset the count of quiet plies
+        history = board.history
+        if distance > min(QUIET_PLIES_DRAW - history.quiet_plies[-1], MAX_PLIES_DRAW - history.plies):
+            return None
+        return TABLEBASE_WIN - distance if status == GameStatus.WhiteWon else distance - TABLEBASE_WIN
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> 'Tablebase':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,99 @@
+import json
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..analysis import *
+from ..bitboard import BitBoard
+from ..records import GameRecord, GameWriter
+
+from ..utilities import Settings
+
+
+def _moves(first: int, plies: int) -> list:
+    """
+    :return: moves of a game starting with the first-th move of White (in order of notation), then the first moves
+    """
+    board, side, moves = BitBoard.populate_initial_board(), Side.White, []
+    for ply in range(plies):
+        options = sorted(board.get_possible_moves_of_side(side), key=notation)
+        move = options[first % len(options)] if ply == 0 else options[0]
+        moves.append(move)
+        board.make_move(move)
+        side = side.next
+    return moves
+
+
+class TestAnalysis(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+        self.directory = tempfile.TemporaryDirectory()
+        directory = Path(self.directory.name)
+        self.records_path, self.results_path = directory / 'games.bin', directory / 'analysis.jsonl'
+        self.checkpoint_path = directory / 'analysis.jsonl.checkpoint'
+        # The first two games are the same, so their positions are analysed once
+        with GameWriter(self.records_path) as writer:
+            for first in (0, 0, 1):
+                writer.write(GameRecord.from_moves(_moves(first, 4), GameStatus.Draw))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def distinct_positions(self) -> set[int]:
+        return {key for game in read_games(self.records_path) for key, _ in positions(game)}
+
+    def test_analyse_position(self):
+        board = BitBoard.from_num_repr([(5, 2, 0, 0), (4, 3, 1, 0), (4, 1, 1, 0)])
+        record = analyse_position(pack_position(board, Side.White), 1)
+        self.assertEqual({'f3xd5', 'f3xd1'}, set(record['scores']))
+        self.assertEqual(record['scores'][record['best_move']], record['score'])
+        self.assertEqual(board.zobrist_key ^ side_key(Side.White), record['key'])
+        json.dumps(record)
+
+    def test_analyse_games(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            analysed = analyse_games(self.records_path, self.results_path, 2, executor=executor, max_pending=2)
+            records = list(load_results(self.results_path))
+            self.assertEqual(len(self.distinct_positions()), analysed)
+            self.assertEqual(self.distinct_positions(), {record['key'] for record in records})
+            self.assertEqual(3, json.loads(self.checkpoint_path.read_text())['games'])
+            self.assertEqual(0, analyse_games(self.records_path, self.results_path, 2, executor=executor))
+            with self.assertRaises(ValueError):
+                analyse_games(self.records_path, self.results_path, 3, executor=executor)
+
+    def test_resume(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            analyse_games(self.records_path, self.results_path, 2, executor=executor)
+            # An interrupted run: the last game is not complete, an analysis is lost and another is partially written.
+            # Analyses are written in order of completion, so the ones to drop are chosen by keys of positions only
+            # the last game has.
+            games = list(read_games(self.records_path))
+            earlier = {key for game in games[:2] for key, _ in positions(game)}
+            last_only = [key for key, _ in positions(games[2]) if key not in earlier]
+            lines = self.results_path.read_text().splitlines()
+            kept = [line for line in lines if json.loads(line)['key'] not in last_only[:2]]
+            partial = next(line for line in lines if json.loads(line)['key'] == last_only[1])
+            self.results_path.write_text('\n'.join(kept) + '\n' + partial[:10])
+            self.checkpoint_path.write_text(json.dumps({'games': 2, 'depth': 2, 'rating': 'base_rating'}))
+            self.assertEqual(2, analyse_games(self.records_path, self.results_path, 2, executor=executor))
+            self.assertEqual(self.distinct_positions(), {record['key'] for record in load_results(self.results_path)})
+            self.assertEqual(3, json.loads(self.checkpoint_path.read_text())['games'])
+
+    def test_corrupted_records(self):
+        data = bytearray(self.records_path.read_bytes())
+        data[-20] ^= 1
+        self.records_path.write_bytes(data)
+        with self.assertRaises(ValueError):
+            analyse_games(self.records_path, self.results_path, 2, workers=1)
+        # The corrupted last game is never counted as analysed
+        games = json.loads(self.checkpoint_path.read_text())['games'] if self.checkpoint_path.exists() else 0
+        self.assertLess(games, 3)
+
+    def test_blunders(self):
+        analyse_games(self.records_path, self.results_path, 2, workers=1)
+        found = list(blunders(self.records_path, self.results_path, -1000))
+        self.assertEqual(12, len(found))
+        for blunder in found:
+            self.assertGreaterEqual(blunder.loss, 0)
+        self.assertEqual([], [blunder for blunder in blunders(self.records_path, self.results_path, 1001)])
@@ -0,0 +1,63 @@
+import importlib.util
+import random
+import unittest
+
+from ..bitboard import BitBoard
+from ..models import Board, Side
+from ..ratings import PIECE_VALUES
+
+from ..utilities import Settings
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+
+def random_positions(count: int, seed: int = 0) -> list[BitBoard]:
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        board = BitBoard.populate_initial_board()
+        side = Side.White
+        for _ in range(rng.randrange(60)):
+            moves = sorted(board.get_possible_moves_of_side(side), key=str)
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            side = side.next
+            positions.append(BitBoard(board.white_men, board.white_kings, board.black_men, board.black_kings))
+    return positions
+
+
+@unittest.skipUnless(HAS_NUMPY, 'NumPy is not installed')
+class TestBatchRatings(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_pack_boards_round_trip(self):
+        from ..batch_ratings import pack_boards, EMPTY, CODE_PIECES
+        from ..bitboard import SQUARES
+        board = Board.populate_initial_board()
+        codes = pack_boards([board])[0]
+        for code, sq in zip(codes, SQUARES):
+            self.assertEqual(board.piece_at(sq), CODE_PIECES.get(int(code)) if code != EMPTY else None)
+
+    def test_same_as_rating_functions(self):
+        from ..batch_ratings import pack_boards, batch_rating
+        positions = random_positions(10)
+        packed = pack_boards(positions)
+        for rating in PIECE_VALUES:
+            self.assertEqual([rating(board) for board in positions], batch_rating(packed, rating).tolist())
+
+    def test_terminal_positions(self):
+        from ..batch_ratings import pack_boards, batch_rating
+        from ..ratings import base_rating
+        positions = [BitBoard(white_men=1), BitBoard(black_kings=1), BitBoard()]
+        self.assertEqual([1000, -1000, 0], batch_rating(pack_boards(positions), base_rating).tolist())
+
+    def test_rate_children(self):
+        from ..batch_ratings import rate_children
+        from ..ratings import forward_extra_rating
+        board = Board.populate_initial_board()
+        rated = rate_children(board, Side.White, forward_extra_rating)
+        self.assertEqual(board.get_possible_moves_of_side(Side.White), set(rated))
+        for move, score in rated.items():
+            self.assertEqual(forward_extra_rating(board.move(move)), score)
@@ -0,0 +1,155 @@
+import unittest
+from io import StringIO
+
+from ..bitboard import *
+from ..models import Board
+
+from ..utilities import Settings
+
+
+class TestBitBoard(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_square_index_round_trip(self):
+        for i, sq in enumerate(SQUARES):
+            self.assertEqual(i, square_index(sq.x, sq.y))
+
+    def test_square_index_white_square(self):
+        self.assertIsNone(square_index(0, 0))
+
+    def test_initial_num_repr(self):
+        self.assertEqual(Board.populate_initial_board().to_num_repr(), BitBoard.populate_initial_board().to_num_repr())
+
+    def test_num_repr_round_trip(self):
+        board = BitBoard.from_num_repr(((2, 3, 0, 0), (3, 4, 1, 1), (7, 0, 0, 1)))
+        self.assertEqual(((2, 3, 0, 0), (3, 4, 1, 1), (7, 0, 0, 1)), board.to_num_repr())
+
+    def test_initial_moves(self):
+        board = Board.populate_initial_board()
+        bitboard = BitBoard.from_board(board)
+        for side in Side:
+            self.assertEqual(board.get_possible_moves_of_side(side), bitboard.get_possible_moves_of_side(side))
+
+    def test_zobrist_key_same_as_board(self):
+        board = Board.populate_initial_board().move(SimpleMove(Square(6, 1), Square(5, 0)))
+        self.assertEqual(board.zobrist_key, BitBoard.from_board(board).zobrist_key)
+
+    def test_initial_rating(self):
+        self.assertEqual(Board.populate_initial_board().rating, BitBoard.populate_initial_board().rating)
+
+    def test_dump(self):
+        expected, actual = StringIO(), StringIO()
+        Board.populate_initial_board().dump(expected)
+        BitBoard.populate_initial_board().dump(actual)
+        self.assertEqual(expected.getvalue(), actual.getvalue())
+
+    def test_move_leaves_board_untouched(self):
+        board = BitBoard.populate_initial_board()
+        move = SimpleMove(Square(6, 1), Square(5, 0))
+        next_board = board.move(move)
+        self.assertEqual(BitBoard.populate_initial_board(), board)
+        self.assertEqual(Piece(PieceType.Man, Side.White), next_board.piece_at(Square(5, 0)))
+        self.assertIsNone(next_board.piece_at(Square(6, 1)))
+        self.assertEqual([move], next_board.moves)
+
+    def test_make_unmake_move(self):
+        board = BitBoard.from_num_repr(((2, 1, 0, 0), (1, 2, 1, 0), (5, 6, 1, 0)))
+        undo = board.make_move(CrownMove(Square(2, 1), [Square(0, 3)]))
+        self.assertEqual(((0, 3, 0, 1), (5, 6, 1, 0)), board.to_num_repr())
+        self.assertEqual(board.compute_zobrist_key(), board.zobrist_key)
+        board.unmake_move(undo)
+        self.assertEqual(((1, 2, 1, 0), (2, 1, 0, 0), (5, 6, 1, 0)), board.to_num_repr())
+        self.assertEqual(board.compute_zobrist_key(), board.zobrist_key)
+        self.assertEqual([], board.moves)
+
+    def test_man_multi_capture_is_mandatory(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 0), (7, 0, 0, 0), (5, 2, 1, 0), (3, 4, 1, 0)))
+        self.assertEqual(
+            {CrownMove(Square(6, 1), [Square(4, 3), Square(2, 5)])},
+            board.get_possible_moves_of_side(Side.White)
+        )
+
+    def test_capture_removes_pieces_and_promotes(self):
+        board = BitBoard.from_num_repr(((2, 1, 0, 0), (1, 2, 1, 0), (5, 6, 1, 0)))
+        next_board = board.move(CrownMove(Square(2, 1), [Square(0, 3)]))
+        self.assertEqual(((0, 3, 0, 1), (5, 6, 1, 0)), next_board.to_num_repr())
+
+    def test_king_flying_capture(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 1), (4, 3, 1, 0)))
+        self.assertEqual(
+            {CrownMove(Square(6, 1), [Square(3, 4)]), CrownMove(Square(6, 1), [Square(2, 5)]),
+             CrownMove(Square(6, 1), [Square(1, 6)]), CrownMove(Square(6, 1), [Square(0, 7)])},
+            board.get_possible_moves_of_side(Side.White)
+        )
+
+    def test_king_on_edge_cannot_capture(self):
+        board = BitBoard.from_num_repr(((7, 0, 0, 1), (5, 2, 1, 0)))
+        self.assertFalse(any(isinstance(move, CrownMove) for move in board.get_possible_moves_of_side(Side.White)))
+        self.assertEqual(
+            Board.populate_initial_board().from_num_repr(board.to_num_repr()).get_possible_moves_of_side(Side.White),
+            board.get_possible_moves_of_side(Side.White)
+        )
+
+    def test_no_moves_is_lost(self):
+        board = BitBoard.from_num_repr(((0, 1, 0, 0), (7, 0, 1, 0)))
+        self.assertEqual(-1000, board.rating)
+
+    def test_status_same_as_board(self):
+        for arr in (((5, 2, 1, 0), (6, 1, 1, 0), (7, 0, 0, 0)), ((5, 6, 1, 0),), ((3, 2, 0, 1), (4, 5, 1, 0))):
+            board = Board.populate_initial_board().from_num_repr(arr)
+            bitboard = BitBoard.from_num_repr(arr)
+            self.assertEqual(board.status(), bitboard.status())
+            for side in Side:
+                self.assertEqual(board.has_moves(side), bitboard.has_moves(side))
+
+    def test_generate_moves_same_as_possible_moves(self):
+        for arr in (((6, 1, 0, 0), (7, 0, 0, 0), (5, 2, 1, 0), (3, 4, 1, 0)), ((6, 1, 0, 1), (4, 3, 1, 0))):
+            board = BitBoard.from_num_repr(arr)
+            for side in Side:
+                packed = board.generate_moves(side)
+                self.assertTrue(all(isinstance(move, int) for move in packed))
+                self.assertEqual(board.get_possible_moves_of_side(side), {board.to_move(move) for move in packed})
+                self.assertEqual(sorted(packed), sorted(board.from_move(move)
+                                                        for move in board.get_possible_moves_of_side(side)))
+
+    def test_generate_moves_captures_only(self):
+        board = BitBoard.populate_initial_board()
+        self.assertEqual([], board.generate_moves(Side.White, captures_only=True))
+        board = BitBoard.from_num_repr(((6, 1, 0, 1), (4, 3, 1, 0), (0, 1, 1, 0)))
+        self.assertEqual(4, len(board.generate_moves(Side.White, captures_only=True)))
+
+    def test_generate_moves_reuses_buffer_of_ply(self):
+        board = BitBoard.populate_initial_board()
+        moves = board.generate_moves(Side.White, 2)
+        self.assertIs(moves, board.generate_moves(Side.Black, 2))
+        self.assertIsNot(moves, board.generate_moves(Side.White, 1))
+
+    def test_make_packed_move(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 0), (7, 0, 0, 0), (5, 2, 1, 0), (3, 4, 1, 0)))
+        move = CrownMove(Square(6, 1), [Square(4, 3), Square(2, 5)])
+        packed = board.from_move(move)
+        self.assertEqual(2, (packed >> MOVE_CAPTURED_SHIFT).bit_count())
+        self.assertEqual(board.move(move).to_num_repr(), board.move(packed).to_num_repr())
+        self.assertEqual(board.move(move).zobrist_key, board.move(packed).zobrist_key)
+
+    def test_draw_state_with_packed_moves(self):
+        board = BitBoard.from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1)))
+        shuffles = [SimpleMove(Square(7, 0), Square(6, 1)), SimpleMove(Square(0, 1), Square(1, 0)),
+                    SimpleMove(Square(6, 1), Square(7, 0)), SimpleMove(Square(1, 0), Square(0, 1))]
+        for i in range(15):
+            board.make_move(board.from_move(shuffles[i % 4]))
+        self.assertTrue(all(isinstance(move, int) for move in board.moves))
+        self.assertTrue(board.is_in_draw_state)
+
+    def test_opening_of_man_moves_is_not_drawn(self):
+        for board in (Board.populate_initial_board(), BitBoard.populate_initial_board()):
+            side = Side.White
+            for _ in range(20):
+                move = sorted(board.get_possible_moves_of_side(side), key=str)[0]
+                self.assertEqual(PieceType.Man, board.piece_at(move.from_sq).type_)
+                board.make_move(move)
+                side = side.next
+                self.assertEqual(0, board.history.quiet_plies[-1])
+            self.assertFalse(board.is_in_draw_state)
+            self.assertEqual(GameStatus.Ongoing, board.status())
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..bitboard import BitBoard
+from ..book import *
+from ..models import *
+from ..search import search
+
+from ..utilities import Settings
+
+
+class TestOpeningBook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.directory.name) / 'book.bin'
+        cls.records = build_book(2, 3, margin=1)
+        save_book(cls.records, 2, cls.path)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.directory.cleanup()
+
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+        self.book = OpeningBook(self.path, margin=1, seed=3)
+        self.board = BitBoard.populate_initial_board()
+
+    def tearDown(self) -> None:
+        self.book.close()
+
+    def test_initial_position_moves(self):
+        moves = self.book.moves(self.board, Side.White)
+        self.assertEqual(self.board.get_possible_moves_of_side(Side.White), {move for move, _ in moves})
+        self.assertEqual(len(self.records), len(self.book))
+        self.assertEqual(2, self.book.depth)
+
+    def test_board_lookup_same_as_bitboard(self):
+        self.assertEqual(self.book.moves(self.board, Side.White),
+                         self.book.moves(Board.populate_initial_board(), Side.White))
+
+    def test_replies_to_good_moves_in_book(self):
+        moves = self.book.moves(self.board, Side.White)
+        best = max(score for _, score in moves)
+        for move, _ in [(move, score) for move, score in moves if score >= best - 1]:
+            self.assertEqual(self.board.move(move).get_possible_moves_of_side(Side.Black),
+                             {reply for reply, _ in self.book.moves(self.board.move(move), Side.Black)})
+
+    def test_unknown_position(self):
+        self.assertEqual([], self.book.moves(self.board, Side.Black))
+        self.assertIsNone(self.book.choose(self.board, Side.Black))
+
+    def test_choose_within_margin(self):
+        moves = self.book.moves(self.board, Side.White)
+        best = max(score for _, score in moves)
+        chosen = {self.book.choose(self.board, Side.White) for _ in range(50)}
+        self.assertEqual({(move, score) for move, score in moves if score >= best - 1}, chosen)
+
+    def test_same_seed_same_choices(self):
+        other = OpeningBook(self.path, margin=1, seed=3)
+        self.assertEqual([self.book.choose(self.board, Side.White) for _ in range(10)],
+                         [other.choose(self.board, Side.White) for _ in range(10)])
+        other.close()
+
+    def test_search_plays_book_move(self):
+        result = search(self.board, Side.White, max_depth=4, book=self.book)
+        self.assertEqual(0, result.depth)
+        self.assertIn((result.best_move, result.score), self.book.moves(self.board, Side.White))
@@ -0,0 +1,92 @@
+import unittest
+from io import StringIO
+from time import sleep
+
+from ..engine import *
+from ..notation import *
+from ..zobrist import side_key
+
+from ..utilities import Settings
+
+
+class TestEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+        self.output = StringIO()
+        self.engine = Engine(self.output, table_size=1 << 12, quiescence_cap=0, ponder=False)
+
+    def tearDown(self) -> None:
+        self.engine.stop()
+
+    def lines(self) -> list[str]:
+        return self.output.getvalue().splitlines()
+
+    def test_position(self):
+        board = BitBoard.populate_initial_board()
+        first = sorted(map(notation, board.get_possible_moves_of_side(Side.White)))[0]
+        self.engine.handle(f'position startpos moves {first}')
+        self.assertEqual(Side.Black, self.engine.side)
+        self.assertEqual(board.move(parse_move(board, Side.White, first)), self.engine.board)
+        self.engine.handle('position startpos moves a1-b2')
+        self.assertEqual(['error illegal move a1-b2'], self.lines())
+        self.assertEqual(Side.Black, self.engine.side)
+
+    def test_position_fen(self):
+        board = BitBoard.from_num_repr([(5, 2, 0, 0), (4, 3, 1, 0), (1, 0, 1, 1)])
+        self.engine.handle(f'position fen {to_fen(board, Side.White)} moves f3xd5')
+        self.assertEqual([], self.lines())
+        self.assertEqual(Side.Black, self.engine.side)
+        self.assertEqual(board.move(parse_move(board, Side.White, 'f3xd5')), self.engine.board)
+        self.engine.handle('position fen X:W1:B2')
+        self.assertEqual(['error invalid position fen X:W1:B2'], self.lines())
+
+    def test_go_depth(self):
+        self.engine.handle('position startpos')
+        self.engine.handle('go depth 3')
+        self.engine.stop()
+        info, best = self.lines()
+        self.assertTrue(info.startswith('info depth 3 score '))
+        tokens = best.split()
+        self.assertEqual('bestmove', tokens[0])
+        self.assertIsNotNone(parse_move(BitBoard.populate_initial_board(), Side.White, tokens[1]))
+        self.assertEqual(info.split()[info.split().index('pv') + 1], tokens[1])
+
+    def test_stop_infinite_search(self):
+        self.engine.handle('go')
+        sleep(0.2)
+        self.engine.handle('stop')
+        self.assertTrue(self.lines()[-1].startswith('bestmove '))
+
+    def test_pondering_fills_table(self):
+        self.engine.ponder = True
+        self.engine.handle('go depth 2')
+        sleep(0.5)
+        self.engine.handle('stop')
+        best, ponder = self.lines()[-1].split()[1::2]
+        board = BitBoard.populate_initial_board()
+        board.make_move(parse_move(board, Side.White, best))
+        board.make_move(parse_move(board, Side.Black, ponder))
+        # Scores of the root position are not stored, but the ones of its children are
+        for move in board.get_possible_moves_of_side(Side.White):
+            child = board.move(move)
+            self.assertIsNotNone(self.engine.table.probe(child.zobrist_key ^ side_key(Side.Black)))
+
+    def test_invalid_commands(self):
+        self.assertTrue(self.engine.handle('go depth'))
+        self.assertTrue(self.engine.handle('fly'))
+        self.assertTrue(self.engine.handle('isready'))
+        self.assertFalse(self.engine.handle('quit'))
+        self.assertEqual(['error invalid go depth', 'error unknown command fly', 'readyok'], self.lines())
+
+    def test_client(self):
+        with EngineClient() as client:
+            client.is_ready()
+            client.position()
+            reply = client.search(depth=2)
+            board = BitBoard.populate_initial_board()
+            self.assertIsNotNone(parse_move(board, Side.White, reply.best_move))
+            self.assertEqual(2, reply.depth)
+            client.position([reply.best_move])
+            second = client.search(depth=2)
+            self.assertIsNotNone(parse_move(board.move(parse_move(board, Side.White, reply.best_move)), Side.Black,
+                                            second.best_move))
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from ..bitboard import BitBoard
+from ..evaluation import MaterialTotals, value_functions, BASE_VALUES
+from ..models import Board, Side, Square, CrownMove
+from ..ratings import PIECE_VALUES, base_piece_value, material_rating
+
+from ..utilities import Settings
+
+
+class TestMaterialTotals(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def assertTotalsUpToDate(self, board):
+        self.assertEqual(MaterialTotals.of(board.pieces()), board.totals)
+        for rating, piece_value in PIECE_VALUES.items():
+            self.assertEqual(material_rating(board, piece_value), rating(board))
+
+    def play_random_game(self, board, seed: int):
+        rng = random.Random(seed)
+        side = Side.White
+        undos = []
+        for _ in range(80):
+            moves = sorted(board.get_possible_moves_of_side(side), key=str)
+            if not moves:
+                break
+            undos.append(board.make_move(rng.choice(moves)))
+            self.assertTotalsUpToDate(board)
+            side = side.next
+        for undo in reversed(undos):
+            board.unmake_move(undo)
+            self.assertTotalsUpToDate(board)
+
+    def test_base_values_index(self):
+        self.assertIs(base_piece_value, value_functions()[BASE_VALUES])
+
+    def test_initial_totals(self):
+        totals = Board.populate_initial_board().totals
+        self.assertEqual([8, 0, 8, 0], totals.counts)
+        self.assertEqual([0] * len(PIECE_VALUES), totals.sums)
+
+    def test_board_random_games(self):
+        for seed in range(5):
+            self.play_random_game(Board.populate_initial_board(), seed)
+
+    def test_bitboard_random_games(self):
+        for seed in range(5):
+            self.play_random_game(BitBoard.populate_initial_board(), seed)
+
+    def test_capture_with_promotion(self):
+        board = Board.populate_initial_board().from_num_repr(((1, 2, 1, 0), (2, 1, 0, 0), (5, 6, 1, 0)))
+        undo = board.make_move(CrownMove(Square(2, 1), [Square(0, 3)]))
+        self.assertEqual([0, 1, 1, 0], board.totals.counts)
+        self.assertTotalsUpToDate(board)
+        board.unmake_move(undo)
+        self.assertEqual([1, 0, 2, 0], board.totals.counts)
+        self.assertTotalsUpToDate(board)
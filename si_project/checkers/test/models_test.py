@@ -1,9 +1,15 @@
+import copy
+import pickle
 import unittest
 
 from ..models import *
 
 from ..utilities import Settings
 
+# Kings on h1 and a2 moving back and forth
+_KING_SHUFFLES = [SimpleMove(Square(7, 0), Square(6, 1)), SimpleMove(Square(0, 1), Square(1, 0)),
+                  SimpleMove(Square(6, 1), Square(7, 0)), SimpleMove(Square(1, 0), Square(0, 1))]
+
 
 class TestSquare(unittest.TestCase):
     def setUp(self) -> None:
@@ -169,6 +175,135 @@ class TestSquare(unittest.TestCase):
         )
 
 
-# class TestBoard(unittest.TestCase):
-#     def test_initial_moves(self):
-#         board = Board.populate_initial_board()
+    def test_squares_are_interned(self):
+        self.assertIs(Square(2, 3), Square(2, 3))
+        self.assertIs(Square(2, 3), Square.from_symbol('c4'))
+        self.assertIs(Square(2, 3), pickle.loads(pickle.dumps(Square(2, 3))))
+        self.assertIs(Square(2, 3), copy.deepcopy(Square(2, 3)))
+
+    def test_square_is_immutable(self):
+        with self.assertRaises(AttributeError):
+            Square(2, 3).x = 4
+
+    def test_geometry_follows_board_size(self):
+        self.assertEqual({Square(1, 1), Square(2, 2), Square(3, 3)}, Square(0, 0).diagonal_squares)
+        Settings.BoardSize = 8
+        self.assertEqual(7, len(Square(0, 0).diagonal_squares))
+        self.assertEqual(8, BoardGeometry.current().size)
+        self.assertIs(BoardGeometry.of(4), BoardGeometry.of(4))
+
+    def test_capture_rays_of_edge_square_are_empty(self):
+        geometry = BoardGeometry.current()
+        self.assertEqual((), geometry.capture_rays[0][1])
+        self.assertEqual(geometry.rays[1][2], geometry.capture_rays[1][2])
+
+
+class TestBoard(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_initial_moves(self):
+        board = Board.populate_initial_board()
+        self.assertEqual(
+            {'g2 -> f1', 'g2 -> f3', 'g4 -> f3', 'g4 -> f5', 'g6 -> f5', 'g6 -> f7', 'g8 -> f7'},
+            {str(move) for move in board.get_possible_moves_of_side(Side.White)}
+        )
+
+    def test_move_leaves_board_untouched(self):
+        board = Board.populate_initial_board()
+        board.move(SimpleMove(Square(6, 1), Square(5, 0)))
+        self.assertEqual(Board.populate_initial_board().to_num_repr(), board.to_num_repr())
+        self.assertEqual([], board.moves)
+
+    def test_make_unmake_simple_move(self):
+        board = Board.populate_initial_board()
+        move = SimpleMove(Square(6, 1), Square(5, 0))
+        undo = board.make_move(move)
+        self.assertEqual(Piece(PieceType.Man, Side.White), board.squares[Square(5, 0)])
+        self.assertEqual([move], board.moves)
+        board.unmake_move(undo)
+        self.assertEqual(Board.populate_initial_board().to_num_repr(), board.to_num_repr())
+        self.assertEqual([], board.moves)
+
+    def test_make_unmake_capture_with_promotion(self):
+        board = Board.populate_initial_board().from_num_repr(((1, 2, 1, 0), (2, 1, 0, 0), (5, 6, 1, 0)))
+        undo = board.make_move(CrownMove(Square(2, 1), [Square(0, 3)]))
+        self.assertEqual(((0, 3, 0, 1), (5, 6, 1, 0)), board.to_num_repr())
+        self.assertTrue(undo.promoted)
+        self.assertEqual([(Square(1, 2), Piece(PieceType.Man, Side.Black))], undo.captured)
+        board.unmake_move(undo)
+        self.assertEqual(((1, 2, 1, 0), (2, 1, 0, 0), (5, 6, 1, 0)), board.to_num_repr())
+
+    def test_draw_after_simple_moves(self):
+        board = Board.populate_initial_board().from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1), (2, 5, 1, 0)))
+        undos = [board.make_move(move) for move in (_KING_SHUFFLES * 4)[:14]]
+        self.assertFalse(board.is_in_draw_state)
+        undos.append(board.make_move(_KING_SHUFFLES[2]))
+        self.assertTrue(board.is_in_draw_state)
+        board.unmake_move(undos.pop())
+        self.assertFalse(board.is_in_draw_state)
+
+    def test_capture_resets_draw_counter(self):
+        board = Board.populate_initial_board().from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1), (4, 3, 1, 0)))
+        for move in (_KING_SHUFFLES * 4)[:14]:
+            board.make_move(move)
+        # White king on g2 captures the black man on e4
+        board.make_move(CrownMove(Square(6, 1), [Square(3, 4)]))
+        self.assertEqual(0, board.history.quiet_plies[-1])
+        self.assertFalse(board.is_in_draw_state)
+
+    def test_repetition(self):
+        board = Board.populate_initial_board().from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1)))
+        undos = []
+        for move in _KING_SHUFFLES[:3]:
+            undos.append(board.make_move(move))
+            self.assertFalse(board.history.is_repetition)
+        undos.append(board.make_move(_KING_SHUFFLES[3]))
+        self.assertTrue(board.history.is_repetition)
+        board.unmake_move(undos.pop())
+        self.assertFalse(board.history.is_repetition)
+        self.assertTrue(board.move(_KING_SHUFFLES[3]).history.is_repetition)
+        self.assertFalse(board.history.is_repetition)
+
+    def test_crown_moves_branching(self):
+        board = Board.populate_initial_board().from_num_repr(((3, 2, 1, 0), (5, 2, 1, 0), (5, 4, 1, 0), (6, 3, 0, 0)))
+        moves = board.get_possible_crown_moves_from_square(Square(6, 3))
+        self.assertEqual({
+            CrownMove(Square(6, 3), [Square(4, 1), Square(2, 3)]),
+            CrownMove(Square(6, 3), [Square(4, 5)]),
+        }, moves)
+        self.assertEqual(((3, 2, 1, 0), (5, 2, 1, 0), (5, 4, 1, 0), (6, 3, 0, 0)), board.to_num_repr())
+
+    def test_only_maximal_captures(self):
+        board = Board.populate_initial_board().from_num_repr(((3, 2, 1, 0), (5, 2, 1, 0), (5, 4, 1, 0), (6, 3, 0, 0)))
+        self.assertEqual({CrownMove(Square(6, 3), [Square(4, 1), Square(2, 3)])},
+                         board.get_possible_moves_of_side(Side.White))
+
+    def test_status_ongoing(self):
+        self.assertEqual(GameStatus.Ongoing, Board.populate_initial_board().status())
+
+    def test_status_no_pieces(self):
+        board = Board.populate_initial_board().from_num_repr(((5, 6, 1, 0),))
+        self.assertEqual(GameStatus.BlackWon, board.status())
+        self.assertEqual(-1000, board.rating)
+
+    def test_status_no_moves(self):
+        # White man on h1 is blocked by black men on g2 and f3, which can move
+        board = Board.populate_initial_board().from_num_repr(((5, 2, 1, 0), (6, 1, 1, 0), (7, 0, 0, 0)))
+        self.assertFalse(board.has_moves(Side.White))
+        self.assertTrue(board.has_moves(Side.Black))
+        self.assertEqual(GameStatus.BlackWon, board.status())
+
+    def test_status_draw(self):
+        board = Board.populate_initial_board().from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1), (2, 5, 1, 0)))
+        for move in (_KING_SHUFFLES * 4)[:15]:
+            board.make_move(move)
+        self.assertEqual(GameStatus.Draw, board.status())
+
+    def test_status_cache_shared_with_moved_boards(self):
+        board = Board.populate_initial_board()
+        board.status()
+        moved = board.move(SimpleMove(Square(6, 1), Square(5, 0)))
+        moved.status()
+        self.assertIs(board.status_cache, moved.status_cache)
+        self.assertEqual(2, len(board.status_cache))
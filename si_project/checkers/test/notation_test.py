@@ -0,0 +1,48 @@
+import unittest
+
+from ..models import Board
+from ..notation import *
+
+from ..utilities import Settings
+
+
+class TestNotation(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_move_round_trip(self):
+        board = BitBoard.populate_initial_board()
+        for move in board.get_possible_moves_of_side(Side.White):
+            self.assertEqual(move, parse_move(board, Side.White, notation(move)))
+        self.assertIsNone(parse_move(board, Side.White, 'a1-b2'))
+
+    def test_capture_notation(self):
+        board = BitBoard.from_num_repr([(5, 2, 0, 0), (4, 3, 1, 0), (2, 5, 1, 0)])
+        moves = board.get_possible_moves_of_side(Side.White)
+        self.assertEqual({'f3xd5xb7'}, set(map(notation, moves)))
+        self.assertEqual(moves.pop(), parse_move(board, Side.White, 'f3xd5xb7'))
+
+    def test_fen(self):
+        board = BitBoard.from_num_repr([(5, 2, 0, 0), (7, 0, 0, 1), (0, 1, 1, 0), (2, 3, 1, 1)])
+        fen = to_fen(board, Side.Black)
+        self.assertEqual('B:W22,K29:B1,K10', fen)
+        self.assertEqual((board, Side.Black), from_fen(fen))
+        self.assertEqual('W:W25,26,27,28,29,30,31,32:B1,2,3,4,5,6,7,8',
+                         to_fen(Board.populate_initial_board(), Side.White))
+        models_board, side = from_fen(fen, Board)
+        self.assertIsInstance(models_board, Board)
+        self.assertEqual(board.to_num_repr(), BitBoard.from_board(models_board).to_num_repr())
+        self.assertEqual(Side.White, from_fen('W:W:B1')[1])
+
+    def test_invalid_fen(self):
+        for fen in ('W:W1', 'X:W1:B2', 'W:W1:W2', 'W:W1:B33', 'W:Wa:B2', 'W:W1:B1'):
+            with self.assertRaises(ValueError):
+                from_fen(fen)
+
+    def test_pack_position(self):
+        board = BitBoard.populate_initial_board()
+        data = pack_position(board, Side.Black)
+        self.assertEqual(17, len(data))
+        self.assertEqual((board, Side.Black), unpack_position(data))
+        self.assertEqual((board, Side.White), unpack_position(b'\0' + pack_position(board, Side.White), 1))
+        self.assertEqual(data, pack_position(Board.populate_initial_board(), Side.Black))
@@ -0,0 +1,98 @@
+import unittest
+
+from ..alphabeta import alphabeta
+from ..bitboard import BitBoard
+from ..minimax import minimax
+from ..models import *
+from ..ordering import MoveOrdering, captured_count, staged_moves
+from ..ratings import base_rating
+
+from ..utilities import Settings
+
+
+class TestMoveOrdering(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+        self.board = BitBoard.populate_initial_board()
+        self.moves = sorted(self.board.get_possible_moves_of_side(Side.White), key=str)
+
+    def test_captured_count(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 1), (4, 3, 1, 0), (3, 4, 1, 0)))
+        self.assertEqual(2, captured_count(board, CrownMove(Square(6, 1), [Square(2, 5)])))
+        self.assertEqual(0, captured_count(board, SimpleMove(Square(6, 1), Square(5, 0))))
+
+    def test_tt_move_first(self):
+        ordered = MoveOrdering().order(self.board, self.moves, 0, self.moves[3])
+        self.assertEqual(self.moves[3], ordered[0])
+        self.assertEqual(set(self.moves), set(ordered))
+
+    def test_killer_before_history(self):
+        ordering = MoveOrdering()
+        ordering.record_cutoff(self.moves[2], 1, 1, 0)
+        ordering.record_cutoff(self.moves[5], 0, 3, 1)
+        ordering.record_cutoff(self.moves[4], 1, 2, 1)
+        self.assertEqual([self.moves[4], self.moves[2], self.moves[5]],
+                         ordering.order(self.board, self.moves, 1)[:3])
+        self.assertEqual([self.moves[5], self.moves[4], self.moves[2]],
+                         ordering.order(self.board, self.moves, 2)[:3])
+
+    def test_cutoff_statistics(self):
+        ordering = MoveOrdering()
+        ordering.record_cutoff(self.moves[0], 0, 1, 0)
+        ordering.record_cutoff(self.moves[1], 0, 1, 2)
+        self.assertEqual(0.5, ordering.first_move_cutoff_rate)
+        self.assertEqual(1.0, ordering.average_cutoff_move_index)
+
+    def test_new_search_forgets_killers(self):
+        ordering = MoveOrdering()
+        ordering.record_cutoff(self.moves[0], 0, 2, 0)
+        ordering.new_search()
+        self.assertEqual([], ordering.killers)
+        self.assertEqual(2, ordering.history[(self.moves[0].from_sq, self.moves[0].to_sq)])
+
+    def test_alphabeta_same_score_as_minimax(self):
+        ordering = MoveOrdering()
+        self.assertEqual(
+            minimax(Side.White, self.board, 4, base_rating),
+            alphabeta(Side.White, self.board, 4, base_rating, ordering=ordering)
+        )
+        self.assertGreater(ordering.cutoffs, 0)
+
+    def test_staged_moves_same_as_generated(self):
+        positions = (((6, 1, 0, 0), (7, 0, 0, 0), (5, 2, 1, 0), (3, 4, 1, 0)), ((6, 1, 0, 1), (4, 3, 1, 0)))
+        for board in [self.board, Board.populate_initial_board()] + [BitBoard.from_num_repr(p) for p in positions]:
+            for side in Side:
+                expected = sorted(board.generate_moves(side), key=str)
+                self.assertEqual(expected, sorted(staged_moves(board, side, 0), key=str))
+                self.assertEqual(expected, sorted(staged_moves(board, side, 0, MoveOrdering()), key=str))
+
+    def test_staged_moves_tt_move_and_killer_first(self):
+        moves = [self.board.from_move(move) for move in self.moves]
+        ordering = MoveOrdering()
+        ordering.record_cutoff(moves[4], 1, 1, 0)
+        staged = list(staged_moves(self.board, Side.White, 1, ordering, moves[2]))
+        self.assertEqual([moves[2], moves[4]], staged[:2])
+        self.assertEqual(len(moves), len(staged))
+
+    def test_staged_moves_skip_impossible_killer(self):
+        ordering = MoveOrdering()
+        ordering.record_cutoff(self.board.from_move(SimpleMove(Square(5, 0), Square(4, 1))), 0, 1, 0)
+        self.assertEqual(sorted(self.board.generate_moves(Side.White)),
+                         sorted(staged_moves(self.board, Side.White, 0, ordering)))
+
+    def test_staged_moves_only_captures(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 0), (5, 2, 1, 0), (0, 7, 1, 0)))
+        tt_move = board.from_move(SimpleMove(Square(6, 1), Square(5, 0)))
+        self.assertEqual([CrownMove(Square(6, 1), [Square(4, 3)])],
+                         [board.to_move(move) for move in staged_moves(board, Side.White, 0, None, tt_move)])
+
+    def test_is_simple_move_possible(self):
+        for board in (self.board, Board.populate_initial_board()):
+            self.assertTrue(board.is_simple_move_possible(Side.White, SimpleMove(Square(6, 1), Square(5, 0))))
+            self.assertFalse(board.is_simple_move_possible(Side.Black, SimpleMove(Square(6, 1), Square(5, 0))))
+            self.assertFalse(board.is_simple_move_possible(Side.White, SimpleMove(Square(7, 0), Square(6, 1))))
+            self.assertFalse(board.is_simple_move_possible(Side.White, SimpleMove(Square(5, 0), Square(4, 1))))
+            self.assertFalse(board.is_simple_move_possible(Side.White, CrownMove(Square(6, 1), [Square(4, 3)])))
+        king = BitBoard.from_num_repr(((7, 0, 0, 1), (4, 3, 1, 0)))
+        self.assertTrue(king.is_simple_move_possible(Side.White, SimpleMove(Square(7, 0), Square(5, 2))))
+        self.assertFalse(king.is_simple_move_possible(Side.White, SimpleMove(Square(7, 0), Square(3, 4))))
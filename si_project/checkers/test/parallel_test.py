@@ -0,0 +1,68 @@
+import pickle
+import unittest
+
+from ..bitboard import BitBoard
+from ..models import *
+from ..parallel import *
+from ..ratings import base_rating
+from ..search import search
+from ..transposition import Bound
+
+from ..utilities import Settings
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = SharedTranspositionTable(16)
+
+    def tearDown(self) -> None:
+        self.table.unlink()
+
+    def test_store_and_probe(self):
+        move = CrownMove(Square(6, 1), [Square(4, 3), Square(2, 5)])
+        self.table.store(5, 3, -12, Bound.Lower, move)
+        entry = self.table.probe(5)
+        self.assertEqual((5, 3, -12, Bound.Lower, move),
+                         (entry.key, entry.depth, entry.score, entry.bound, entry.best_move))
+        self.assertIsNone(self.table.probe(21))
+        self.assertEqual(0.5, self.table.hit_rate)
+
+    def test_shared_through_pickling(self):
+        other = pickle.loads(pickle.dumps(self.table))
+        other.store(7, 1, 4, Bound.Exact, SimpleMove(Square(6, 1), Square(5, 0)))
+        other.close()
+        self.assertEqual(SimpleMove(Square(6, 1), Square(5, 0)), self.table.probe(7).best_move)
+
+    def test_replacement_policy(self):
+        self.table.store(3, 4, 15, Bound.Exact, None)
+        self.table.store(19, 1, -5, Bound.Lower, None)
+        self.table.store(35, 2, 7, Bound.Upper, None)
+        self.assertEqual(15, self.table.probe(3).score)
+        self.assertIsNone(self.table.probe(19))
+        self.assertEqual(7, self.table.probe(35).score)
+
+
+class TestSharedFlag(unittest.TestCase):
+    def test_set(self):
+        flag = SharedFlag()
+        other = pickle.loads(pickle.dumps(flag))
+        self.assertFalse(other.is_set())
+        flag.set()
+        self.assertTrue(other.is_set())
+        flag.unlink()
+
+
+class TestParallelSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_root_splitting_same_score_as_search(self):
+        board = BitBoard.populate_initial_board()
+        result = parallel_search(board, Side.White, 3, base_rating, workers=2, mode=ParallelMode.RootSplitting)
+        self.assertEqual(search(board, Side.White, base_rating, max_depth=3).score, result.score)
+
+    def test_lazy_smp(self):
+        board = BitBoard.populate_initial_board()
+        result = parallel_search(board, Side.White, 3, base_rating, workers=2, mode=ParallelMode.LazySMP)
+        self.assertIn(result.best_move, board.get_possible_moves_of_side(Side.White))
+        self.assertGreaterEqual(result.depth, 3)
@@ -0,0 +1,33 @@
+import unittest
+
+from ..bitboard import BitBoard
+from ..models import Board, Side
+from ..perft import perft, PerftBaseline, run_perft, mismatches
+
+from ..utilities import Settings
+
+# Deeper levels are checked by scripts/checkers_perft.py
+TEST_DEPTH = 3
+
+
+class TestPerft(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_initial_position(self):
+        board = Board.populate_initial_board()
+        self.assertEqual([1, 7, 49, 392], [perft(board, Side.White, depth) for depth in range(4)])
+        self.assertEqual(Board.populate_initial_board().to_num_repr(), board.to_num_repr())
+
+    def test_baseline_board(self):
+        baseline = PerftBaseline.load()
+        self.assertEqual([], mismatches(run_perft(baseline.positions, Board, TEST_DEPTH), baseline))
+
+    def test_baseline_bitboard(self):
+        baseline = PerftBaseline.load()
+        self.assertEqual([], mismatches(run_perft(baseline.positions, BitBoard, TEST_DEPTH), baseline))
+
+    def test_mismatch_reported(self):
+        baseline = PerftBaseline.load()
+        baseline.positions[0].nodes[0] += 1
+        self.assertEqual(1, len(mismatches(run_perft(baseline.positions[:1], BitBoard, 1), baseline)))
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..records import *
+
+from ..utilities import Settings
+
+
+def _play(plies: int) -> list[Move]:
+    board, side, moves = BitBoard.populate_initial_board(), Side.White, []
+    for _ in range(plies):
+        move = sorted(board.get_possible_moves_of_side(side), key=str)[0]
+        moves.append(move)
+        board.make_move(move)
+        side = side.next
+    return moves
+
+
+class TestRecords(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'games.bin'
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_write_and_read(self):
+        first = GameRecord.from_moves(_play(20), GameStatus.Draw)
+        start = BitBoard.from_num_repr([(5, 2, 0, 0), (4, 3, 1, 0), (1, 0, 1, 1)])
+        second = GameRecord.from_moves([], GameStatus.WhiteWon, start, Side.Black)
+        with GameWriter(self.path) as writer:
+            writer.write(first)
+        with GameWriter(self.path) as writer:
+            writer.write(second)
+        games = list(read_games(self.path))
+        self.assertEqual(2, len(games))
+        self.assertEqual((first.start, first.side, first.moves, first.outcome),
+                         (games[0].start, games[0].side, games[0].moves, games[0].outcome))
+        self.assertEqual((start, Side.Black, [], GameStatus.WhiteWon),
+                         (games[1].start, games[1].side, games[1].moves, games[1].outcome))
+
+    def test_positions(self):
+        moves = _play(10)
+        record = GameRecord.from_moves(moves, GameStatus.Ongoing)
+        board = BitBoard.populate_initial_board()
+        expected = [board.to_num_repr()]
+        for move in moves:
+            board.make_move(move)
+            expected.append(board.to_num_repr())
+        positions = [(board.to_num_repr(), side) for board, side in record.positions()]
+        self.assertEqual(expected, [position for position, _ in positions])
+        self.assertEqual([Side.White, Side.Black] * 5 + [Side.White], [side for _, side in positions])
+
+    def test_truncated_game_is_skipped(self):
+        with GameWriter(self.path) as writer:
+            writer.write(GameRecord.from_moves(_play(4), GameStatus.Draw))
+            writer.write(GameRecord.from_moves(_play(6), GameStatus.Draw))
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-3])
+        self.assertEqual([4], [len(game.moves) for game in read_games(self.path)])
+        self.assertEqual(5, sum(1 for _ in read_positions(self.path)))
+
+    def test_append_after_truncated_game(self):
+        games = [GameRecord.from_moves(_play(plies), GameStatus.Draw) for plies in (4, 6, 8)]
+        with GameWriter(self.path) as writer:
+            writer.write(games[0])
+            writer.write(games[1])
+        self.path.write_bytes(self.path.read_bytes()[:-5])
+        with GameWriter(self.path) as writer:
+            writer.write(games[2])
+        self.assertEqual([(game.moves, game.outcome) for game in (games[0], games[2])],
+                         [(game.moves, game.outcome) for game in read_games(self.path)])
+
+    def test_corrupted_game(self):
+        with GameWriter(self.path) as writer:
+            writer.write(GameRecord.from_moves(_play(4), GameStatus.Draw))
+            writer.write(GameRecord.from_moves(_play(6), GameStatus.Draw))
+        data = bytearray(self.path.read_bytes())
+        data[-20] ^= 1
+        self.path.write_bytes(data)
+        games = read_games(self.path)
+        self.assertEqual(4, len(next(games).moves))
+        with self.assertRaises(ValueError):
+            next(games)
+        with self.assertRaises(ValueError):
+            GameWriter(self.path)
+
+    def test_invalid_file(self):
+        self.path.write_bytes(b'not a records file')
+        with self.assertRaises(ValueError):
+            list(read_games(self.path))
+        with self.assertRaises(ValueError):
+            GameWriter(self.path)
@@ -0,0 +1,205 @@
+import unittest
+from threading import Event
+from time import monotonic
+
+from ..bitboard import BitBoard
+from ..alphabeta import alphabeta, quiescence, pvs, SearchTimeout
+from ..minimax import minimax
+from ..models import *
+from ..ratings import base_rating
+from ..ordering import MoveOrdering
+from ..search import search
+from ..stats import SearchStats
+from ..transposition import TranspositionTable
+
+from ..utilities import Settings
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_same_score_as_minimax(self):
+        board = Board.populate_initial_board()
+        result = search(board, Side.White, base_rating, max_depth=3)
+        self.assertEqual(minimax(Side.White, board, 3, base_rating), result.score)
+        self.assertEqual(3, result.depth)
+        self.assertIn(result.best_move, board.get_possible_moves_of_side(Side.White))
+
+    def test_draws_are_scored_in_search(self):
+        shuffles = [SimpleMove(Square(7, 0), Square(6, 1)), SimpleMove(Square(0, 1), Square(1, 0)),
+                    SimpleMove(Square(6, 1), Square(7, 0)), SimpleMove(Square(1, 0), Square(0, 1))]
+        for board_class in (Board, BitBoard):
+            # White is a man up, which does not matter once the position repeats or the game is drawn
+            board = board_class.populate_initial_board().from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1), (7, 6, 0, 0)))
+            self.assertGreater(alphabeta(Side.White, board, 0, base_rating), 0)
+            for move in shuffles[:3]:
+                board.make_move(move)
+            board.make_move(shuffles[3])
+            self.assertTrue(board.history.is_repetition)
+            self.assertEqual(0, alphabeta(Side.White, board, 2, base_rating, ply=1))
+            self.assertEqual(0, minimax(Side.White, board, 2, base_rating, ply=1))
+            for move in shuffles * 2 + shuffles[:3]:
+                board.make_move(move)
+            self.assertTrue(board.is_in_draw_state)
+            self.assertEqual(0, alphabeta(Side.White, board, 2, base_rating))
+
+    def test_man_moves_are_not_draws_in_search(self):
+        for board_class in (Board, BitBoard):
+            board, side = board_class.populate_initial_board(), Side.White
+            for _ in range(16):
+                board.make_move(sorted(board.get_possible_moves_of_side(side), key=str)[0])
+                side = side.next
+            self.assertFalse(board.is_in_draw_state)
+            self.assertEqual(base_rating(board), alphabeta(side, board, 0, base_rating))
+            self.assertEqual(minimax(side, board, 2, base_rating), alphabeta(side, board, 2, base_rating))
+            self.assertNotEqual(0, alphabeta(side, board, 2, base_rating))
+
+    def test_late_move_reductions(self):
+        board = BitBoard.populate_initial_board()
+        plain, reduced = SearchStats(), SearchStats()
+        result = search(board, Side.White, base_rating, max_depth=7, stats=plain)
+        reduced_result = search(board, Side.White, base_rating, max_depth=7, stats=reduced, reductions=True)
+        self.assertEqual(0, plain.reductions)
+        self.assertGreater(reduced.reductions, 0)
+        self.assertLess(reduced.nodes, plain.nodes)
+        self.assertIn(reduced_result.best_move, board.get_possible_moves_of_side(Side.White))
+        self.assertEqual(result.score, reduced_result.score)
+
+    def test_futility_pruning(self):
+        board = BitBoard.populate_initial_board()
+        plain, pruned = SearchStats(), SearchStats()
+        result = search(board, Side.White, base_rating, max_depth=7, stats=plain)
+        pruned_result = search(board, Side.White, base_rating, max_depth=7, stats=pruned, futility_margin=1)
+        self.assertEqual(0, plain.futility_prunes)
+        self.assertGreater(pruned.futility_prunes, 0)
+        self.assertLess(pruned.nodes, plain.nodes)
+        self.assertEqual(result.score, pruned_result.score)
+        # No quiet move changes the rating by more than the margin, so nothing is pruned
+        self.assertEqual(result.score, search(board, Side.White, base_rating, max_depth=7, futility_margin=999).score)
+
+    def test_selective_search_keeps_captures(self):
+        # White man on g2 has to capture both black men, which is never reduced or pruned
+        board = BitBoard.from_num_repr(((6, 1, 0, 0), (5, 2, 1, 0), (3, 4, 1, 0), (0, 7, 1, 0)))
+        for kwargs in ({'reductions': True}, {'futility_margin': 0}, {'reductions': True, 'futility_margin': 0}):
+            result = search(board, Side.White, base_rating, max_depth=6, **kwargs)
+            self.assertEqual(search(board, Side.White, base_rating, max_depth=6).best_move, result.best_move)
+
+    def test_futility_pruning_keeps_promotions(self):
+        # Only crowning the man on b3 brings the rating of White above alpha; moves of the man on g2 are pruned
+        arr = ((1, 2, 0, 0), (6, 1, 0, 0), (5, 4, 1, 0), (4, 7, 1, 0), (3, 6, 1, 0))
+        for board in (BitBoard.from_num_repr(arr), Board.populate_initial_board().from_num_repr(arr)):
+            alpha = base_rating(board) + 2
+            stats = SearchStats()
+            score = alphabeta(Side.White, board, 1, base_rating, alpha, stats=stats, futility_margin=1)
+            self.assertEqual(alphabeta(Side.White, board, 1, base_rating, alpha), score)
+            self.assertGreater(score, alpha)
+            self.assertEqual(2, stats.futility_prunes)
+
+    def test_futility_pruning_keeps_blocking_moves(self):
+        # White king moving from h1 to g2 leaves the black man on f1 without moves, which wins at once
+        arr = ((7, 0, 0, 1), (7, 2, 0, 0), (5, 0, 1, 0))
+        for board in (BitBoard.from_num_repr(arr), Board.populate_initial_board().from_num_repr(arr)):
+            alpha = base_rating(board) + 10
+            self.assertEqual(1000, alphabeta(Side.White, board, 1, base_rating, alpha, futility_margin=1))
+            self.assertEqual(alphabeta(Side.White, board, 2, base_rating, alpha),
+                             alphabeta(Side.White, board, 1, base_rating, alpha, futility_margin=1))
+
+    def test_bitboard_result_has_move_objects(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 0), (5, 2, 1, 0), (3, 4, 1, 0), (0, 7, 1, 0)))
+        result = search(board, Side.White, base_rating, max_depth=4)
+        self.assertEqual(CrownMove(Square(6, 1), [Square(4, 3), Square(2, 5)]), result.best_move)
+        self.assertTrue(all(isinstance(move, Move) for move in result.pv))
+        self.assertEqual(minimax(Side.White, board, 4, base_rating), result.score)
+
+    def test_pv_starts_with_best_move(self):
+        board = BitBoard.populate_initial_board()
+        result = search(board, Side.Black, base_rating, max_depth=4)
+        self.assertEqual(result.best_move, result.pv[0])
+        self.assertLessEqual(len(result.pv), 4)
+        for move in result.pv:
+            board = board.move(move)
+
+    def test_takes_mandatory_capture(self):
+        board = BitBoard.from_num_repr(((6, 1, 0, 0), (5, 2, 1, 0), (0, 7, 1, 0)))
+        result = search(board, Side.White, base_rating, max_depth=2)
+        self.assertEqual(CrownMove(Square(6, 1), [Square(4, 3)]), result.best_move)
+
+    def test_time_limit(self):
+        board = BitBoard.populate_initial_board()
+        start = monotonic()
+        result = search(board, Side.White, base_rating, time_limit=0.2)
+        self.assertLess(monotonic() - start, 1)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertEqual(BitBoard.populate_initial_board(), board)
+        self.assertEqual([], board.moves)
+
+    def test_no_moves(self):
+        board = BitBoard.from_num_repr(((0, 1, 0, 0), (7, 0, 1, 0)))
+        self.assertIsNone(search(board, Side.White, base_rating, max_depth=2).best_move)
+
+    def test_requires_limit(self):
+        with self.assertRaises(ValueError):
+            search(Board.populate_initial_board(), Side.White)
+
+    def test_side_without_moves_loses(self):
+        board = Board.populate_initial_board().from_num_repr(((5, 2, 1, 0), (6, 1, 1, 0), (7, 0, 0, 0)))
+        self.assertEqual(-1000, minimax(Side.White, board, 2, base_rating))
+        self.assertEqual(-1000, alphabeta(Side.White, board, 2, base_rating))
+        self.assertEqual(-1000, search(board, Side.White, base_rating, max_depth=2).score)
+
+    def test_quiescence_sees_capture_at_horizon(self):
+        # Both moves of the only white man are answered with a capture
+        board = Board.populate_initial_board().from_num_repr(((0, 1, 1, 0), (3, 2, 1, 0), (5, 2, 0, 0)))
+        self.assertEqual(-5, alphabeta(Side.White, board, 1, base_rating))
+        stats = SearchStats()
+        self.assertEqual(-1000, alphabeta(Side.White, board, 1, base_rating, stats=stats, quiescence_cap=4))
+        self.assertEqual(2, stats.quiescence_nodes)
+        self.assertEqual({0: 1, 1: 2}, stats.nodes_per_ply)
+        self.assertEqual(-1000, search(board, Side.White, base_rating, max_depth=1, quiescence_cap=4).score)
+
+    def test_quiescence_quiet_leaf(self):
+        board = Board.populate_initial_board()
+        rating = base_rating(board)
+        self.assertEqual(rating, quiescence(Side.White, board, rating, base_rating))
+        self.assertEqual(alphabeta(Side.White, board, 2, base_rating),
+                         alphabeta(Side.White, board, 2, base_rating, quiescence_cap=4))
+
+    def test_quiescence_cap(self):
+        board = Board.populate_initial_board().from_num_repr(((0, 1, 1, 0), (3, 2, 1, 0), (4, 3, 0, 0)))
+        rating = base_rating(board)
+        self.assertEqual(rating, quiescence(Side.Black, board, rating, base_rating, cap=0))
+        self.assertEqual(-1000, quiescence(Side.Black, board, rating, base_rating, cap=1))
+
+    def test_quiescence_stops(self):
+        board = Board.populate_initial_board().from_num_repr(((0, 1, 1, 0), (3, 2, 1, 0), (4, 3, 0, 0)))
+        rating = base_rating(board)
+        stop = Event()
+        stop.set()
+        with self.assertRaises(SearchTimeout):
+            quiescence(Side.Black, board, rating, base_rating, stop=stop)
+        with self.assertRaises(SearchTimeout):
+            quiescence(Side.Black, board, rating, base_rating, deadline=monotonic() - 1)
+        self.assertEqual(-1000, quiescence(Side.Black, board, rating, base_rating, cap=1))
+
+    def test_pvs_same_score_as_alphabeta(self):
+        board = BitBoard.populate_initial_board()
+        for depth in range(1, 5):
+            for side in Side:
+                self.assertEqual(alphabeta(side, board, depth, base_rating), pvs(side, board, depth, base_rating))
+
+    def test_pvs_with_table_and_ordering(self):
+        board = Board.populate_initial_board().from_num_repr(((0, 5, 1, 1), (1, 2, 1, 1), (2, 1, 1, 0), (2, 5, 1, 0),
+                                                               (3, 6, 1, 1), (4, 3, 0, 1), (5, 2, 0, 1), (7, 4, 0, 1)))
+        expected = alphabeta(Side.White, board, 4, base_rating)
+        score = pvs(Side.White, board, 4, base_rating, table=TranspositionTable(), ordering=MoveOrdering())
+        self.assertEqual(expected, score)
+
+    def test_search_with_pvs_and_aspiration(self):
+        board = BitBoard.populate_initial_board()
+        expected = search(board, Side.White, base_rating, max_depth=5).score
+        stats = SearchStats()
+        result = search(board, Side.White, base_rating, max_depth=5, null_windows=True, aspiration_window=1,
+                        stats=stats)
+        self.assertEqual(expected, result.score)
+        self.assertGreater(stats.researches, 0)
@@ -0,0 +1,48 @@
+import unittest
+
+from ..alphabeta import alphabeta
+from ..minimax import minimax
+from ..models import Board, Side
+from ..ratings import base_rating
+from ..search import search
+from ..stats import SearchStats
+from ..transposition import TranspositionTable
+
+from ..utilities import Settings
+
+
+class TestSearchStats(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_minimax_nodes(self):
+        stats = SearchStats()
+        minimax(Side.White, Board.populate_initial_board(), 2, base_rating, stats=stats)
+        self.assertEqual({0: 1, 1: 7, 2: 49}, stats.nodes_per_ply)
+        self.assertEqual(57, stats.nodes)
+        self.assertEqual(7.0, stats.branching_factor)
+        self.assertEqual(0, stats.cutoffs)
+
+    def test_alphabeta_same_score_with_stats(self):
+        board = Board.populate_initial_board()
+        stats = SearchStats()
+        score = alphabeta(Side.White, board, 4, base_rating, table=TranspositionTable(), stats=stats)
+        self.assertEqual(alphabeta(Side.White, board, 4, base_rating, table=TranspositionTable()), score)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertGreater(stats.tt_probes, 0)
+        self.assertLessEqual(stats.tt_hits, stats.tt_probes)
+        self.assertLess(stats.nodes, 1 + 7 + 49 + 392 + 3136)
+        self.assertGreater(stats.movegen_seconds + stats.apply_seconds + stats.eval_seconds, 0)
+
+    def test_search_counts_root(self):
+        stats = SearchStats()
+        search(Board.populate_initial_board(), Side.Black, base_rating, max_depth=2, stats=stats)
+        self.assertEqual(2, stats.nodes_per_ply[0])
+        self.assertIn(2, stats.nodes_per_ply)
+
+    def test_merge_and_row(self):
+        stats = SearchStats({0: 1, 1: 3}, expanded_nodes=1, children=3, cutoffs=1)
+        stats.merge(SearchStats({1: 2}, tt_probes=4, tt_hits=1))
+        self.assertEqual({0: 1, 1: 5}, stats.nodes_per_ply)
+        self.assertEqual(0.25, stats.tt_hit_rate)
+        self.assertEqual(len(SearchStats.CSV_COLUMNS), len(stats.as_row()))
@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..alphabeta import alphabeta
+from ..bitboard import BitBoard
+from ..models import *
+from ..ratings import base_rating
+from ..search import search
+from ..tablebase import *
+from ..tablebase import _positions
+
+from ..utilities import Settings
+
+
+def forced_win(board: BitBoard, side: Side, plies: int, winner: Side) -> bool:
+    """
+    :return: whether the winner can leave the other side without moves within given number of plies
+    """
+    moves = list(board.generate_moves(side))
+    if not moves:
+        return side != winner
+    if plies == 0:
+        return False
+    results = []
+    for move in moves:
+        undo = board.make_move(move)
+        results.append(forced_win(board, side.next, plies - 1, winner))
+        board.unmake_move(undo)
+    return any(results) if side == winner else all(results)
+
+
+class TestTablebase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.directory.name) / 'tablebase.bin'
+        save(*generate(2), cls.path)
+        cls.tablebase = Tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tablebase.close()
+        cls.directory.cleanup()
+
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_signatures(self):
+        self.assertEqual([(0, 1, 0, 1), (0, 1, 1, 0), (1, 0, 0, 1), (1, 0, 1, 0)], signatures(2))
+        self.assertEqual(2, self.tablebase.max_pieces)
+
+    def test_distances_match_search(self):
+        checked = 0
+        for masks in _positions((0, 1, 1, 0)):
+            board = BitBoard(*masks)
+            for side in Side:
+                status, distance = self.tablebase.probe(board, side)
+                if status == GameStatus.Draw or distance > 3:
+                    continue
+                winner = Side.White if status == GameStatus.WhiteWon else Side.Black
+                self.assertTrue(forced_win(board, side, distance, winner))
+                if distance >= 2:
+                    self.assertFalse(forced_win(board, side, distance - 2, winner))
+                checked += 1
+        self.assertGreater(checked, 100)
+
+    def test_lost_without_moves(self):
+        board = BitBoard.from_num_repr(((1, 0, 0, 0), (0, 1, 1, 1)))
+        self.assertEqual((GameStatus.BlackWon, 0), self.tablebase.probe(board, Side.White))
+
+    def test_kings_draw(self):
+        board = BitBoard.from_num_repr(((7, 0, 0, 1), (0, 1, 1, 1)))
+        self.assertEqual((GameStatus.Draw, 0), self.tablebase.probe(board, Side.White))
+        self.assertEqual(0, self.tablebase.score(board, Side.White))
+
+    def test_score_sign(self):
+        board = BitBoard.from_num_repr(((3, 4, 0, 1), (0, 1, 1, 0)))
+        status, distance = self.tablebase.probe(board, Side.White)
+        self.assertEqual(GameStatus.WhiteWon, status)
+        self.assertEqual(TABLEBASE_WIN - distance, self.tablebase.score(board, Side.White))
+        self.assertEqual(self.tablebase.probe(board, Side.Black), (GameStatus.WhiteWon, distance - 1))
+
+    def test_win_beyond_draw_rules_not_scored(self):
+        board = BitBoard.from_num_repr(((3, 4, 0, 1), (0, 1, 1, 0)))
+        _, distance = self.tablebase.probe(board, Side.White)
+        board.history.quiet_plies[-1] = QUIET_PLIES_DRAW - distance
+        self.assertEqual(TABLEBASE_WIN - distance, self.tablebase.score(board, Side.White))
+        board.history.quiet_plies[-1] += 1
+        self.assertIsNone(self.tablebase.score(board, Side.White))
+        self.assertNotEqual(TABLEBASE_WIN - distance,
+                            alphabeta(Side.White, board, 3, base_rating, tablebase=self.tablebase))
+
+    def test_more_pieces_not_probed(self):
+        board = BitBoard.from_num_repr(((3, 4, 0, 1), (0, 1, 1, 0), (0, 3, 1, 0)))
+        self.assertIsNone(self.tablebase.probe(board, Side.White))
+
+    def test_board_probed_as_bitboard(self):
+        arr = ((3, 4, 0, 1), (0, 1, 1, 0))
+        self.assertEqual(self.tablebase.probe(BitBoard.from_num_repr(arr), Side.Black),
+                         self.tablebase.probe(Board.populate_initial_board().from_num_repr(arr), Side.Black))
+
+    def test_alphabeta_returns_tablebase_score(self):
+        board = BitBoard.from_num_repr(((3, 4, 0, 1), (0, 1, 1, 0)))
+        score = self.tablebase.score(board, Side.White)
+        self.assertEqual(score, alphabeta(Side.White, board, 3, base_rating, tablebase=self.tablebase))
+
+    def test_search_moves_towards_win(self):
+        board = BitBoard.from_num_repr(((3, 4, 0, 1), (0, 1, 1, 0)))
+        _, distance = self.tablebase.probe(board, Side.White)
+        result = search(board, Side.White, base_rating, max_depth=1, tablebase=self.tablebase)
+        self.assertEqual(TABLEBASE_WIN - distance + 1, result.score)
+        self.assertEqual((GameStatus.WhiteWon, distance - 1),
+                         self.tablebase.probe(board.move(result.best_move), Side.Black))
+
+    def test_not_a_tablebase(self):
+        path = Path(self.directory.name) / 'other.bin'
+        path.write_bytes(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            Tablebase(path)
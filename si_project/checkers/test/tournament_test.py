@@ -0,0 +1,86 @@
+import json
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..models import GameStatus
+from ..records import read_games
+from ..tournament import *
+
+from ..utilities import Settings
+
+
+def _result(game: int, white: Player, black: Player, outcome: GameStatus) -> dict:
+    return {'game': game, 'white': asdict(white), 'black': asdict(black), 'outcome': outcome.name}
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+        self.players = [Player('alphabeta', 1, 'base_rating'), Player('minimax', 1, 'very_basic'),
+                        Player('alphabeta', 2, 'forward_extra_rating')]
+
+    def test_schedule_alternates_colours(self):
+        games = schedule(self.players, 2, seed=5)
+        self.assertEqual(6, len(games))
+        self.assertEqual(list(range(6)), [game.index for game in games])
+        self.assertEqual((games[0].white, games[0].black), (games[1].black, games[1].white))
+        self.assertEqual(games, schedule(self.players, 2, seed=5))
+        self.assertNotEqual([game.seed for game in games], [game.seed for game in schedule(self.players, 2, seed=6)])
+
+    def test_play_game(self):
+        game = Game(0, self.players[0], self.players[1], 7)
+        result = play_game(game, max_plies=12)
+        self.assertEqual(result['moves'], play_game(game, max_plies=12)['moves'])
+        self.assertIn(result['outcome'], {status.name for status in GameStatus} - {'Ongoing'})
+        self.assertEqual(result['plies'], len(result['moves']))
+        self.assertEqual(result['plies'], len(result['nodes']))
+        self.assertEqual(0, result['nodes'][0])
+        self.assertGreater(result['nodes'][-1], 0)
+        json.dumps(result)
+
+    def test_standings(self):
+        first, second, third = self.players
+        results = [
+            _result(1, second, first, GameStatus.BlackWon),
+            _result(0, first, second, GameStatus.WhiteWon),
+            _result(2, first, third, GameStatus.Draw),
+        ]
+        table = {standing.player: standing for standing in standings(results)}
+        self.assertEqual((3, 2, 1, 0), (table[first.name].games, table[first.name].wins, table[first.name].draws,
+                                        table[first.name].losses))
+        self.assertEqual(0.0, table[second.name].score_rate)
+        self.assertEqual(0.5, table[third.name].score_rate)
+        self.assertEqual(first.name, standings(results)[0].player)
+        self.assertAlmostEqual(3 * INITIAL_ELO, sum(standing.elo for standing in table.values()))
+        self.assertIn(first.name, format_standings(standings(results)))
+
+    def test_run_tournament_appends_and_resumes(self):
+        with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(max_workers=2) as executor:
+            path, records_path = Path(directory) / 'results.jsonl', Path(directory) / 'games.bin'
+            players = self.players[:2]
+            results = run_tournament(players, 2, path, max_plies=6, executor=executor, records_path=records_path)
+            self.assertEqual([0, 1], [result['game'] for result in results])
+            self.assertEqual(2, len(list(load_results(path))))
+            self.assertEqual(sorted(len(result['moves']) for result in results),
+                             sorted(len(game.moves) for game in read_games(records_path)))
+            played = []
+            self.assertEqual(results, run_tournament(players, 2, path, max_plies=6, executor=executor,
+                                                     on_result=played.append))
+            self.assertEqual([], played)
+            self.assertEqual(2, len(list(load_results(path))))
+
+    def test_resume_after_interrupted_write(self):
+        with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(max_workers=2) as executor:
+            path = Path(directory) / 'results.jsonl'
+            players = self.players[:2]
+            results = run_tournament(players, 2, path, max_plies=6, executor=executor)
+            lines = path.read_text().splitlines(keepends=True)
+            path.write_text(lines[0] + lines[1][:len(lines[1]) // 2])
+            self.assertEqual(1, len(list(load_results(path))))
+            played = []
+            resumed = run_tournament(players, 2, path, max_plies=6, executor=executor, on_result=played.append)
+            self.assertEqual([result['moves'] for result in results], [result['moves'] for result in resumed])
+            self.assertEqual(1, len(played))
+            self.assertEqual(resumed, sorted(load_results(path), key=lambda result: result['game']))
@@ -0,0 +1,62 @@
+import unittest
+
+from ..alphabeta import alphabeta
+from ..minimax import minimax
+from ..models import *
+from ..ratings import base_rating
+from ..transposition import *
+
+from ..utilities import Settings
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_probe_missing(self):
+        table = TranspositionTable(8)
+        self.assertIsNone(table.probe(3))
+        self.assertEqual(0.0, table.hit_rate)
+
+    def test_store_and_probe(self):
+        table = TranspositionTable(8)
+        table.store(3, 2, 15, Bound.Exact, None)
+        self.assertEqual(TTEntry(3, 2, 15, Bound.Exact, None), table.probe(3))
+        self.assertIsNone(table.probe(11))
+        self.assertEqual(0.5, table.hit_rate)
+
+    def test_shallower_entry_goes_to_always_replace_slot(self):
+        table = TranspositionTable(8)
+        table.store(3, 4, 15, Bound.Exact, None)
+        table.store(11, 1, -5, Bound.Lower, None)
+        table.store(19, 2, 7, Bound.Upper, None)
+        self.assertEqual(15, table.probe(3).score)
+        self.assertIsNone(table.probe(11))
+        self.assertEqual(7, table.probe(19).score)
+
+    def test_deeper_entry_replaces_depth_preferred_slot(self):
+        table = TranspositionTable(8)
+        table.store(3, 2, 15, Bound.Exact, None)
+        table.store(11, 3, -5, Bound.Lower, None)
+        self.assertIsNone(table.probe(3))
+        self.assertEqual(-5, table.probe(11).score)
+
+
+class TestAlphaBetaWithTable(unittest.TestCase):
+    def setUp(self) -> None:
+        Settings.BoardSize = 8
+
+    def test_same_score_as_minimax(self):
+        board = Board.populate_initial_board()
+        table = TranspositionTable(1024)
+        self.assertEqual(
+            minimax(Side.White, board, 4, base_rating),
+            alphabeta(Side.White, board, 4, base_rating, table=table)
+        )
+        self.assertGreater(table.hits, 0)
+
+    def test_zobrist_key_is_updated_incrementally(self):
+        board = Board.populate_initial_board()
+        initial_key = board.zobrist_key
+        undo = board.make_move(SimpleMove(Square(6, 1), Square(5, 0)))
+        self.assertNotEqual(initial_key, board.zobrist_key)
+        self.assertEqual(board.compute_zobrist_key(), board.zobrist_key)
+        board.unmake_move(undo)
+        self.assertEqual(initial_key, board.zobrist_key)
@@ -0,0 +1,260 @@
+"""
+Self-play tournaments between players (algorithm, depth, rating function) run in a process pool.
+Every finished game is appended as a JSON line to a results file, so a tournament can be watched while it runs and
+resumed after an interruption; standings with win rates and Elo ratings are computed from the file at the end.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from random import Random
+
+from si_project.checkers.alphabeta import alphabeta
+from si_project.checkers.bitboard import BitBoard
+from si_project.checkers.minimax import minimax
+from si_project.checkers.models import Side, GameStatus
+from si_project.checkers.notation import notation, parse_move
+from si_project.checkers.ratings import base_rating, no_king_multip_rating, forward_extra_rating, very_basic
+from si_project.checkers.records import GameRecord, GameWriter
+from si_project.checkers.search import search
+from si_project.checkers.stats import SearchStats
+
+ALGORITHMS = {algorithm.__name__: algorithm for algorithm in (minimax, alphabeta)}
+RATINGS = {rating.__name__: rating for rating in (base_rating, no_king_multip_rating, forward_extra_rating, very_basic)}
+
+INITIAL_ELO = 1500
+ELO_K = 32
+
+
+def choose_move(algorithm, board, side, depth, rating, stats=None):
+    """
+    :param stats: optional SearchStats collecting statistics of the search
+    :return: best move for the side, searched to given depth below the root move
+    """
+    if algorithm is alphabeta:
+        return search(board, side, rating, max_depth=depth + 1, stats=stats).best_move
+    moves = list(board.get_possible_moves_of_side(side))
+    if not moves:
+        return None
+    values = [algorithm(side.next, board.move(move), depth, rating, 1, stats) for move in moves]
+    best_value = max(values) if side == Side.White else min(values)
+    return moves[values.index(best_value)]
+
+
+@dataclass(frozen=True)
+class Player:
+    # Names of a function of ALGORITHMS and of RATINGS, so that players can be sent to worker processes and stored
+    algorithm: str
+    depth: int
+    rating: str
+
+    @property
+    def name(self) -> str:
+        return f'{self.algorithm}/{self.depth}/{self.rating}'
+
+
+@dataclass(frozen=True)
+class Game:
+    index: int
+    white: Player
+    black: Player
+    seed: int
+
+
+def play_game(game: Game, opening_plies: int = 2, max_plies: int = 300) -> dict:
+    """
+    Plays a game to its end. The first opening_plies moves are random (chosen with the seed of the game), so that
+    games between the same players differ. A game longer than max_plies is counted as a draw.
+    :return: result record, as stored in the results file; moves are written like in the engine protocol (see
+             notation.notation)
+    """
+    random = Random(game.seed)
+    board = BitBoard.populate_initial_board()
+    side = Side.White
+    moves, seconds, nodes = [], [], []
+    start = datetime.now()
+    while board.status() == GameStatus.Ongoing and len(moves) < max_plies:
+        player = game.white if side == Side.White else game.black
+        stats = SearchStats()
+        move_start = datetime.now()
+        if len(moves) < opening_plies:
+            move = random.choice(sorted(board.get_possible_moves_of_side(side), key=str))
+        else:
+            move = choose_move(ALGORITHMS[player.algorithm], board, side, player.depth, RATINGS[player.rating], stats)
+        board.make_move(move)
+        moves.append(notation(move))
+        seconds.append(round((datetime.now() - move_start).total_seconds(), 4))
+        nodes.append(stats.nodes)
+        side = side.next
+    status = board.status()
+    return {
+        'game': game.index,
+        'white': asdict(game.white),
+        'black': asdict(game.black),
+        'seed': game.seed,
+        'outcome': (status if status != GameStatus.Ongoing else GameStatus.Draw).name,
+        'plies': len(moves),
+        'moves': moves,
+        'move_seconds': seconds,
+        'nodes': nodes,
+        'seconds': round((datetime.now() - start).total_seconds(), 3),
+    }
+
+
+def game_record(result: dict) -> GameRecord:
+    """
+    :param result: result record returned by play_game
+    :return: the game in the format of game records files (see records module)
+    """
+    board = BitBoard.populate_initial_board()
+    side = Side.White
+    moves = []
+    for token in result['moves']:
+        move = board.from_move(parse_move(board, side, token))
+        board.make_move(move)
+        moves.append(move)
+        side = side.next
+    return GameRecord(BitBoard.populate_initial_board(), Side.White, moves, GameStatus[result['outcome']])
+
+
+def schedule(players: list[Player], games_per_pairing: int, seed: int = 0) -> list[Game]:
+    """
+    :return: games of every pair of players, with colours alternating between games of the pair
+    """
+    random = Random(seed)
+    games = []
+    for first, second in combinations(players, 2):
+        for i in range(games_per_pairing):
+            white, black = (first, second) if i % 2 == 0 else (second, first)
+            games.append(Game(len(games), white, black, random.getrandbits(32)))
+    return games
+
+
+def load_results(path: Path):
+    """
+    :return: generator of result records stored in the results file (nothing if it does not exist). A last line
+             without its newline, left by an interrupted writer, is skipped (see open_results).
+    """
+    if not path.exists():
+        return
+    with open(path) as results_file:
+        for line in results_file:
+            if line.endswith('\n') and line.strip():
+                yield json.loads(line)
+
+
+def open_results(path: Path):
+    """
+    Opens a results file (of JSON lines) for appending, creating it if needed. An incomplete last line left by an
+    interrupted writer is removed first, so that the next record starts on its own line.
+    :return: the file opened in text mode
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        with open(path, 'rb+') as results_file:
+            end = position = results_file.seek(0, os.SEEK_END)
+            # The file is scanned backwards from its end for the last newline, without reading all of it
+            while position > 0:
+                start = max(0, position - 4096)
+                results_file.seek(start)
+                newline = results_file.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                results_file.truncate(position)
+    return open(path, 'a')
+
+
+def run_tournament(players: list[Player], games_per_pairing: int, results_path: Path, workers: int | None = None,
+                   seed: int = 0, opening_plies: int = 2, max_plies: int = 300,
+                   executor: ProcessPoolExecutor | None = None, on_result=None,
+                   records_path: Path | None = None) -> list[dict]:
+    """
+    Plays all scheduled games in a process pool, appending a record of every game to results_path as soon as it is
+    finished. Games already stored in the file (by a previous, interrupted run with the same players and seed) are
+    not played again.
+    :param workers: number of worker processes, os.cpu_count() if not given
+    :param executor: pool to run games in; a new pool of given number of workers is created if not passed
+    :param on_result: optional function called with every new result record, e.g. to report progress
+    :param records_path: optional game records file (see records module) every new game is appended to as well
+    :return: records of all games of the tournament, ordered by game index
+    """
+    games = schedule(players, games_per_pairing, seed)
+    done = {result['game']: result for result in load_results(results_path)}
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    records = GameWriter(records_path) if records_path is not None else None
+    try:
+        futures = [
+            executor.submit(play_game, game, opening_plies, max_plies) for game in games if game.index not in done
+        ]
+        with open_results(results_path) as results_file:
+            for future in as_completed(futures):
+                result = future.result()
+                # The game is recorded before it is counted as played, so that an interruption between both writes
+                # makes it played (and recorded) again instead of missing from the records
+                if records is not None:
+                    records.write(game_record(result))
+                results_file.write(json.dumps(result) + '\n')
+                results_file.flush()
+                done[result['game']] = result
+                if on_result is not None:
+                    on_result(result)
+    finally:
+        if records is not None:
+            records.close()
+        if own_executor:
+            executor.shutdown()
+    return [done[game.index] for game in games]
+
+
+@dataclass
+class Standing:
+    player: str
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    elo: float = INITIAL_ELO
+
+    @property
+    def score_rate(self) -> float:
+        """
+        :return: points per game, counting a draw as half a win
+        """
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.0
+
+
+def standings(results) -> list[Standing]:
+    """
+    Computes win/draw/loss counts and Elo ratings, updated game after game in order of game indices (so that they
+    do not depend on the order in which games have finished).
+    :return: standings of all players, from the best Elo rating
+    """
+    table: dict[str, Standing] = {}
+    for result in sorted(results, key=lambda r: r['game']):
+        white, black = (table.setdefault(name, Standing(name))
+                        for name in (Player(**result['white']).name, Player(**result['black']).name))
+        white_points = {'WhiteWon': 1.0, 'BlackWon': 0.0, 'Draw': 0.5}[result['outcome']]
+        for standing, points in ((white, white_points), (black, 1 - white_points)):
+            standing.games += 1
+            standing.wins += points == 1
+            standing.draws += points == 0.5
+            standing.losses += points == 0
+        expected = 1 / (1 + 10 ** ((black.elo - white.elo) / 400))
+        white.elo, black.elo = white.elo + ELO_K * (white_points - expected), \
+            black.elo - ELO_K * (white_points - expected)
+    return sorted(table.values(), key=lambda standing: standing.elo, reverse=True)
+
+
+def format_standings(table: list[Standing]) -> str:
+    lines = [f'{"Player":<40}{"Games":>7}{"Wins":>7}{"Draws":>7}{"Losses":>7}{"Score":>8}{"Elo":>8}']
+    for s in table:
+        lines.append(f'{s.player:<40}{s.games:>7}{s.wins:>7}{s.draws:>7}{s.losses:>7}{s.score_rate:>8.2f}'
+                     f'{s.elo:>8.0f}')
+    return '\n'.join(lines)
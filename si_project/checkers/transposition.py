@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from enum import Enum
+
+from .models import Move
+
+
+class Bound(Enum):
+    Exact = 1
+    Lower = 2
+    Upper = 3
+
+
+@dataclass(slots=True)
+class TTEntry:
+    key: int
+    depth: int
+    score: int
+    bound: Bound
+    best_move: Move | int | None
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of already searched positions. Every bucket holds two entries: a depth-preferred one, which is
+    replaced only by searches at least as deep, and an always-replace one, which takes everything else.
+    """
+    size: int
+    probes: int
+    hits: int
+
+    def __init__(self, size: int = 1 << 16):
+        if size <= 0:
+            raise ValueError('Size of transposition table has to be positive')
+        self.size = size
+        self._depth_preferred: list[TTEntry | None] = [None] * size
+        self._always_replace: list[TTEntry | None] = [None] * size
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> TTEntry | None:
+        """
+        :param key: Zobrist key of position (including side to move)
+        :return: stored entry of the position or None if it is not in the table
+        """
+        self.probes += 1
+        index = key % self.size
+        entry = self._depth_preferred[index]
+        if entry is None or entry.key != key:
+            entry = self._always_replace[index]
+            if entry is None or entry.key != key:
+                return None
+        self.hits += 1
+        return entry
+
+    def store(self, key: int, depth: int, score: int, bound: Bound, best_move: Move | int | None) -> None:
+        index = key % self.size
+        entry = TTEntry(key, depth, score, bound, best_move)
+        current = self._depth_preferred[index]
+        if current is None or current.key == key or depth >= current.depth:
+            self._depth_preferred[index] = entry
+        else:
+            self._always_replace[index] = entry
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: fraction of probes that found the position, 0 if the table has not been probed yet
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def clear(self) -> None:
+        self._depth_preferred = [None] * self.size
+        self._always_replace = [None] * self.size
+        self.probes = 0
+        self.hits = 0
@@ -0,0 +1,26 @@
+from functools import cache
+from random import Random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import Side, PieceType
+
+# Keys are derived deterministically from the seed, so they are the same in every process.
+# This module is imported by models, so Side and PieceType are only used through their values.
+ZOBRIST_SEED = 0x5EED_C4EC
+BLACK_TO_MOVE = Random(ZOBRIST_SEED).getrandbits(64)
+
+
+@cache
+def piece_key(x: int, y: int, side: 'Side', type_: 'PieceType') -> int:
+    """
+    :return: 64-bit Zobrist key of a piece of given side and type standing on square (x, y)
+    """
+    return Random(ZOBRIST_SEED ^ (((x * 64 + y) * 4 + side.value) * 4 + type_.value) << 32).getrandbits(64)
+
+
+def side_key(side: 'Side') -> int:
+    """
+    :return: key that is XOR-ed with board's key to distinguish the side to move
+    """
+    return BLACK_TO_MOVE if side.value == 2 else 0